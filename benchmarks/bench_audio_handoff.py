@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Übergabe dekodierter Audio-Puffer an andere Prozesse - Kopie (Pickle über eine
+multiprocessing.Queue, wie bei ProcessPoolExecutor) vs. Shared Memory (SharedAudioBuffer,
+die Empfänger hängen sich per Name an).
+
+Pro Variante bekommen --consumers Prozesse (z.B. ASR und Diarization) denselben Puffer und
+lesen ihn einmal vollständig. Gemessen werden die Zeit bis alle Empfänger fertig sind und
+der zusätzliche private Speicher pro Empfänger (Linux: smaps_rollup, sonst Peak-RSS).
+
+Verwendung: python benchmarks/bench_audio_handoff.py [--hours 0.5 1 3] [--consumers 2]
+"""
+
+import sys
+import time
+import argparse
+import multiprocessing as mp
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from whisper_kruse_diarization import SAMPLE_RATE, SharedAudioBuffer
+
+
+def private_mb() -> float:
+    """Privater Speicher dieses Prozesses in MB (geteilte Seiten zählen nicht mit)"""
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            return sum(int(line.split()[1]) for line in f
+                       if line.startswith(('Private_Clean', 'Private_Dirty'))) / 1024
+    except OSError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def consume(tasks, results):
+    import numpy as np
+
+    baseline = private_mb()
+    kind, payload = tasks.get()
+    buffer = None
+    if kind == 'copy':
+        audio = payload
+    else:
+        buffer = SharedAudioBuffer.attach(payload)
+        audio = buffer.array
+    checksum = float(audio.sum(dtype=np.float64))
+    memory = private_mb() - baseline
+
+    del audio
+    if buffer:
+        buffer.release()
+    results.put((time.perf_counter(), memory, checksum))
+
+
+def run(audio, kind: str, consumers: int) -> tuple:
+    """Übergibt audio an consumers Prozesse; liefert (Sekunden, MB privat pro Empfänger)"""
+    ctx = mp.get_context('spawn')
+    tasks, results = ctx.Queue(), ctx.Queue()
+    processes = [ctx.Process(target=consume, args=(tasks, results)) for _ in range(consumers)]
+    for process in processes:
+        process.start()
+    time.sleep(1.0)  # Interpreter-Start nicht mitmessen
+
+    start = time.perf_counter()
+    buffer = None
+    if kind == 'copy':
+        for _ in processes:
+            tasks.put(('copy', audio))
+    else:
+        buffer = SharedAudioBuffer.create(audio)
+        for _ in processes:
+            tasks.put(('shared', buffer.handle))
+
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    if buffer:
+        buffer.release()
+    return max(finished for finished, _, _ in reports) - start, max(memory for _, memory, _ in reports)
+
+
+def main():
+    import numpy as np
+
+    parser = argparse.ArgumentParser(description="Benchmark für Audio-Übergabe zwischen Prozessen")
+    parser.add_argument('--hours', type=float, nargs='+', default=[0.5, 1.0, 3.0],
+                        help='Audiodauer in Stunden (16 kHz Mono float32)')
+    parser.add_argument('--consumers', type=int, default=2, help='Empfänger-Prozesse pro Datei')
+    args = parser.parse_args()
+
+    print(f"{args.consumers} Empfänger pro Puffer")
+    print(f"{'Audio':>7} {'Puffer':>9} {'Variante':>9} {'Zeit':>8} {'privat/Empf.':>13}")
+    rng = np.random.default_rng(0)
+    for hours in args.hours:
+        audio = rng.standard_normal(int(hours * 3600 * SAMPLE_RATE), dtype=np.float32) * 0.01
+        for kind in ('copy', 'shared'):
+            elapsed, memory = run(audio, kind, args.consumers)
+            print(f"{hours:>6.2f}h {audio.nbytes / 1024 ** 2:>7.0f}MB {kind:>9} {elapsed:>7.2f}s "
+                  f"{memory:>11.0f}MB")
+
+
+if __name__ == '__main__':
+    main()
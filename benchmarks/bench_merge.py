@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark: merge_transcription_and_diarization (Sweep) vs. alte O(N·M)-Vollsuche
+Prüft auf synthetischen Segmentlisten, dass die Sprecherzuordnung identisch bleibt.
+
+Verwendung: python benchmarks/bench_merge.py [--sizes 1000 10000 100000 1000000]
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from whisper_kruse_diarization import merge_transcription_and_diarization
+
+
+def reference_merge(whisper_segments, diar_segments):
+    """Alte Implementierung (O(N·M)) als Referenz"""
+    merged = []
+    last_known_speaker = None
+
+    for wseg in whisper_segments:
+        speaker = None
+        best_overlap = 0
+
+        for dseg in diar_segments:
+            overlap = max(0, min(wseg['end'], dseg['end']) - max(wseg['start'], dseg['start']))
+            if overlap > best_overlap:
+                best_overlap = overlap
+                speaker = dseg['speaker']
+
+        if speaker is None and best_overlap == 0:
+            mid_time = (wseg['start'] + wseg['end']) / 2
+            for dseg in diar_segments:
+                if dseg['start'] <= mid_time <= dseg['end']:
+                    speaker = dseg['speaker']
+                    break
+
+            if speaker is None and last_known_speaker is not None:
+                speaker = last_known_speaker
+            elif speaker is None:
+                speaker = "UNKNOWN"
+
+        if speaker != "UNKNOWN":
+            last_known_speaker = speaker
+
+        merged.append(speaker)
+
+    return merged
+
+
+def synthetic_segments(n: int, seed: int = 0):
+    """Erzeugt n Whisper- und n Pyannote-Segmente mit Lücken, Überlappungen und Null-Längen"""
+    rng = random.Random(seed)
+
+    diar_segments = []
+    t = 0.0
+    for _ in range(n):
+        t += rng.choice([0.0, 0.0, rng.uniform(0, 2.0), -rng.uniform(0, 0.5)])
+        start = max(0.0, t)
+        end = start + rng.uniform(0.0, 6.0)
+        diar_segments.append({'start': start, 'end': end, 'speaker': f"SPEAKER_{rng.randrange(4):02d}"})
+        t = end
+
+    whisper_segments = []
+    t = 0.0
+    total = diar_segments[-1]['end'] if diar_segments else 0.0
+    step = total / max(n, 1)
+    for _ in range(n):
+        t += rng.uniform(0, step)
+        length = rng.choice([0.0, rng.uniform(0, 2 * step)])
+        whisper_segments.append({'start': round(t, 1), 'end': round(t + length, 1), 'text': 'x'})
+        t += length
+
+    return whisper_segments, diar_segments
+
+
+def as_transcript(whisper_segments):
+    return SimpleNamespace(segments=[SimpleNamespace(**s) for s in whisper_segments])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für das Zusammenführen von Whisper und Pyannote")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000],
+                       help='Anzahl Segmente pro Liste')
+    parser.add_argument('--reference-max', type=int, default=5000,
+                       help='Größte Liste, für die die O(N·M)-Referenz vollständig läuft')
+    parser.add_argument('--samples', type=int, default=50,
+                       help='Stichproben-Segmente für den Vergleich bei großen Listen')
+    args = parser.parse_args()
+
+    print(f"{'Segmente':>10} {'Sweep (s)':>10} {'Referenz (s)':>13} {'Speedup':>8}  Ergebnis")
+
+    for n in args.sizes:
+        whisper_segments, diar_segments = synthetic_segments(n)
+        transcript = as_transcript(whisper_segments)
+
+        start = time.perf_counter()
+        merged = merge_transcription_and_diarization(transcript, {'segments': diar_segments})
+        fast_time = time.perf_counter() - start
+        fast_speakers = [m['speaker'] for m in merged]
+
+        if n <= args.reference_max:
+            start = time.perf_counter()
+            ref_speakers = reference_merge(whisper_segments, diar_segments)
+            ref_time = time.perf_counter() - start
+            ok = ref_speakers == fast_speakers
+            print(f"{n:>10} {fast_time:>10.3f} {ref_time:>13.3f} {ref_time / fast_time:>7.0f}x  "
+                  f"{'identisch' if ok else 'ABWEICHUNG'}")
+        else:
+            # Stichprobe: Segmente mit direkter Überlappung gegen Einzelsuche prüfen
+            rng = random.Random(n)
+            ok = True
+            for i in rng.sample(range(n), min(args.samples, n)):
+                expected = reference_merge([whisper_segments[i]], diar_segments)[0]
+                if expected != "UNKNOWN" and expected != fast_speakers[i]:
+                    ok = False
+                    break
+            print(f"{n:>10} {fast_time:>10.3f} {'-':>13} {'-':>8}  "
+                  f"{'identisch (Stichprobe)' if ok else 'ABWEICHUNG'}")
+
+        if not ok:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
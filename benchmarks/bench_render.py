@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Ausgabe aller Formate (--formats all) mit gemeinsamem Block-Modell
+vs. eigener Analyse pro Format auf einem synthetischen Transkript.
+
+Verwendung: python benchmarks/bench_render.py [--segments 10000] [--repeat 5]
+"""
+
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from whisper_kruse_diarization import (
+    FORMAT_GENERATORS, OUTPUT_FORMATS, buffered_output, load_kruse_config, write_outputs
+)
+
+
+def synthetic_transcript(n: int, seed: int = 0):
+    """Erzeugt n Segmente mit Sprecherwechseln und Pausen aller Längen"""
+    rng = random.Random(seed)
+    words = ["also", "ich", "würde", "sagen", "dass", "das", "sehr", "interessant", "war", "und", "na", "ja"]
+
+    segments = []
+    t = 0.0
+    speaker = 0
+    for _ in range(n):
+        if rng.random() < 0.3:
+            speaker = rng.randrange(4)
+        length = rng.uniform(0.5, 8.0)
+        segments.append({
+            'start': t,
+            'end': t + length,
+            'text': ' '.join(rng.choice(words) for _ in range(rng.randint(3, 25))),
+            'speaker': f"SPEAKER_{speaker:02d}"
+        })
+        t += length + rng.choice([0.0, 0.3, 1.2, 2.5, 4.0])
+
+    return segments
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für die Ausgabe aller Formate")
+    parser.add_argument('--segments', type=int, default=10000, help='Anzahl Segmente')
+    parser.add_argument('--repeat', type=int, default=5, help='Wiederholungen (bester Wert zählt)')
+    args = parser.parse_args()
+
+    config = load_kruse_config(Path(__file__).resolve().parent.parent / "kruse_config.yaml")
+    segments = synthetic_transcript(args.segments)
+    audio_file = Path("benchmark.wav")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_folder = Path(tmp)
+
+        def per_format():
+            # Jedes Format analysiert das Transkript selbst
+            for fmt in OUTPUT_FORMATS:
+                FORMAT_GENERATORS[fmt](segments, audio_file, output_folder / f"single.{fmt}", config)
+
+        def shared():
+            write_outputs(segments, audio_file, output_folder, OUTPUT_FORMATS, config)
+
+        results = {}
+        for name, func in [("Analyse pro Format", per_format), ("Gemeinsames Block-Modell", shared)]:
+            best = float('inf')
+            for _ in range(args.repeat):
+                with buffered_output():
+                    start = time.perf_counter()
+                    func()
+                    best = min(best, time.perf_counter() - start)
+            results[name] = best
+
+        # Beide Wege müssen identische Dateien schreiben
+        identical = all(
+            (output_folder / f"single.{fmt}").read_bytes()
+            == (output_folder / f"{audio_file.stem}_whisper_kruse.{fmt}").read_bytes()
+            for fmt in OUTPUT_FORMATS
+        )
+
+    print(f"{args.segments} Segmente, Formate: {', '.join(OUTPUT_FORMATS)}")
+    for name, best in results.items():
+        print(f"  {name:<26} {best * 1000:8.1f} ms")
+    print(f"  Ausgabe identisch: {'ja' if identical else 'NEIN'}")
+
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Startzeit von CLI und GUI - Import-Zeit laut `python -X importtime` für
+whisper_kruse_diarization und interviewforge_gui sowie die Gesamtzeit kurzer Aufrufe
+(--help, render --help), jeweils in einem frischen Interpreter wie beim Start aus der GUI.
+
+Schwere Abhängigkeiten (openai, torch, whisper, pyannote, ...) dürfen beim Import nicht
+geladen werden; taucht eine davon auf, endet der Benchmark mit Exit-Code 1. Mit --max-ms
+gilt zusätzlich eine Obergrenze für die Import-Zeit.
+
+Verwendung: python benchmarks/bench_startup.py [--runs 7] [--top 10] [--max-ms 150]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ['openai', 'torch', 'whisper', 'pyannote', 'faster_whisper', 'ctranslate2', 'numpy',
+                 'huggingface_hub']
+
+
+def environment() -> dict:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(ROOT), env.get('PYTHONPATH')]))
+    return env
+
+
+def import_times(module: str) -> dict:
+    """Kumulierte Import-Zeit pro Modul in ms (ein frischer Interpreter, -X importtime)"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, env=environment(), cwd=ROOT)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def wall_time(args: list) -> float:
+    """Gesamtzeit eines Aufrufs in ms (Interpreter-Start bis Prozessende)"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                   env=environment(), cwd=ROOT)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für die Startzeit von CLI und GUI")
+    parser.add_argument('--runs', type=int, default=7, help='Wiederholungen pro Messung (Median)')
+    parser.add_argument('--top', type=int, default=10, help='Langsamste Importe der CLI anzeigen')
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help='Obergrenze für die Import-Zeit von CLI und GUI (sonst Exit-Code 1)')
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'Import':<28} {'Median':>9} {'Min':>9}")
+    cli_times = None
+    for module in ('whisper_kruse_diarization', 'interviewforge_gui'):
+        import_times(module)  # Bytecode-Cache anlegen
+        try:
+            runs = [import_times(module) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{module:<28} übersprungen ({e})")
+            continue
+        totals = [times[module] for times in runs]
+        print(f"{module:<28} {statistics.median(totals):>7.1f}ms {min(totals):>7.1f}ms")
+
+        heavy = sorted({name.split('.')[0] for name in runs[0]} & set(HEAVY_MODULES))
+        if heavy:
+            failures.append(f"{module} importiert {', '.join(heavy)}")
+        if args.max_ms and statistics.median(totals) > args.max_ms:
+            failures.append(f"{module}: {statistics.median(totals):.1f}ms > {args.max_ms:.0f}ms")
+        if module == 'whisper_kruse_diarization':
+            cli_times = runs[0]
+
+    print(f"\n{'Aufruf':<28} {'Median':>9}")
+    baseline = statistics.median(wall_time(['-c', 'pass']) for _ in range(args.runs))
+    print(f"{'python -c pass':<28} {baseline:>7.1f}ms")
+    for label, call in (('Skript --help', ['whisper_kruse_diarization.py', '--help']),
+                        ('-m --help', ['-m', 'whisper_kruse_diarization', '--help']),
+                        ('-m render --help', ['-m', 'whisper_kruse_diarization', 'render', '--help'])):
+        elapsed = statistics.median(wall_time(call) for _ in range(args.runs))
+        print(f"{label:<28} {elapsed:>7.1f}ms")
+
+    if cli_times:
+        print("\nLangsamste Importe (whisper_kruse_diarization, kumuliert):")
+        slowest = sorted((item for item in cli_times.items() if item[0] != 'whisper_kruse_diarization'),
+                         key=lambda item: item[1], reverse=True)
+        for name, elapsed in slowest[:args.top]:
+            print(f"  {name:<40} {elapsed:>7.1f}ms")
+
+    if failures:
+        print()
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
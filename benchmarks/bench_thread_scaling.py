@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Durchsatz mehrerer gleichzeitiger Instanzen auf einem Host - torch mit
+Standard-Threading (jede Instanz nimmt alle Kerne) vs. aufgeteilte Kerne
+(plan_core_partitions + configure_threads, wie --instances/--pin-cores).
+
+Jeder Worker ist ein eigener Prozess und rechnet eine feste Zahl von Durchläufen
+durch einen Transformer-Encoder (synthetisch oder der Encoder eines Whisper-Modells).
+Gemessen wird der Gesamtdurchsatz (Durchläufe/s) und die Skalierung gegenüber 1 Worker.
+
+Verwendung: python benchmarks/bench_thread_scaling.py [--workers 1 2 4 8] [--iterations 20]
+                                                      [--whisper-model tiny]
+"""
+
+import sys
+import time
+import argparse
+import multiprocessing as mp
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from whisper_kruse_diarization import available_cores, configure_threads, plan_core_partitions
+
+
+def build_workload(whisper_model):
+    """Encoder und Eingabe: Whisper-Encoder auf 30 s Mel oder ein vergleichbar großer
+    synthetischer Transformer-Encoder"""
+    import torch
+
+    if whisper_model:
+        import whisper
+
+        model = whisper.load_model(whisper_model, device='cpu')
+        return model.encoder, torch.randn(1, model.dims.n_mels, 3000)
+
+    layer = torch.nn.TransformerEncoderLayer(d_model=384, nhead=6, dim_feedforward=1536, batch_first=True)
+    return torch.nn.TransformerEncoder(layer, num_layers=4).eval(), torch.randn(1, 1500, 384)
+
+
+def worker(cores, threads, iterations, whisper_model, ready, start, results):
+    # Threads müssen vor dem Import von torch feststehen
+    if cores is not None:
+        configure_threads(threads, 1, cores, pin=True)
+
+    import torch
+
+    encoder, batch = build_workload(whisper_model)
+    with torch.inference_mode():
+        encoder(batch)  # Aufwärmen
+        ready.wait()
+        start.wait()
+        begin = time.perf_counter()
+        for _ in range(iterations):
+            encoder(batch)
+        results.put(time.perf_counter() - begin)
+
+
+def run(workers: int, partitioned: bool, iterations: int, whisper_model) -> float:
+    """Startet workers Prozesse gleichzeitig und liefert den Gesamtdurchsatz (Durchläufe/s)"""
+    ctx = mp.get_context('spawn')
+    ready = ctx.Barrier(workers + 1)
+    start = ctx.Barrier(workers + 1)
+    results = ctx.Queue()
+
+    partitions = plan_core_partitions(available_cores(), workers)
+    processes = [
+        ctx.Process(target=worker, args=(partitions[k] if partitioned else None, len(partitions[k]),
+                                         iterations, whisper_model, ready, start, results))
+        for k in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    ready.wait()
+    start.wait()
+    elapsed = max(results.get() for _ in processes)
+    for process in processes:
+        process.join()
+    return workers * iterations / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für Thread-Aufteilung bei mehreren Instanzen")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help='Zu messende Anzahl gleichzeitiger Worker')
+    parser.add_argument('--iterations', type=int, default=20, help='Durchläufe pro Worker')
+    parser.add_argument('--whisper-model', type=str, default=None,
+                        help='Encoder dieses Whisper-Modells statt des synthetischen verwenden')
+    args = parser.parse_args()
+
+    print(f"{len(available_cores())} Kerne, Last: "
+          f"{'Whisper-Encoder ' + args.whisper_model if args.whisper_model else 'synthetischer Encoder'}")
+    print(f"{'Worker':>7} {'Standard':>12} {'Skalierung':>11} {'Aufgeteilt':>12} {'Skalierung':>11}")
+
+    baseline = {}
+    for workers in args.workers:
+        row = []
+        for partitioned in (False, True):
+            throughput = run(workers, partitioned, args.iterations, args.whisper_model)
+            baseline.setdefault(partitioned, throughput)
+            row.append(f"{throughput:>10.2f}/s {throughput / baseline[partitioned]:>10.2f}x")
+        print(f"{workers:>7} " + " ".join(row))
+
+
+if __name__ == '__main__':
+    main()
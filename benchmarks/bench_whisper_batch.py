@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: lokales Whisper Datei für Datei (model.transcribe) vs. gebündelte
+Dekodierung von 30-s-Mel-Fenstern (--whisper-batch) bei verschiedenen Batch-Größen.
+
+Gemessen wird der Echtzeitfaktor (RTF = Rechenzeit / Audiodauer, kleiner ist besser).
+Ohne --audio werden synthetische Clips (Rauschen) verwendet - das misst nur den
+Durchsatz, für realistische Zahlen einen Ordner mit kurzen Interviews angeben.
+
+Verwendung: python benchmarks/bench_whisper_batch.py [--audio ./clips] [--model base]
+                                                     [--batch-sizes 1 2 4 8 16]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from whisper_kruse_diarization import (
+    AUDIO_EXTENSIONS, SAMPLE_RATE, WhisperModelSession, buffered_output, decode_audio,
+    decode_audio_windows, split_audio_windows
+)
+
+
+def load_clips(audio_folder: Path, limit: int):
+    """Dekodiert bis zu limit Dateien und teilt sie in 30-s-Fenster"""
+    files = sorted(f for f in audio_folder.iterdir() if f.suffix.lower() in AUDIO_EXTENSIONS)[:limit]
+    buffers = [decode_audio(f, None) for f in files]
+    return buffers, [buffer[int(a * SAMPLE_RATE):int(b * SAMPLE_RATE)]
+                     for buffer in buffers for a, b in split_audio_windows(buffer)]
+
+
+def synthetic_clips(count: int, seed: int = 0):
+    """Kurze Vox-Pop-artige Clips (5-30 s) aus leisem Rauschen"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    buffers = [(rng.standard_normal(int(rng.uniform(5, 30) * SAMPLE_RATE)) * 0.01).astype(np.float32)
+               for _ in range(count)]
+    return buffers, buffers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für gebündeltes lokales Whisper")
+    parser.add_argument('--audio', type=str, default=None, help='Ordner mit kurzen Audio-Dateien')
+    parser.add_argument('--files', type=int, default=32, help='Anzahl Dateien bzw. synthetischer Clips')
+    parser.add_argument('--model', type=str, default='base', help='Whisper-Modellgröße')
+    parser.add_argument('--device', type=str, default=None, help='cpu oder cuda (Standard: automatisch)')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 2, 4, 8, 16],
+                        help='Zu messende Batch-Größen')
+    parser.add_argument('--language', type=str, default='de')
+    args = parser.parse_args()
+
+    if args.audio:
+        buffers, clips = load_clips(Path(args.audio), args.files)
+    else:
+        buffers, clips = synthetic_clips(args.files)
+    audio_s = sum(len(b) for b in buffers) / SAMPLE_RATE
+
+    session = WhisperModelSession(args.model, args.device)
+    with buffered_output():
+        model = session.load()
+
+    print(f"{len(buffers)} Dateien, {len(clips)} Fenster, {audio_s / 60:.1f} min Audio, "
+          f"Modell {args.model} auf {session.device}")
+    print(f"{'Variante':>22} {'Zeit':>9} {'RTF':>8} {'Speedup':>8}")
+
+    # Aufwärmen (CUDA-Kernel, Caches)
+    decode_audio_windows(model, clips[:1], args.language, 1)
+
+    start = time.perf_counter()
+    for buffer in buffers:
+        model.transcribe(buffer, language=args.language, task="transcribe", verbose=None, temperature=0.0)
+    baseline = time.perf_counter() - start
+    print(f"{'transcribe (Datei)':>22} {baseline:>8.1f}s {baseline / audio_s:>8.3f} {1.0:>7.2f}x")
+
+    for batch_size in args.batch_sizes:
+        start = time.perf_counter()
+        decode_audio_windows(model, clips, args.language, batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"{f'Batch {batch_size}':>22} {elapsed:>8.1f}s {elapsed / audio_s:>8.3f} "
+              f"{baseline / elapsed:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,7 @@ from tkinter import ttk, filedialog, scrolledtext, messagebox
 from pathlib import Path
 import threading
 import subprocess
+import signal
 import queue
 from datetime import datetime
 
@@ -24,6 +25,7 @@ class InterviewForgeGUI:
         self.output_queue = queue.Queue()
         self.process = None
         self.is_running = False
+        self.stop_requested = False
 
         # Farben
         self.bg_color = "#f0f0f0"
@@ -79,7 +81,7 @@ class InterviewForgeGUI:
         mode_combo = ttk.Combobox(
             settings_frame,
             textvariable=self.mode_var,
-            values=["auto", "api", "local"],
+            values=["auto", "api", "local", "faster-whisper"],
             state="readonly",
             width=20
         )
@@ -122,6 +124,42 @@ class InterviewForgeGUI:
             row=2, column=2, columnspan=2, sticky=tk.W, pady=5
         )
 
+        # Audio-Optimierung (parallel, unveränderte Dateien werden übersprungen)
+        self.preprocess_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            settings_frame,
+            text="Audio vorher optimieren",
+            variable=self.preprocess_var
+        ).grid(row=3, column=1, sticky=tk.W, padx=10, pady=5)
+        tk.Label(settings_frame, text="Erzeugt *_optimized.wav parallel auf allen CPU-Kernen",
+                 font=("Helvetica", 8), fg="gray").grid(row=3, column=2, columnspan=2, sticky=tk.W, pady=5)
+
+        # Worker-Prozesse (nur lokal)
+        tk.Label(settings_frame, text="Worker (lokal):").grid(row=4, column=0, sticky=tk.W, pady=5)
+        self.workers_var = tk.IntVar(value=1)
+        ttk.Spinbox(
+            settings_frame,
+            from_=1,
+            to=max(1, os.cpu_count() or 1),
+            textvariable=self.workers_var,
+            width=20
+        ).grid(row=4, column=1, sticky=tk.W, padx=10, pady=5)
+        tk.Label(settings_frame, text="Parallele Prozesse mit eigenen Modellen, die CPU-Kerne werden aufgeteilt",
+                 font=("Helvetica", 8), fg="gray").grid(row=4, column=2, columnspan=2, sticky=tk.W, pady=5)
+
+        # Lautheits-Normalisierung der Audio-Optimierung
+        tk.Label(settings_frame, text="Lautheit:").grid(row=5, column=0, sticky=tk.W, pady=5)
+        self.loudnorm_var = tk.StringVar(value="dynamic")
+        ttk.Combobox(
+            settings_frame,
+            textvariable=self.loudnorm_var,
+            values=["dynamic", "two-pass"],
+            state="readonly",
+            width=20
+        ).grid(row=5, column=1, sticky=tk.W, padx=10, pady=5)
+        tk.Label(settings_frame, text="two-pass: genauer, misst jede Datei vorab (Messung wird zwischengespeichert)",
+                 font=("Helvetica", 8), fg="gray").grid(row=5, column=2, columnspan=2, sticky=tk.W, pady=5)
+
         # === OUTPUT-FORMATE ===
         formats_frame = ttk.LabelFrame(main_frame, text="📄 Ausgabeformate", padding=15)
         formats_frame.pack(fill=tk.X, pady=(0, 10))
@@ -271,7 +309,8 @@ class InterviewForgeGUI:
         info_texts = {
             "auto": "Automatisch (API wenn verfügbar, sonst lokal)",
             "api": "OpenAI Whisper API (beste Qualität)",
-            "local": "Lokales Whisper (Datenschutz, kostenlos)"
+            "local": "Lokales Whisper (Datenschutz, kostenlos)",
+            "faster-whisper": "Lokal mit faster-whisper (int8, schneller auf CPU)"
         }
         self.mode_info_var.set(info_texts.get(mode, ""))
 
@@ -366,6 +405,7 @@ class InterviewForgeGUI:
             return
 
         self.is_running = True
+        self.stop_requested = False
         self.start_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
         self.progress_bar.start()
@@ -389,8 +429,11 @@ class InterviewForgeGUI:
             if self.hf_token_var.get():
                 env['HF_TOKEN'] = self.hf_token_var.get()
 
-            # Baue Kommando
-            script_path = Path(__file__).parent / "whisper_kruse_diarization.py"
+            # Baue Kommando - als Modul (-m) gestartet nutzt Python den Bytecode-Cache,
+            # statt das Skript bei jedem Lauf neu zu kompilieren
+            script_dir = str(Path(__file__).parent)
+            env['PYTHONPATH'] = os.pathsep.join(filter(None, [script_dir, env.get('PYTHONPATH')]))
+            script_cmd = [sys.executable, '-m', 'whisper_kruse_diarization']
 
             # Sammle gewählte Formate
             formats = []
@@ -403,9 +446,7 @@ class InterviewForgeGUI:
             if self.format_html_var.get():
                 formats.append('html')
 
-            cmd = [
-                sys.executable,
-                str(script_path),
+            cmd = script_cmd + [
                 self.folder_var.get(),
                 '--pattern', '*_optimized.wav',
                 '--speakers', str(self.speakers_var.get()),
@@ -413,37 +454,68 @@ class InterviewForgeGUI:
                 '--model-size', self.model_size_var.get(),
                 '--formats'
             ] + formats
-
+            if self.mode_var.get() in ('local', 'faster-whisper') and self.workers_var.get() > 1:
+                cmd += ['--workers', str(self.workers_var.get())]
+
+            # Schritt 1: Audio-Optimierung
+            if self.preprocess_var.get():
+                preprocess_cmd = script_cmd + ['preprocess', self.folder_var.get(),
+                                               '--loudnorm', self.loudnorm_var.get()]
+                self.log(f"Befehl: {' '.join(preprocess_cmd)}")
+                self.log("")
+
+                returncode = self.run_command(preprocess_cmd, env)
+                if self.stop_requested:
+                    self.output_queue.put("STOPPED")
+                    return
+                if returncode != 0:
+                    self.output_queue.put(f"ERROR: Audio-Optimierung fehlgeschlagen (Exit code {returncode})")
+                    return
+                self.output_queue.put("")
+
+            # Schritt 2: Transkription
             self.log(f"Befehl: {' '.join(cmd)}")
             self.log(f"Formate: {', '.join(formats)}")
             self.log("")
 
-            # Führe aus
-            self.process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                env=env
-            )
-
-            # Lese Output
-            for line in self.process.stdout:
-                if not self.is_running:
-                    break
-                self.output_queue.put(line.strip())
-
-            self.process.wait()
+            returncode = self.run_command(cmd, env)
+            if self.stop_requested:
+                self.output_queue.put("STOPPED")
+                return
 
-            if self.process.returncode == 0:
+            if returncode == 0:
                 self.output_queue.put("SUCCESS")
             else:
-                self.output_queue.put(f"ERROR: Exit code {self.process.returncode}")
+                self.output_queue.put(f"ERROR: Exit code {returncode}")
 
         except Exception as e:
             self.output_queue.put(f"EXCEPTION: {str(e)}")
 
+    def run_command(self, cmd, env):
+        """Führe Kommando aus und leite Output in die Queue (in separatem Thread)"""
+        self.process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            env=env,
+            # Eigene Prozessgruppe, damit der Stopp-Button unter Windows CTRL_BREAK senden kann
+            creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == 'nt' else 0
+        )
+
+        if self.stop_requested:
+            # Stopp kam, während noch kein Prozess lief
+            self.send_stop()
+
+        # Lese Output bis EOF - auch nach einem Stopp, solange laufende Dateien noch abgeschlossen
+        # werden; sonst läuft die Pipe voll und CLI bzw. Worker blockieren beim Schreiben
+        for line in self.process.stdout:
+            self.output_queue.put(line.strip())
+
+        self.process.wait()
+        return self.process.returncode
+
     def check_output_queue(self):
         """Prüfe Output-Queue und aktualisiere GUI"""
         try:
@@ -468,6 +540,12 @@ class InterviewForgeGUI:
                     self.finish_transcription()
                     messagebox.showerror("Fehler", message)
 
+                elif message == "STOPPED":
+                    self.log("")
+                    self.log("⏹️ Transkription abgebrochen")
+                    self.status_var.set("Abgebrochen")
+                    self.finish_transcription()
+
                 elif message.startswith("EXCEPTION:"):
                     self.log("")
                     self.log(f"💥 Exception: {message[11:]}")
@@ -486,15 +564,28 @@ class InterviewForgeGUI:
             self.root.after(100, self.check_output_queue)
 
     def stop_transcription(self):
-        """Stoppe Transkription"""
+        """Stoppe Transkription: erst geordnet, ein zweiter Klick beendet sofort.
+        Als abgebrochen gilt der Lauf erst, wenn der Prozess wirklich beendet ist"""
+        if self.stop_requested:
+            if messagebox.askyesno("Bestätigen", "Laufende Dateien nicht abwarten und sofort beenden?"):
+                self.send_stop()
+            return
+
         if messagebox.askyesno("Bestätigen", "Möchtest du die Transkription wirklich abbrechen?"):
-            self.is_running = False
-            if self.process:
-                self.process.terminate()
+            self.stop_requested = True
+            self.send_stop()
             self.log("")
-            self.log("⏹️ Transkription abgebrochen")
-            self.status_var.set("Abgebrochen")
-            self.finish_transcription()
+            self.log("⏹️ Stopp angefordert - laufende Dateien werden noch abgeschlossen...")
+            self.status_var.set("Wird gestoppt...")
+
+    def send_stop(self):
+        """Signal an die CLI (zweites Signal: Worker werden sofort beendet)"""
+        if self.process and self.process.poll() is None:
+            # Geordnet beenden: Worker schließen ihre aktuelle Datei noch ab
+            if os.name == 'nt':
+                self.process.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                self.process.terminate()
 
     def finish_transcription(self):
         """Aufräumen nach Transkription"""
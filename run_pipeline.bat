@@ -1,15 +1,17 @@
 @echo off
 REM Vollständige Transkriptions-Pipeline für Windows
-REM Verwendung: run_pipeline.bat C:\path\to\audio\folder [anzahl_sprecher] [mode]
+REM Verwendung: run_pipeline.bat C:\path\to\audio\folder [anzahl_sprecher] [mode] [loudnorm]
 REM mode: api (OpenAI API), local (lokal), auto (automatisch, Standard)
+REM loudnorm: dynamic (ein Durchgang, Standard), two-pass (Messung + lineare Normalisierung)
 
 setlocal enabledelayedexpansion
 
 REM Prüfe Argumente
 if "%~1"=="" (
     echo [ERROR] Kein Input-Ordner angegeben!
-    echo Verwendung: run_pipeline.bat C:\path\to\audio\folder [anzahl_sprecher] [mode]
+    echo Verwendung: run_pipeline.bat C:\path\to\audio\folder [anzahl_sprecher] [mode] [loudnorm]
     echo   mode: api ^(OpenAI API^), local ^(lokal^), auto ^(automatisch, Standard^)
+    echo   loudnorm: dynamic ^(Standard^), two-pass ^(genauer, misst jede Datei vorab^)
     exit /b 1
 )
 
@@ -18,6 +20,8 @@ set SPEAKERS=%2
 if "%SPEAKERS%"=="" set SPEAKERS=2
 set MODE=%3
 if "%MODE%"=="" set MODE=auto
+set LOUDNORM=%4
+if "%LOUDNORM%"=="" set LOUDNORM=dynamic
 
 REM Prüfe ob Ordner existiert
 if not exist "%INPUT_DIR%" (
@@ -85,33 +89,12 @@ REM SCHRITT 1: Audio-Optimierung
 REM ============================================
 echo [INFO] Schritt 1/3: Audio-Optimierung
 
-set OPTIMIZED_COUNT=0
-for %%f in ("%INPUT_DIR%\*.m4a" "%INPUT_DIR%\*.mp3" "%INPUT_DIR%\*.wav") do (
-    if exist "%%f" (
-        set "filename=%%~nf"
-        set "filepath=%%~dpnf"
-
-        REM Skip falls bereits optimiert
-        echo !filename! | findstr /C:"_optimized" >nul
-        if errorlevel 1 (
-            set "output=!filepath!_optimized.wav"
-
-            if exist "!output!" (
-                echo [INFO] Existiert bereits: %%~nxf
-                set /a OPTIMIZED_COUNT+=1
-            ) else (
-                echo [INFO] Optimiere: %%~nxf
-                ffmpeg -i "%%f" -ar 16000 -ac 1 -af "highpass=f=200,lowpass=f=3000,loudnorm=I=-16" "!output!" -y -loglevel error
-                set /a OPTIMIZED_COUNT+=1
-            )
-        ) else (
-            echo [INFO] Überspringe (bereits optimiert): %%~nxf
-        )
-    )
+REM Parallel über alle CPU-Kerne, unveränderte Dateien werden per Inhalts-Hash übersprungen
+python whisper_kruse_diarization.py preprocess "%INPUT_DIR%" --loudnorm %LOUDNORM%
+if errorlevel 1 (
+    echo [WARN] Fehler beim Optimieren einzelner Dateien
 )
 
-echo [INFO] Optimiert: %OPTIMIZED_COUNT% Dateien
-
 REM ============================================
 REM SCHRITT 2: Transkription
 REM ============================================
@@ -14,9 +14,13 @@
 .PARAMETER Mode
     Whisper-Modus: api (OpenAI API), local (lokal), auto (automatisch, Standard)
 
+.PARAMETER Loudnorm
+    Lautheits-Normalisierung: dynamic (ein Durchgang, Standard), two-pass (Messung + lineare Normalisierung)
+
 .EXAMPLE
     .\run_pipeline.ps1 -InputDir "C:\audio" -Speakers 2 -Mode api
     .\run_pipeline.ps1 "C:\audio" 2 local
+    .\run_pipeline.ps1 "C:\audio" -Loudnorm two-pass
     .\run_pipeline.ps1 "C:\audio"
 
 .NOTES
@@ -33,7 +37,11 @@ param(
 
     [Parameter(Mandatory=$false, Position=2)]
     [ValidateSet('api', 'local', 'auto')]
-    [string]$Mode = 'auto'
+    [string]$Mode = 'auto',
+
+    [Parameter(Mandatory=$false, Position=3)]
+    [ValidateSet('dynamic', 'two-pass')]
+    [string]$Loudnorm = 'dynamic'
 )
 
 # Farb-Funktionen
@@ -137,44 +145,12 @@ Write-Host "=" * 70 -ForegroundColor Cyan
 Write-Info "Schritt 1/3: Audio-Optimierung"
 Write-Host "=" * 70 -ForegroundColor Cyan
 
-$optimizedCount = 0
+# Parallel über alle CPU-Kerne, unveränderte Dateien werden per Inhalts-Hash übersprungen
+& python whisper_kruse_diarization.py preprocess "$InputDir" --loudnorm $Loudnorm
 
-foreach ($file in $audioFiles) {
-    $baseName = $file.BaseName
-    $directory = $file.DirectoryName
-
-    # Skip falls bereits optimiert
-    if ($baseName -like "*_optimized") {
-        Write-Info "Überspringe (bereits optimiert): $($file.Name)"
-        continue
-    }
-
-    $outputFile = Join-Path $directory "$($baseName)_optimized.wav"
-
-    if (Test-Path $outputFile) {
-        Write-Info "Existiert bereits: $($baseName)_optimized.wav"
-        $optimizedCount++
-        continue
-    }
-
-    Write-Info "Optimiere: $($file.Name)"
-
-    & ffmpeg -i "$($file.FullName)" `
-        -ar 16000 `
-        -ac 1 `
-        -af "highpass=f=200,lowpass=f=3000,loudnorm=I=-16" `
-        "$outputFile" `
-        -y `
-        -loglevel error
-
-    if ($LASTEXITCODE -eq 0) {
-        $optimizedCount++
-    } else {
-        Write-Warn "Fehler beim Optimieren von: $($file.Name)"
-    }
+if ($LASTEXITCODE -ne 0) {
+    Write-Warn "Fehler beim Optimieren einzelner Dateien"
 }
-
-Write-Info "Optimiert: $optimizedCount Dateien"
 Write-Host ""
 
 # ============================================
@@ -1,7 +1,8 @@
 #!/bin/bash
 # Vollständige Transkriptions-Pipeline
-# Verwendung: ./run_pipeline.sh /path/to/audio/folder [anzahl_sprecher] [mode]
+# Verwendung: ./run_pipeline.sh /path/to/audio/folder [anzahl_sprecher] [mode] [loudnorm]
 # mode: api (OpenAI API), local (lokal), auto (automatisch)
+# loudnorm: dynamic (ein Durchgang, Standard), two-pass (Messung + lineare Normalisierung)
 
 set -e  # Exit bei Fehler
 
@@ -27,14 +28,16 @@ log_error() {
 # Prüfe Argumente
 if [ $# -eq 0 ]; then
     log_error "Kein Input-Ordner angegeben!"
-    echo "Verwendung: ./run_pipeline.sh /path/to/audio/folder [anzahl_sprecher] [mode]"
+    echo "Verwendung: ./run_pipeline.sh /path/to/audio/folder [anzahl_sprecher] [mode] [loudnorm]"
     echo "  mode: api (OpenAI API), local (lokal), auto (automatisch, Standard)"
+    echo "  loudnorm: dynamic (Standard), two-pass (genauer, misst jede Datei vorab)"
     exit 1
 fi
 
 INPUT_DIR="$1"
 SPEAKERS="${2:-2}"  # Default: 2 Sprecher
 MODE="${3:-auto}"   # Default: auto
+LOUDNORM="${4:-dynamic}"  # Default: dynamic
 
 # Prüfe ob Ordner existiert
 if [ ! -d "$INPUT_DIR" ]; then
@@ -92,41 +95,8 @@ fi
 # ============================================
 log_info "Schritt 1/3: Audio-Optimierung"
 
-OPTIMIZED_COUNT=0
-for file in "$INPUT_DIR"/*.{m4a,mp3,wav}; do
-    # Skip falls Glob nicht matched
-    [ -e "$file" ] || continue
-
-    # Skip falls bereits optimiert
-    basename=$(basename "$file")
-    if [[ $basename == *"_optimized.wav" ]]; then
-        log_info "Überspringe (bereits optimiert): $basename"
-        continue
-    fi
-
-    # Generiere Output-Namen
-    filename="${file%.*}"
-    output="${filename}_optimized.wav"
-
-    if [ -f "$output" ]; then
-        log_info "Existiert bereits: $(basename "$output")"
-        OPTIMIZED_COUNT=$((OPTIMIZED_COUNT + 1))
-        continue
-    fi
-
-    log_info "Optimiere: $(basename "$file")"
-    ffmpeg -i "$file" \
-        -ar 16000 \
-        -ac 1 \
-        -af "highpass=f=200,lowpass=f=3000,loudnorm=I=-16" \
-        "$output" \
-        -y \
-        -loglevel error
-
-    OPTIMIZED_COUNT=$((OPTIMIZED_COUNT + 1))
-done
-
-log_info "Optimiert: $OPTIMIZED_COUNT Dateien"
+# Parallel über alle CPU-Kerne, unveränderte Dateien werden per Inhalts-Hash übersprungen
+python3 whisper_kruse_diarization.py preprocess "$INPUT_DIR" --loudnorm "$LOUDNORM"
 
 # ============================================
 # SCHRITT 2: Transkription
@@ -0,0 +1,43 @@
+"""Chunk-Planung für lange API-Dateien und Zusammensetzen der Chunk-Segmente"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from whisper_kruse_diarization import plan_audio_chunks, stitch_chunk_segments
+
+
+def test_short_file_is_one_chunk():
+    assert plan_audio_chunks(300.0, [], max_chunk_s=600.0) == [(0.0, 300.0)]
+
+
+def test_cuts_without_silence_overlap():
+    chunks = plan_audio_chunks(1500.0, [], max_chunk_s=600.0, overlap_s=2.0)
+    assert chunks == [(0.0, 600.0), (598.0, 1198.0), (1196.0, 1500.0)]
+
+
+def test_cuts_prefer_latest_silence_in_last_third():
+    # Stille bei 350 s liegt vor dem letzten Drittel (400-600 s) und wird ignoriert
+    silences = [(349.0, 351.0), (449.0, 451.0), (549.0, 551.0), (1000.0, 1002.0)]
+    chunks = plan_audio_chunks(1500.0, silences, max_chunk_s=600.0, overlap_s=2.0)
+    assert chunks == [(0.0, 550.0), (550.0, 1001.0), (1001.0, 1500.0)]
+    # Lückenlos, jeder Chunk höchstens max_chunk_s lang
+    assert all(end - start <= 600.0 for start, end in chunks)
+    assert all(chunks[k][1] == chunks[k + 1][0] for k in range(len(chunks) - 1))
+
+
+def test_stitch_shifts_to_global_time_and_drops_overlap_duplicates():
+    chunks = [(0.0, 600.0), (598.0, 1000.0)]
+    chunk_segments = [
+        [{'start': 0.0, 'end': 4.0, 'text': ' Erster Satz.'},
+         {'start': 597.0, 'end': 599.5, 'text': 'Über die Kante'}],
+        [{'start': 0.0, 'end': 1.5, 'text': 'über die Kante'},  # erneut gehört (global 598 s)
+         {'start': 2.5, 'end': 5.0, 'text': 'Zweiter Satz.'}],
+    ]
+    stitched = stitch_chunk_segments(chunks, chunk_segments)
+    assert stitched == [
+        {'start': 0.0, 'end': 4.0, 'text': 'Erster Satz.'},
+        {'start': 597.0, 'end': 599.5, 'text': 'Über die Kante'},
+        {'start': 600.5, 'end': 603.0, 'text': 'Zweiter Satz.'},
+    ]
@@ -0,0 +1,29 @@
+"""Kern-Aufteilung: Worker-Threads und Sperre der gemeinsamen Aufteilung mehrerer Instanzen"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from whisper_kruse_diarization import CoreCoordinator, _file_lock, plan_core_partitions, plan_worker_threads
+
+
+def test_explicit_threads_are_split_across_workers():
+    partitions = plan_core_partitions(list(range(8)), 3)
+    assert plan_worker_threads(10, partitions) == [4, 3, 3]
+    assert plan_worker_threads(2, partitions) == [1, 1, 1]
+    # Ohne Vorgabe: jeder Worker nutzt seine Kerne
+    assert plan_worker_threads(0, partitions) == [0, 0, 0]
+
+
+def test_claim_fails_while_layout_is_locked(tmp_path):
+    coordinator = CoreCoordinator(2, lock_dir=tmp_path)
+    with _file_lock(tmp_path / "layout.lock"):
+        with pytest.raises(TimeoutError):
+            coordinator.claim(timeout=0.1)
+    assert coordinator.slot is None
+
+    assert coordinator.claim() == 0
+    coordinator.release()
@@ -0,0 +1,27 @@
+"""Fensterweise Diarization: überlappende Fenster decken die ganze Datei ab"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from whisper_kruse_diarization import plan_diarization_windows
+
+
+def test_short_file_is_one_window():
+    assert plan_diarization_windows(600.0, 1800.0, 30.0) == [(0.0, 600.0)]
+    assert plan_diarization_windows(1800.0, 1800.0, 30.0) == [(0.0, 1800.0)]
+
+
+def test_windows_overlap_and_last_ends_at_file_end():
+    windows = plan_diarization_windows(4000.0, 1800.0, 30.0)
+    assert windows == [(0.0, 1800.0), (1770.0, 3570.0), (2200.0, 4000.0)]
+    assert all(end - start == 1800.0 for start, end in windows)
+    # Jedes Fenster überlappt das vorherige mindestens um overlap_s
+    assert all(windows[k][1] - windows[k + 1][0] >= 30.0 for k in range(len(windows) - 1))
+
+
+def test_overlap_larger_than_window_still_advances():
+    windows = plan_diarization_windows(10.0, 4.0, 10.0)
+    assert windows[0] == (0.0, 4.0) and windows[-1] == (6.0, 10.0)
+    assert [start for start, _ in windows] == sorted(start for start, _ in windows)
@@ -0,0 +1,28 @@
+"""Host-Profile aus 'autotune' gelten für das tatsächlich genutzte Gerät, nicht für die Eingabe 'auto'"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import whisper_kruse_diarization as wkd
+
+
+def test_auto_device_uses_profile_of_resolved_device(tmp_path, monkeypatch):
+    profile_file = tmp_path / "host_profile.json"
+    monkeypatch.setattr(wkd, 'detect_device', lambda device: 'cuda' if device == 'auto' else device)
+
+    # Kalibriert mit --device auto auf einem Host mit GPU
+    wkd.store_host_profile('auto', {'threads': 4}, profile_file)
+
+    assert wkd.load_host_profile('cuda', profile_file) == {'threads': 4}
+    assert wkd.load_host_profile('auto', profile_file) == {'threads': 4}
+    assert wkd.load_host_profile('cpu', profile_file) == {}
+
+
+def test_missing_profile_does_not_resolve_device(tmp_path, monkeypatch):
+    def fail(device):
+        raise AssertionError("detect_device ohne Profil aufgerufen")
+
+    monkeypatch.setattr(wkd, 'detect_device', fail)
+    assert wkd.load_host_profile('auto', tmp_path / "missing.json") == {}
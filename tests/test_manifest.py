@@ -0,0 +1,87 @@
+"""Checkpoint-Manifest: Wiederaufnahme nach Abbruch, Stufen-Ergebnisse und parallele Worker"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from whisper_kruse_diarization import RunManifest
+
+PARAMS = {'model': 'base', 'language': 'de'}
+ASR = {'segments': [{'start': 0.0, 'end': 1.5, 'text': 'Hallo'}]}
+
+
+def audio(tmp_path, name="a.wav", content=b"RIFF0001"):
+    audio_file = tmp_path / name
+    audio_file.write_bytes(content)
+    return audio_file
+
+
+def test_resume_loads_completed_stage(tmp_path):
+    audio_file = audio(tmp_path)
+    (tmp_path / "out").mkdir()
+    manifest = RunManifest(tmp_path / "out")
+    assert not manifest.has_file(audio_file)
+    manifest.complete(audio_file, 'asr', PARAMS, ASR)
+
+    # Neuer Lauf im selben Output-Ordner
+    resumed = RunManifest(tmp_path / "out")
+    assert resumed.has_file(audio_file)
+    assert resumed.is_done(audio_file, 'asr', PARAMS)
+    assert resumed.load(audio_file, 'asr', PARAMS) == ASR
+    assert not resumed.is_done(audio_file, 'diarization', PARAMS)
+    assert resumed.load(audio_file, 'diarization', PARAMS) is None
+
+
+def test_changed_params_input_or_artifact_invalidate(tmp_path):
+    audio_file = audio(tmp_path)
+    (tmp_path / "out").mkdir()
+    RunManifest(tmp_path / "out").complete(audio_file, 'asr', PARAMS, ASR)
+
+    manifest = RunManifest(tmp_path / "out")
+    assert manifest.load(audio_file, 'asr', {**PARAMS, 'model': 'small'}) is None
+    assert RunManifest(tmp_path / "out", refresh=True).load(audio_file, 'asr', PARAMS) is None
+
+    manifest.artifact_path(audio_file, 'asr').unlink()
+    assert manifest.load(audio_file, 'asr', PARAMS) is None
+
+    manifest.complete(audio_file, 'asr', PARAMS, ASR)
+    audio_file.write_bytes(b"RIFF0002")
+    assert RunManifest(tmp_path / "out").load(audio_file, 'asr', PARAMS) is None
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    audio_file = audio(tmp_path)
+    (tmp_path / "out").mkdir()
+    RunManifest(tmp_path / "out").complete(audio_file, 'asr', PARAMS, ASR)
+    with open(tmp_path / "out" / RunManifest.FILENAME, 'a', encoding='utf-8') as f:
+        f.write('{"file": "a.wav", "stage": "diar')  # Absturz mitten im Schreiben
+
+    manifest = RunManifest(tmp_path / "out")
+    assert manifest.load(audio_file, 'asr', PARAMS) == ASR
+    assert not manifest.is_done(audio_file, 'diarization', PARAMS)
+
+
+def test_parallel_processes_append_complete_lines(tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    files = [audio(tmp_path, f"f{k}.wav", f"RIFF{k}".encode()) for k in range(4)]
+    script = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from whisper_kruse_diarization import RunManifest\n"
+        "manifest = RunManifest(Path(sys.argv[1]))\n"
+        "for k in range(50):\n"
+        "    manifest.complete(Path(sys.argv[2]), f'stage{k}', {'k': k, 'pad': 'x' * 5000})\n"
+    )
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [str(ROOT), os.environ.get('PYTHONPATH')]))}
+    workers = [subprocess.Popen([sys.executable, '-c', script, str(out), str(audio_file)], env=env)
+               for audio_file in files]
+    assert all(worker.wait(timeout=60) == 0 for worker in workers)
+
+    manifest = RunManifest(out)
+    assert len(manifest.records) == 4 * 50
+    assert all(manifest.is_done(audio_file, 'stage49', {'k': 49, 'pad': 'x' * 5000}) for audio_file in files)
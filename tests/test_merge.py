@@ -0,0 +1,70 @@
+"""Sprecher-Zuordnung per Sweep liefert dasselbe wie die einfache Suche über alle Segment-Paare"""
+
+import random
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from whisper_kruse_diarization import merge_transcription_and_diarization
+
+
+def naive_merge(whisper_segments, diar_segments):
+    """Ursprüngliche O(N·M)-Zuordnung als Referenz"""
+    merged = []
+    last_known_speaker = None
+    for wseg in whisper_segments:
+        speaker = None
+        best_overlap = 0
+        for dseg in diar_segments:
+            overlap = max(0, min(wseg['end'], dseg['end']) - max(wseg['start'], dseg['start']))
+            if overlap > best_overlap:
+                best_overlap = overlap
+                speaker = dseg['speaker']
+        if speaker is None:
+            mid_time = (wseg['start'] + wseg['end']) / 2
+            for dseg in diar_segments:
+                if dseg['start'] <= mid_time <= dseg['end']:
+                    speaker = dseg['speaker']
+                    break
+            if speaker is None:
+                speaker = last_known_speaker or "UNKNOWN"
+        if speaker != "UNKNOWN":
+            last_known_speaker = speaker
+        merged.append({**wseg, 'speaker': speaker})
+    return merged
+
+
+def random_segments(rng, count, length, speakers=None):
+    segments = []
+    for _ in range(count):
+        # Ganzzahlige Zeiten erzeugen Gleichstände, Berührungen und Null-Längen
+        start = rng.randint(0, length)
+        segment = {'start': float(start), 'end': float(start + rng.randint(0, 8))}
+        if speakers:
+            segment['speaker'] = rng.choice(speakers)
+        segments.append(segment)
+    return segments
+
+
+def test_sweep_matches_naive_merge():
+    rng = random.Random(3)
+    for _ in range(300):
+        length = rng.randint(5, 60)
+        whisper_segments = [{**seg, 'text': f"t{k}"}
+                            for k, seg in enumerate(random_segments(rng, rng.randint(0, 15), length))]
+        diar_segments = random_segments(rng, rng.randint(0, 15), length, ['SPEAKER_00', 'SPEAKER_01', 'SPEAKER_02'])
+        transcript = SimpleNamespace(segments=[SimpleNamespace(**seg) for seg in whisper_segments])
+
+        merged = merge_transcription_and_diarization(transcript, {'segments': diar_segments})
+        assert merged == naive_merge(whisper_segments, diar_segments)
+
+
+def test_segment_without_overlap_keeps_last_speaker():
+    transcript = SimpleNamespace(segments=[SimpleNamespace(start=0.0, end=2.0, text=" Hallo "),
+                                           SimpleNamespace(start=10.0, end=11.0, text="Ja")])
+    diarization = {'segments': [{'start': 0.0, 'end': 3.0, 'speaker': 'SPEAKER_01'}]}
+
+    merged = merge_transcription_and_diarization(transcript, diarization)
+    assert [(seg['text'], seg['speaker']) for seg in merged] == [("Hallo", 'SPEAKER_01'), ("Ja", 'SPEAKER_01')]
@@ -0,0 +1,32 @@
+"""--model-dir leitet nur die Modell-Caches um, ein gespeichertes Hugging-Face-Login bleibt nutzbar"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from whisper_kruse_diarization import configure_model_dir
+
+
+def test_model_dir_keeps_saved_hf_token(tmp_path, monkeypatch):
+    # Token wie von `huggingface-cli login` unter dem Standard-HF_HOME gespeichert
+    hf_home = tmp_path / "hf_home"
+    hf_home.mkdir()
+    (hf_home / "token").write_text("hf_test")
+    monkeypatch.setenv('HF_HOME', str(hf_home))
+    for name in ('HF_HUB_CACHE', 'HUGGINGFACE_HUB_CACHE', 'PYANNOTE_CACHE', 'HF_TOKEN_PATH',
+                 'HF_HUB_OFFLINE', 'TRANSFORMERS_OFFLINE'):
+        monkeypatch.delenv(name, raising=False)
+
+    model_dir = tmp_path / "models"
+    configure_model_dir(model_dir, offline=True)
+
+    # huggingface_hub liest das Token aus HF_TOKEN_PATH bzw. $HF_HOME/token
+    assert os.environ['HF_HOME'] == str(hf_home)
+    token_path = Path(os.environ.get('HF_TOKEN_PATH', Path(os.environ['HF_HOME']) / "token"))
+    assert token_path.read_text() == "hf_test"
+    # Die Modelle selbst landen im Modell-Ordner
+    assert Path(os.environ['HF_HUB_CACHE']) == model_dir.resolve() / "huggingface" / "hub"
+    assert os.environ['HUGGINGFACE_HUB_CACHE'] == os.environ['HF_HUB_CACHE']
+    assert Path(os.environ['PYANNOTE_CACHE']).is_relative_to(model_dir.resolve())
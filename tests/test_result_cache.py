@@ -0,0 +1,28 @@
+"""Verdrängung im Ergebnis-Cache darf nur Cache-Einträge löschen (keine Modell-Manifeste o.ä.)"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from whisper_kruse_diarization import MODEL_MANIFEST, ResultCache, check_model_dir, write_model_manifest
+
+
+def test_eviction_keeps_prefetched_model_manifest(tmp_path):
+    # Modell-Ordner innerhalb des Cache-Ordners (z.B. per --model-dir so gewählt)
+    model_dir = tmp_path / "models"
+    (model_dir / "whisper").mkdir(parents=True)
+    (model_dir / "whisper" / "base.pt").write_bytes(b"\0" * 1000)
+    write_model_manifest(model_dir, {'whisper': ['base']})
+
+    audio_file = tmp_path / "a.wav"
+    audio_file.write_bytes(b"RIFF")
+    cache = ResultCache(tmp_path, max_size_mb=0.0001)
+    for k in range(5):
+        cache.store('asr', audio_file, {'run': k}, {'segments': [{'text': 'x' * 100}]})
+    cache.evict()
+
+    assert (model_dir / MODEL_MANIFEST).exists()
+    assert check_model_dir(model_dir, [('whisper', 'base')]) == []
+    # Die Verdrängung selbst hat gegriffen
+    assert len(list((tmp_path / "asr").glob("*.json"))) < 5
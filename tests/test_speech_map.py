@@ -0,0 +1,55 @@
+"""VAD-Vorschnitt: Zeiten im geschnittenen Audio zurück auf die Originalzeitachse"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from whisper_kruse_diarization import SpeechMap
+
+# Sprache 1-3 s, 5-6 s und 10-12 s einer 15-s-Datei: geschnitten 0-2, 2-3, 3-5
+REGIONS = [(1.0, 3.0), (5.0, 6.0), (10.0, 12.0)]
+
+
+def test_offsets_and_skipped_fraction():
+    speech_map = SpeechMap(REGIONS, 15.0)
+    assert speech_map.offsets == [0.0, 2.0, 3.0]
+    assert speech_map.speech_duration == 5.0
+    assert speech_map.skipped_fraction == pytest.approx(2 / 3)
+
+
+def test_times_at_cut_edges():
+    speech_map = SpeechMap(REGIONS, 15.0)
+    assert speech_map.to_original(0.0) == 1.0
+    assert speech_map.to_original(1.5) == 2.5
+    # Start an der Schnittkante beginnt im nächsten Bereich, Ende gehört zum vorherigen
+    assert speech_map.to_original(2.0) == 5.0
+    assert speech_map.to_original(2.0, is_end=True) == 3.0
+    assert speech_map.to_original(3.5) == 10.5
+    # Über das Ende hinaus: am letzten Bereich abgeschnitten
+    assert speech_map.to_original(9.0) == 12.0
+
+
+def test_map_segments_keeps_real_pauses():
+    speech_map = SpeechMap(REGIONS, 15.0)
+    segments = [{'start': 0.5, 'end': 2.0, 'text': 'a'}, {'start': 2.0, 'end': 4.0, 'speaker': 'SPEAKER_00'}]
+    assert speech_map.map_segments(segments) == [
+        {'start': 1.5, 'end': 3.0, 'text': 'a'},
+        {'start': 5.0, 'end': 11.0, 'speaker': 'SPEAKER_00'},
+    ]
+
+
+def test_round_trip_and_without_regions():
+    speech_map = SpeechMap.from_dict(SpeechMap(REGIONS, 15.0).to_dict())
+    assert speech_map.regions == REGIONS and speech_map.duration == 15.0
+    # Keine Sprache erkannt: Zeiten bleiben unverändert
+    assert SpeechMap([], 15.0).to_original(4.0) == 4.0
+
+
+def test_trim_buffer_concatenates_regions():
+    np = pytest.importorskip('numpy')
+    audio = np.arange(15, dtype=np.float32)
+    trimmed = SpeechMap(REGIONS, 15.0).trim_buffer(audio, sample_rate=1)
+    assert trimmed.tolist() == [1, 2, 5, 10, 11]
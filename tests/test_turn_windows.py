@@ -0,0 +1,40 @@
+"""Diarization zuerst: Sprecher-Turns zu Whisper-Fenstern mit genau einem Sprecher zusammenfassen"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from whisper_kruse_diarization import plan_turn_windows
+
+
+def turn(start, end, speaker):
+    return {'start': start, 'end': end, 'speaker': speaker}
+
+
+def test_same_speaker_turns_are_joined_up_to_gap_and_window():
+    turns = [turn(0.0, 5.0, 'A'), turn(5.5, 10.0, 'A'),  # kurze Pause: ein Fenster
+             turn(12.0, 20.0, 'A'),                      # Pause > max_gap_s: neues Fenster
+             turn(20.5, 45.0, 'A')]                      # würde 30 s überschreiten
+    assert plan_turn_windows(turns, max_window_s=30.0, max_gap_s=1.0) == [
+        (0.0, 10.0, 'A'), (12.0, 20.0, 'A'), (20.5, 45.0, 'A')]
+
+
+def test_speaker_change_and_overlap_go_to_first_speaker():
+    turns = [turn(3.0, 6.0, 'B'), turn(0.0, 4.0, 'A'), turn(5.0, 5.1, 'A')]
+    # B beginnt während A noch spricht: B ab dem Ende von A; der kurze Rest von A fällt weg
+    assert plan_turn_windows(turns) == [(0.0, 4.0, 'A'), (4.0, 6.0, 'B')]
+
+
+def test_long_turns_are_split_evenly():
+    windows = plan_turn_windows([turn(10.0, 80.0, 'A')], max_window_s=30.0)
+    assert [(pytest.approx(start), pytest.approx(end), speaker) for start, end, speaker in windows] == [
+        (10.0, 10.0 + 70 / 3, 'A'), (10.0 + 70 / 3, 10.0 + 140 / 3, 'A'), (10.0 + 140 / 3, 80.0, 'A')]
+    assert all(end - start <= 30.0 for start, end, _ in windows)
+
+
+def test_too_short_turns_are_skipped():
+    assert plan_turn_windows([turn(0.0, 0.1, 'A')]) == []
+    assert plan_turn_windows([]) == []
@@ -7,12 +7,35 @@ Kombiniert beste Textqualität (OpenAI) mit Speaker-Trennung (Pyannote) und Krus
 import os
 import sys
 import argparse
-import yaml
+import re
+import json
 import time
+import hashlib
+import random
+import threading
+import queue
+import signal
+import multiprocessing
+from multiprocessing import shared_memory
+import heapq
+import math
+import bisect
+import tempfile
+import platform
+import subprocess
+import importlib.util
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from openai import OpenAI
-from typing import Optional, Dict, List
+from typing import TYPE_CHECKING, Optional, Dict, List
+
+# Schwere Abhängigkeiten (openai, torch, whisper, pyannote, auch yaml) werden erst auf dem Pfad
+# importiert, der sie braucht - --help, render und Argumentfehler starten ohne sie
+# (Kontrolle: benchmarks/bench_startup.py)
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 # Farben
 class Colors:
@@ -25,11 +48,288 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+# Pro Thread optionaler Puffer, damit parallele Jobs ihre Ausgabe nicht vermischen
+_log_buffer = threading.local()
+
 def print_colored(text: str, color: str):
-    print(f"{color}{text}{Colors.ENDC}")
+    lines = getattr(_log_buffer, 'lines', None)
+    if lines is not None:
+        lines.append(f"{color}{text}{Colors.ENDC}")
+    else:
+        print(f"{color}{text}{Colors.ENDC}")
+
+@contextmanager
+def buffered_output(lines: Optional[List[str]] = None):
+    """Sammelt print_colored-Ausgaben des aktuellen Threads in einer Liste statt sie direkt auszugeben"""
+    previous = getattr(_log_buffer, 'lines', None)
+    _log_buffer.lines = lines if lines is not None else []
+    try:
+        yield _log_buffer.lines
+    finally:
+        _log_buffer.lines = previous
+
+class StageResult:
+    """Ergebnis einer Pipeline-Stufe inkl. gepufferter Ausgabe und Laufzeit"""
+
+    def __init__(self, result=None, lines: Optional[List[str]] = None, error: Optional[Exception] = None,
+                 started: float = 0.0, finished: float = 0.0):
+        self.result = result
+        self.lines = lines or []
+        self.error = error
+        self.started = started
+        self.finished = finished
+
+    @property
+    def elapsed(self) -> float:
+        return self.finished - self.started
+
+    def flush(self):
+        """Gibt die gepufferte Ausgabe aus (bzw. hängt sie an den Puffer des aktuellen Threads)"""
+        target = getattr(_log_buffer, 'lines', None)
+        for line in self.lines:
+            if target is not None:
+                target.append(line)
+            else:
+                print(line)
+        self.lines = []
+
+    def replay(self):
+        """Gibt die gepufferte Ausgabe aus und wirft eine aufgetretene Exception erneut"""
+        self.flush()
+        if self.error:
+            raise self.error
+
+def run_stage(func, *args, buffered: bool = True, **kwargs) -> StageResult:
+    """Führt eine Stufe (optional mit gepufferter Ausgabe) aus und misst ihre Laufzeit"""
+    started = time.time()
+    with buffered_output() if buffered else nullcontext([]) as lines:
+        try:
+            result, error = func(*args, **kwargs), None
+        except Exception as e:
+            result, error = None, e
+    return StageResult(result, lines, error, started, time.time())
+
+class StagedExecutor:
+    """Führt ASR und Diarization in getrennten Thread-Pools aus, damit sich die Stufen überlappen:
+    beide Stufen einer Datei laufen gleichzeitig, und die ASR von Datei N+1 startet,
+    während Datei N noch diarisiert wird.
+    Mit diarization_first läuft die Diarization zuerst und ihr Ergebnis geht an die ASR (sequentiell).
+    Höchstens window Dateien (Poolgröße + 1) laufen der gerade abgeholten voraus, damit die ASR der
+    Diarization nicht beliebig weit vorausläuft und dekodierte Puffer sich nicht ansammeln"""
+
+    def __init__(self, transcribe, diarize, asr_workers: int = 1, overlap: bool = True,
+                 diarization_first: bool = False):
+        self.transcribe = transcribe
+        self.diarize = diarize
+        self.diarization_first = diarization_first
+        self.jobs = {}
+        self.pending = []
+        if diarization_first:
+            overlap, asr_workers = False, 1
+        self.window = asr_workers + 1
+        self.asr_pool = ThreadPoolExecutor(max_workers=asr_workers) if overlap or asr_workers > 1 else None
+        self.diarization_pool = ThreadPoolExecutor(max_workers=1) if overlap else None
+
+    @property
+    def is_parallel(self) -> bool:
+        return self.asr_pool is not None
+
+    def submit(self, audio_file: Path):
+        """Plant beide Stufen einer Datei ein (gestartet wird, sobald das Fenster Platz hat)"""
+        if not self.is_parallel:
+            return
+        self.pending.append(audio_file)
+        self.fill()
+
+    def fill(self):
+        while self.pending and len(self.jobs) < self.window:
+            self.start(self.pending.pop(0))
+
+    def start(self, audio_file: Path):
+        asr_job = self.asr_pool.submit(run_stage, self.transcribe, audio_file)
+        diarization_job = self.diarization_pool.submit(run_stage, self.diarize, audio_file) \
+            if self.diarization_pool else None
+        self.jobs[audio_file] = (asr_job, diarization_job)
+
+    def result(self, audio_file: Path) -> tuple:
+        """Wartet auf beide Stufen einer Datei und liefert (ASR, Diarization) als StageResult;
+        Diarization ist None, wenn sie wegen fehlgeschlagener ASR übersprungen wurde"""
+        if audio_file in self.pending:
+            # Außer der Reihe abgefragt: sofort starten
+            self.pending.remove(audio_file)
+            self.start(audio_file)
+        asr_job, diarization_job = self.jobs.pop(audio_file, (None, None))
+        # Freier Platz im Fenster: nächste Datei starten, während auf diese gewartet wird
+        self.fill()
+
+        if self.diarization_first:
+            # ASR braucht die Sprecherwechsel; Fehler der Diarization landen im ASR-Ergebnis
+            diar = run_stage(self.diarize, audio_file, buffered=False)
+            if diar.error or not diar.result:
+                return StageResult(error=diar.error, started=diar.started, finished=diar.finished), None
+            return run_stage(self.transcribe, audio_file, diar.result, buffered=False), diar
+
+        if asr_job is not None:
+            asr = asr_job.result()
+        else:
+            asr = run_stage(self.transcribe, audio_file, buffered=False)
+
+        if diarization_job is not None:
+            return asr, diarization_job.result()
+
+        # Sequentiell: Diarization nur, wenn die ASR etwas geliefert hat
+        asr.flush()
+        if asr.error or not asr.result:
+            return asr, None
+        return asr, run_stage(self.diarize, audio_file, buffered=False)
+
+    def shutdown(self):
+        """Bricht noch nicht gestartete Stufen ab (z.B. bei Ctrl-C)"""
+        self.pending.clear()
+        for pool in (self.asr_pool, self.diarization_pool):
+            if pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+class WorkerFarm:
+    """Lokaler Batch-Betrieb mit langlebigen Worker-Prozessen: jeder Worker lädt Whisper und Pyannote
+    einmal, rechnet auf seinem Anteil der Kerne und holt sich Dateien aus einer gemeinsamen Queue.
+    Ergebnisse schreibt jeder Worker selbst, seine Ausgabe kommt pro Datei gepuffert zurück.
+    Erstes Ctrl-C/SIGTERM: keine neuen Dateien mehr, laufende werden fertig; zweites: sofort beenden"""
+
+    def __init__(self, argv: List[str], partitions: List[List[int]], threads: Optional[List[int]] = None):
+        ctx = multiprocessing.get_context('spawn')
+        self.tasks = ctx.Queue()
+        # Nach einem Abbruch bleiben Dateien in der Queue - nicht beim Beenden darauf warten
+        self.tasks.cancel_join_thread()
+        self.results = ctx.Queue()
+        self.stop = ctx.Event()
+        self.processes = [
+            ctx.Process(target=farm_worker,
+                        args=(argv, slot, cores, threads[slot] if threads else 0, self.tasks, self.results, self.stop),
+                        name=f"interviewforge-worker-{slot + 1}")
+            for slot, cores in enumerate(partitions)
+        ]
+        self.pending = {}
+
+    def request_stop(self, signum=None, frame=None):
+        if self.stop.is_set():
+            print_colored("⏹️  Worker werden sofort beendet", Colors.FAIL)
+            for process in self.processes:
+                if process.is_alive():
+                    process.terminate()
+            return
+        self.stop.set()
+        print_colored("\n⏹️  Abbruch angefordert - laufende Dateien werden noch abgeschlossen "
+                      "(erneut abbrechen: sofort beenden)", Colors.WARNING)
+
+    @contextmanager
+    def signal_handlers(self):
+        """Ctrl-C, SIGTERM (GUI-Stopp) und unter Windows CTRL_BREAK leiten zum geordneten Abbruch"""
+        signums = [signal.SIGINT, signal.SIGTERM] + ([signal.SIGBREAK] if hasattr(signal, 'SIGBREAK') else [])
+        previous = {signum: signal.signal(signum, self.request_stop) for signum in signums}
+        try:
+            yield
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+    def run(self, audio_files: List[Path], prepare=None, release=None):
+        """Startet die Worker und liefert Meldungen (Art, Worker, Ausgabe, Datei, Zähler)
+        in der Reihenfolge, in der sie eintreffen.
+        Dateien werden nachgeschoben (höchstens zwei pro Worker in der Queue); prepare(Datei) liefert
+        optional Zusatzdaten für den Worker (z.B. Shared-Memory-Handle), release(Datei) gibt sie wieder frei"""
+        self.pending = {str(audio_file): audio_file for audio_file in audio_files}
+        backlog = list(audio_files)
+        queued = set()
+        depth = 2 * len(self.processes)
+        closed = False
+
+        def feed():
+            nonlocal closed
+            while backlog and len(queued) < depth and not self.stop.is_set():
+                audio_file = backlog.pop(0)
+                self.tasks.put((str(audio_file), prepare(audio_file) if prepare else None))
+                queued.add(audio_file)
+            if not backlog and not closed:
+                for _ in self.processes:
+                    self.tasks.put(None)
+                closed = True
+
+        try:
+            with self.signal_handlers():
+                for process in self.processes:
+                    process.start()
+                feed()
+
+                while True:
+                    try:
+                        kind, slot, lines, name, totals = self.results.get(timeout=1.0)
+                    except queue.Empty:
+                        if not any(process.is_alive() for process in self.processes):
+                            break
+                        continue
+                    audio_file = self.pending.pop(name, None) if name else None
+                    if audio_file in queued:
+                        queued.discard(audio_file)
+                        if release:
+                            release(audio_file)
+                        feed()
+                    yield kind, slot, lines, audio_file, totals
+
+                for process in self.processes:
+                    process.join()
+        finally:
+            # Nicht abgeholte Dateien (Abbruch, ausgefallene Worker)
+            if release:
+                for audio_file in queued:
+                    release(audio_file)
+
+    @property
+    def skipped(self) -> List[Path]:
+        """Dateien, die kein Worker mehr bearbeitet hat (Abbruch oder ausgefallene Worker)"""
+        return list(self.pending.values())
+
+class FarmWorker:
+    """Gegenstück zur WorkerFarm im Worker-Prozess: Dateien aus der Queue holen, Ergebnisse melden"""
+
+    def __init__(self, slot: int, cores: List[int], threads: int, tasks, results, stop):
+        self.slot = slot
+        self.cores = cores
+        self.threads = threads  # Anteil an explizit vorgegebenen --threads (0 = keine Vorgabe)
+        self.tasks = tasks
+        self.results = results
+        self.stop = stop
+
+    def files(self):
+        """Liefert (Datei, Zusatzdaten des Hauptprozesses), bis die Queue leer ist oder abgebrochen wird"""
+        parent = multiprocessing.parent_process()
+        while not self.stop.is_set():
+            if parent is not None and not parent.is_alive():
+                return  # Hauptprozess hart beendet (z.B. GUI unter Windows)
+            try:
+                task = self.tasks.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if task is None:
+                return
+            name, payload = task
+            yield Path(name), payload
+
+    def report(self, kind: str, lines: List[str], audio_file: Optional[Path] = None,
+               totals: Optional[dict] = None):
+        self.results.put((kind, self.slot, lines, str(audio_file) if audio_file else None, totals))
+
+def farm_worker(argv: List[str], slot: int, cores: List[int], threads: int, tasks, results, stop):
+    """Einstiegspunkt eines Worker-Prozesses; Signale behandelt nur der Hauptprozess"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if hasattr(signal, 'SIGBREAK'):
+        signal.signal(signal.SIGBREAK, signal.SIG_IGN)
+    main(argv, worker=FarmWorker(slot, cores, threads, tasks, results, stop))
 
 def load_kruse_config(config_path: Path) -> dict:
     """Lädt Kruse-Konfiguration"""
+    import yaml
+
     with open(config_path, 'r', encoding='utf-8') as f:
         return yaml.safe_load(f)
 
@@ -64,44 +364,989 @@ def format_time_kruse(seconds: float, format_type: str = "MM:SS") -> str:
         secs = int(seconds % 60)
         return f"{hours:02d}:{mins:02d}:{secs:02d}"
 
-def transcribe_with_openai(client: OpenAI, audio_file: Path, language: str = "de", prompt: str = None) -> dict:
+# CPU-Threads und Geräte für die Torch-Stufen (Whisper, Pyannote)
+DEVICES = ['auto', 'cpu', 'cuda']
+PERFORMANCE_DEFAULTS = {
+    'device': 'auto',       # auto, cpu, cuda
+    'threads': 0,           # Intra-op-Threads (0 = alle Kerne des eigenen Anteils)
+    'interop_threads': 1,   # Inter-op-Threads von torch
+    'instances': 1,         # gleichzeitige Instanzen auf diesem Host (Kerne werden aufgeteilt)
+    'pin_cores': False,     # Prozess an die zugeteilten Kerne binden (Linux)
+    'segmentation_batch_size': 0,   # Pyannote-Segmentierung (0 = Host-Profil bzw. Pipeline-Standard)
+    'embedding_batch_size': 0       # Pyannote-Embeddings (0 = Host-Profil bzw. Pipeline-Standard)
+}
+
+# Ergebnis von 'autotune' pro Host (Rechnername, Kerne, Gerät)
+HOST_PROFILE_FILE = Path.home() / ".cache" / "interviewforge" / "host_profile.json"
+PROFILE_KEYS = ['threads', 'segmentation_batch_size', 'embedding_batch_size']
+
+# Von configure_threads gesetzt, beim Laden eines Torch-Modells angewendet
+_torch_threads = {}
+
+def available_cores() -> List[int]:
+    """Kerne, auf denen dieser Prozess laufen darf (unter Linux inkl. Affinität/cgroups)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def plan_core_partitions(cores: List[int], workers: int) -> List[List[int]]:
+    """Teilt Kerne in zusammenhängende, möglichst gleich große Gruppen - eine pro Worker;
+    bei mehr Workern als Kernen teilen sich Worker reihum einen Kern"""
+    workers = max(1, workers)
+    if workers >= len(cores):
+        return [[cores[k % len(cores)]] for k in range(workers)]
+
+    size, extra = divmod(len(cores), workers)
+    partitions = []
+    start = 0
+    for k in range(workers):
+        end = start + size + (1 if k < extra else 0)
+        partitions.append(cores[start:end])
+        start = end
+    return partitions
+
+def plan_worker_threads(threads: int, partitions: List[List[int]]) -> List[int]:
+    """Teilt eine explizite Thread-Zahl wie die Kerne auf die Worker auf (mindestens 1 pro Worker);
+    ohne Vorgabe (0) bleibt es bei 0 - dann nutzt jeder Worker so viele Threads wie Kerne"""
+    if not threads:
+        return [0] * len(partitions)
+    size, extra = divmod(threads, len(partitions))
+    return [max(1, size + (1 if k < extra else 0)) for k in range(len(partitions))]
+
+def _try_lock(handle) -> bool:
+    """Nicht-blockierende exklusive Dateisperre (wird beim Prozessende vom System freigegeben)"""
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+def _unlock(handle):
+    """Gibt eine mit _try_lock gesetzte Sperre frei"""
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    except OSError:
+        pass
+
+@contextmanager
+def _file_lock(path: Path, timeout: Optional[float] = None):
+    """Blockierende exklusive Sperre über eine Lock-Datei, auch zwischen Prozessen
+    (TimeoutError, wenn sie nach timeout Sekunden nicht frei ist)"""
+    deadline = None if timeout is None else time.time() + timeout
+    with open(path, 'a+') as handle:
+        while not _try_lock(handle):
+            if deadline is not None and time.time() >= deadline:
+                raise TimeoutError(f"Sperre {path} nach {timeout:.0f}s nicht frei")
+            time.sleep(0.01)
+        try:
+            yield
+        finally:
+            _unlock(handle)
+
+class CoreCoordinator:
+    """Verteilt die Kerne eines Hosts auf gleichzeitig laufende Instanzen: jede Instanz belegt per
+    Dateisperre einen freien Slot und bekommt dessen Kerne, statt dass alle Instanzen alle Kerne nutzen.
+    Die Aufteilung (Zahl der Instanzen, Kerne pro Slot) liegt in layout.json; solange ein Slot belegt
+    ist, übernehmen neue Instanzen sie, auch wenn sie mit einer anderen Instanzzahl gestartet wurden"""
+
+    LAYOUT_FILE = "layout.json"
+
+    def __init__(self, instances: int, lock_dir: Optional[Path] = None):
+        self.instances = max(1, instances)
+        self.lock_dir = Path(lock_dir) if lock_dir else Path(tempfile.gettempdir()) / "interviewforge_slots"
+        self.partitions = None
+        self.slot = None
+        self.handle = None
+
+    def slot_busy(self, slot: int) -> bool:
+        try:
+            with open(self.lock_dir / f"slot{slot}.lock", 'a+') as handle:
+                if _try_lock(handle):
+                    _unlock(handle)
+                    return False
+                return True
+        except OSError:
+            return False
+
+    def load_layout(self) -> Optional[dict]:
+        try:
+            with open(self.lock_dir / self.LAYOUT_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store_layout(self, layout: dict):
+        tmp_file = self.lock_dir / f".{self.LAYOUT_FILE}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(layout, f)
+        os.replace(tmp_file, self.lock_dir / self.LAYOUT_FILE)
+
+    def claim(self, timeout: float = 10.0) -> int:
+        """Belegt den ersten freien Slot der gültigen Aufteilung; sind alle belegt, wird ein Slot geteilt"""
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        # Aufteilung lesen/festlegen und Slot belegen, ohne dass eine andere Instanz dazwischenkommt
+        # (TimeoutError, wenn die Sperre nicht frei wird - ohne sie könnten zwei Instanzen denselben Slot planen)
+        with _file_lock(self.lock_dir / "layout.lock", timeout):
+            layout = self.load_layout()
+            if not layout or not any(self.slot_busy(slot) for slot in range(len(layout['partitions']))):
+                # Keine laufende Instanz: eigene Aufteilung gilt
+                layout = {'instances': self.instances,
+                          'partitions': plan_core_partitions(available_cores(), self.instances)}
+                self.store_layout(layout)
+            self.instances = layout['instances']
+            self.partitions = layout['partitions']
+
+            for slot in range(self.instances):
+                try:
+                    handle = open(self.lock_dir / f"slot{slot}.lock", 'a+')
+                except OSError:
+                    continue
+                if _try_lock(handle):
+                    self.slot, self.handle = slot, handle
+                    return slot
+                handle.close()
+
+            self.slot = os.getpid() % self.instances
+            return self.slot
+
+    def cores(self) -> List[int]:
+        if self.partitions is None:
+            return plan_core_partitions(available_cores(), self.instances)[self.slot or 0]
+        return self.partitions[self.slot or 0]
+
+    def release(self):
+        """Gibt den Slot frei (sonst erst beim Prozessende)"""
+        if self.handle:
+            _unlock(self.handle)
+            self.handle.close()
+            self.handle = None
+
+def configure_threads(threads: int, interop_threads: int = 1, cores: Optional[List[int]] = None,
+                      pin: bool = False):
+    """Legt Thread-Zahlen für OpenMP/MKL (vor dem Import von torch) und torch fest,
+    optional mit Bindung an die zugeteilten Kerne"""
+    if pin and cores and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cores)
+
+    for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+        os.environ[var] = str(threads)
+
+    _torch_threads.update({'threads': threads, 'interop_threads': interop_threads})
+    if 'torch' in sys.modules:
+        apply_torch_threads()
+
+def apply_torch_threads():
+    """Überträgt die konfigurierten Thread-Zahlen auf torch (nach dem Lazy-Import)"""
+    if not _torch_threads:
+        return
+    import torch
+
+    torch.set_num_threads(_torch_threads['threads'])
+    try:
+        torch.set_num_interop_threads(_torch_threads['interop_threads'])
+    except RuntimeError:
+        pass  # nur vor der ersten parallelen Operation möglich
+
+def resolve_performance(config: dict, overrides: Optional[dict] = None) -> dict:
+    """Performance-Einstellungen: Standardwerte < Abschnitt 'performance:' der Config < CLI (nicht None)"""
+    performance = {**PERFORMANCE_DEFAULTS, **(config.get('performance') or {})}
+    performance.update({key: value for key, value in (overrides or {}).items() if value is not None})
+    return performance
+
+def host_key(device: str) -> str:
+    return f"{platform.node()}/{os.cpu_count()}cpu/{device}"
+
+def load_host_profile(device: str, profile_file: Path = HOST_PROFILE_FILE) -> dict:
+    """Gespeicherte autotune-Werte dieses Hosts für das Gerät (leer, wenn nie kalibriert).
+    'auto' wird erst aufgelöst, wenn für diesen Host überhaupt ein Profil existiert (importiert torch)"""
+    try:
+        with open(profile_file, 'r', encoding='utf-8') as f:
+            profiles = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not any(key.startswith(host_key('')) for key in profiles):
+        return {}
+    return profiles.get(host_key(detect_device(device)), {})
+
+def store_host_profile(device: str, profile: dict, profile_file: Path = HOST_PROFILE_FILE):
+    """Speichert die autotune-Werte dieses Hosts (andere Hosts in derselben Datei bleiben erhalten)"""
+    profiles = {}
+    try:
+        with open(profile_file, 'r', encoding='utf-8') as f:
+            profiles = json.load(f)
+    except (OSError, ValueError):
+        pass
+    profiles[host_key(detect_device(device))] = profile
+
+    profile_file = Path(profile_file)
+    profile_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = profile_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(profiles, f, indent=2)
+    os.replace(tmp_file, profile_file)
+
+def apply_host_profile(performance: dict, profile: dict, max_threads: int) -> List[str]:
+    """Übernimmt Profilwerte für alles, was Config und CLI offen lassen (0); Threads höchstens bis
+    zum eigenen Anteil der Kerne. Liefert die übernommenen Schlüssel"""
+    applied = []
+    for key in PROFILE_KEYS:
+        if not performance.get(key) and profile.get(key):
+            performance[key] = min(profile[key], max_threads) if key == 'threads' else profile[key]
+            applied.append(key)
+    return applied
+
+def resolve_device(device: Optional[str]) -> Optional[str]:
+    """'auto' -> None (das jeweilige Modell wählt selbst), sonst cpu/cuda"""
+    return None if device in (None, 'auto') else device
+
+def modules_available(*names: str) -> bool:
+    """Sind die Module installiert? Prüft nur, ohne sie (und ihre schweren Abhängigkeiten) zu importieren"""
+    for name in names:
+        if name in sys.modules:
+            continue
+        try:
+            if importlib.util.find_spec(name) is None:
+                return False
+        except ImportError:
+            return False  # Elternpaket fehlt (z.B. 'pyannote' bei 'pyannote.audio')
+    return True
+
+def detect_device(device: Optional[str]) -> str:
+    """Tatsächlich genutztes Gerät: 'auto' -> cuda, wenn torch eine GPU sieht, sonst cpu
+    (wie die Modelle selbst wählen; importiert torch nur bei 'auto')"""
+    if resolve_device(device):
+        return device
+    if not modules_available('torch'):
+        return 'cpu'
+    import torch
+
+    return 'cuda' if torch.cuda.is_available() else 'cpu'
+
+# Lokaler Modell-Ordner ('prefetch') und Offline-Betrieb ohne Hub-Anfragen
+WHISPER_SIZES = ['tiny', 'base', 'small', 'medium', 'large', 'large-v2', 'large-v3']
+PYANNOTE_MODEL = "pyannote/speaker-diarization-3.1"
+MODEL_DEFAULTS = {
+    'dir': None,            # Modell-Ordner (None = Standard-Caches von whisper/Hugging Face)
+    'offline': False        # nur aus dem Modell-Ordner laden, keine Netzwerkzugriffe
+}
+# Bewusst neben (nicht in) dem Ergebnis-Cache, dessen LRU-Verdrängung dort nichts löschen darf
+DEFAULT_MODEL_DIR = Path.home() / ".cache" / "interviewforge-models"
+MODEL_MANIFEST = "interviewforge_models.json"
+
+def resolve_models(config: dict, overrides: Optional[dict] = None) -> dict:
+    """Modell-Einstellungen: Standardwerte < Abschnitt 'models:' der Config < CLI (nicht None)"""
+    models = {**MODEL_DEFAULTS, **(config.get('models') or {})}
+    models.update({key: value for key, value in (overrides or {}).items() if value is not None})
+    if models['offline'] and not models['dir']:
+        models['dir'] = str(DEFAULT_MODEL_DIR)
+    return models
+
+def configure_model_dir(model_dir: Optional[Path], offline: bool = False):
+    """Leitet die Hugging-Face- und Pyannote-Caches in den Modell-Ordner um und schaltet offline
+    alle Hub-Anfragen ab (vor dem ersten Import von huggingface_hub/pyannote, die Werte werden dort
+    beim Import gelesen). HF_HOME bleibt unverändert, damit ein per `huggingface-cli login`
+    gespeichertes Token weiterhin gefunden wird - umgeleitet wird nur der Hub-Cache."""
+    if model_dir:
+        hf_dir = Path(model_dir).resolve() / 'huggingface'
+        os.environ['HF_HUB_CACHE'] = str(hf_dir / 'hub')
+        os.environ['HUGGINGFACE_HUB_CACHE'] = str(hf_dir / 'hub')  # ältere huggingface_hub
+        os.environ['PYANNOTE_CACHE'] = str(hf_dir)
+    if offline:
+        os.environ['HF_HUB_OFFLINE'] = '1'
+        os.environ['TRANSFORMERS_OFFLINE'] = '1'
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def model_files(model_dir: Path) -> Dict[str, Path]:
+    """Alle Modelldateien im Ordner (relativer Pfad -> Pfad); Hub-Symlinks zeigen auf Blobs,
+    die selbst mitgezählt werden, Sperrdateien gehören nicht dazu"""
+    files = {}
+    for path in sorted(Path(model_dir).rglob('*')):
+        relative = path.relative_to(model_dir).as_posix()
+        if path.is_symlink() or not path.is_file() or relative == MODEL_MANIFEST:
+            continue
+        if '.locks' in path.parts or path.suffix in ('.lock', '.incomplete'):
+            continue
+        files[relative] = path
+    return files
+
+def load_model_manifest(model_dir: Path) -> Optional[dict]:
+    try:
+        with open(Path(model_dir) / MODEL_MANIFEST, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_model_manifest(model_dir: Path, models: Dict[str, List[str]]) -> dict:
+    """Prüfsummen aller Modelldateien; unveränderte Dateien (Größe, Änderungszeit) werden
+    nicht neu gehasht, bereits geladene Modelle bleiben eingetragen"""
+    previous = load_model_manifest(model_dir) or {}
+    known = previous.get('files', {})
+    merged = {kind: sorted(set(previous.get('models', {}).get(kind, [])) | set(names))
+              for kind, names in {**previous.get('models', {}), **models}.items()}
+
+    files = {}
+    for relative, path in model_files(model_dir).items():
+        stat = path.stat()
+        entry = known.get(relative)
+        if not entry or entry['size'] != stat.st_size or entry.get('mtime_ns') != stat.st_mtime_ns:
+            entry = {'sha256': file_sha256(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        files[relative] = entry
+
+    manifest = {'models': merged, 'files': files, 'updated': datetime.now().isoformat(timespec='seconds')}
+    tmp_file = Path(model_dir) / f".{MODEL_MANIFEST}.{os.getpid()}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_file, Path(model_dir) / MODEL_MANIFEST)
+    return manifest
+
+def check_model_dir(model_dir: Path, required: List[tuple], verify: bool = False) -> List[str]:
+    """Probleme des Modell-Ordners für die benötigten Modelle ((Art, Name), z.B. ('whisper', 'base')):
+    fehlende Modelle, fehlende oder veränderte Dateien. Ohne verify nur Größenvergleich (schnell),
+    mit verify werden alle Prüfsummen neu berechnet"""
+    manifest = load_model_manifest(model_dir)
+    if manifest is None:
+        return [f"{Path(model_dir) / MODEL_MANIFEST} fehlt"]
+
+    problems = [f"{kind} '{name}' nicht vorab geladen" for kind, name in required
+                if name not in manifest['models'].get(kind, [])]
+    for relative, entry in manifest['files'].items():
+        path = Path(model_dir) / relative
+        if not path.is_file():
+            problems.append(f"{relative} fehlt")
+        elif path.stat().st_size != entry['size']:
+            problems.append(f"{relative}: Größe geändert")
+        elif verify and file_sha256(path) != entry['sha256']:
+            problems.append(f"{relative}: Prüfsumme stimmt nicht")
+    return problems
+
+# API-Limit für Uploads
+OPENAI_MAX_UPLOAD_MB = 25
+
+# Default-Prompt für deutsche Street-Interviews
+DEFAULT_PROMPT = "Interview, Straßeninterview, Hamburg, Reeperbahn, Anna, Obdachlosigkeit, Drogenkonsum"
+
+def call_with_retry(func, *args, max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0, **kwargs):
+    """Ruft func auf und wiederholt bei Rate-Limit (429), Serverfehlern (5xx) und Verbindungsabbrüchen
+    mit exponentiellem Backoff"""
+    for attempt in range(max_retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            status = getattr(e, 'status_code', None)
+            retryable = status == 429 or (status is not None and status >= 500) \
+                or type(e).__name__ in ('APIConnectionError', 'APITimeoutError')
+            if not retryable or attempt == max_retries:
+                raise
+
+            # Retry-After des Servers bevorzugen, sonst 1s, 2s, 4s, ... mit Jitter
+            delay = min(max_delay, base_delay * 2 ** attempt) * (0.5 + random.random() / 2)
+            response = getattr(e, 'response', None)
+            if response is not None:
+                try:
+                    delay = min(max_delay, float(response.headers.get('retry-after', delay)))
+                except (TypeError, ValueError):
+                    pass
+
+            print_colored(f"⏳ API-Fehler ({status or type(e).__name__}), neuer Versuch in {delay:.1f}s "
+                          f"({attempt + 1}/{max_retries})", Colors.WARNING)
+            time.sleep(delay)
+
+def request_openai_transcription(client: "OpenAI", audio_file: Path, language: str, prompt: str):
+    """Ein einzelner Upload an die OpenAI Whisper API (mit Retry)"""
+    def request():
+        with open(audio_file, 'rb') as f:
+            return client.audio.transcriptions.create(
+                model="whisper-1",
+                file=f,
+                language=language,
+                prompt=prompt,  # Kontext für bessere Erkennung
+                response_format="verbose_json",
+                timestamp_granularities=["segment"],
+                temperature=0.0  # Deterministische Ausgabe für Konsistenz
+            )
+
+    return call_with_retry(request)
+
+class Segment:
+    """Whisper-Segment im Format der OpenAI API (start, end, text);
+    speaker ist gesetzt, wenn die Segmente aus Sprecher-Fenstern stammen"""
+
+    def __init__(self, seg_dict):
+        self.start = seg_dict['start']
+        self.end = seg_dict['end']
+        self.text = seg_dict['text']
+        self.speaker = seg_dict.get('speaker')
+
+class TranscriptResult:
+    """Transkript im Format der OpenAI API (segments, text)"""
+
+    def __init__(self, segments_list):
+        self.segments = [Segment(s) for s in segments_list]
+        self.text = " ".join([s['text'] for s in segments_list])
+
+def get_audio_duration(audio_file: Path) -> float:
+    """Ermittelt die Audiodauer in Sekunden mit ffprobe"""
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+         '-of', 'default=noprint_wrappers=1:nokey=1', str(audio_file)],
+        capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip())
+
+def detect_silences(audio_file: Path, noise_db: float = -35.0, min_silence_s: float = 0.5) -> List[tuple]:
+    """Findet Stille-Bereiche (start, end) mit dem FFmpeg-Filter silencedetect"""
+    result = subprocess.run(
+        ['ffmpeg', '-hide_banner', '-nostats', '-i', str(audio_file),
+         '-af', f"silencedetect=noise={noise_db}dB:d={min_silence_s}", '-f', 'null', '-'],
+        capture_output=True, text=True
+    )
+
+    silences = []
+    silence_start = None
+    for line in result.stderr.splitlines():
+        match = re.search(r'silence_start: (-?[\d.]+)', line)
+        if match:
+            silence_start = max(0.0, float(match.group(1)))
+            continue
+        match = re.search(r'silence_end: ([\d.]+)', line)
+        if match and silence_start is not None:
+            silences.append((silence_start, float(match.group(1))))
+            silence_start = None
+
+    return silences
+
+def plan_audio_chunks(duration: float, silences: List[tuple], max_chunk_s: float = 600.0,
+                      overlap_s: float = 2.0) -> List[tuple]:
+    """Teilt die Audiodauer in Chunks (start, end) - Schnitt bevorzugt in Stille, sonst mit Überlappung"""
+    overlap_s = min(overlap_s, max_chunk_s / 2)
+    chunks = []
+    start = 0.0
+
+    while start < duration:
+        limit = start + max_chunk_s
+        if limit >= duration:
+            chunks.append((start, duration))
+            break
+
+        # Möglichst späte Stille im hinteren Drittel des Fensters
+        window_start = start + max_chunk_s * 2 / 3
+        candidates = [(s + e) / 2 for s, e in silences if window_start <= (s + e) / 2 < limit]
+
+        if candidates:
+            cut = max(candidates)
+            chunks.append((start, cut))
+            start = cut
+        else:
+            chunks.append((start, limit))
+            start = limit - overlap_s
+
+    return chunks
+
+def stitch_chunk_segments(chunks: List[tuple], chunk_segments: List[List[dict]]) -> List[dict]:
+    """Setzt Chunk-Segmente mit globalen Zeitstempeln zusammen und entfernt doppelten Überlappungstext"""
+    stitched = []
+
+    for k, ((chunk_start, chunk_end), segments) in enumerate(zip(chunks, chunk_segments)):
+        # Überlappung mittig aufteilen: vorheriger Chunk bis zur Mitte, dieser ab der Mitte
+        lower = (chunk_start + chunks[k - 1][1]) / 2 if k > 0 else float('-inf')
+        upper = (chunks[k + 1][0] + chunk_end) / 2 if k + 1 < len(chunks) else float('inf')
+
+        for seg in segments:
+            start = seg['start'] + chunk_start
+            end = seg['end'] + chunk_start
+            text = seg['text'].strip()
+
+            if not (lower <= start < upper):
+                continue
+
+            # Gleicher Satz auf beiden Seiten der Schnittkante
+            if stitched and stitched[-1]['text'].lower() == text.lower() and start - stitched[-1]['end'] < 1.0:
+                continue
+
+            stitched.append({'start': start, 'end': end, 'text': text})
+
+    return stitched
+
+def transcribe_with_openai_chunked(client: "OpenAI", audio_file: Path, language: str = "de", prompt: str = None,
+                                   max_chunk_s: float = 600.0, overlap_s: float = 2.0,
+                                   workers: int = 4) -> Optional[TranscriptResult]:
+    """Transkribiert lange Dateien in parallelen Chunks über die OpenAI Whisper API"""
+    if prompt is None:
+        prompt = DEFAULT_PROMPT
+
+    duration = get_audio_duration(audio_file)
+    silences = detect_silences(audio_file)
+    chunks = plan_audio_chunks(duration, silences, max_chunk_s, overlap_s)
+    print_colored(f"✂️  Teile in {len(chunks)} Chunks ({duration / 60:.1f} min, {len(silences)} Stille-Bereiche)",
+                  Colors.OKCYAN)
+
+    start = time.time()
+
+    with tempfile.TemporaryDirectory(prefix="interviewforge_") as tmp_dir:
+        chunk_files = []
+        for k, (chunk_start, chunk_end) in enumerate(chunks):
+            # FLAC (16 kHz, mono) hält Chunks deutlich unter dem Upload-Limit
+            chunk_file = Path(tmp_dir) / f"{audio_file.stem}_chunk{k:03d}.flac"
+            subprocess.run(
+                ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-y',
+                 '-ss', f"{chunk_start:.3f}", '-t', f"{chunk_end - chunk_start:.3f}",
+                 '-i', str(audio_file), '-ar', '16000', '-ac', '1', str(chunk_file)],
+                check=True
+            )
+            chunk_size_mb = chunk_file.stat().st_size / (1024 * 1024)
+            if chunk_size_mb > OPENAI_MAX_UPLOAD_MB:
+                print_colored(f"❌ Chunk zu groß: {chunk_size_mb:.1f} MB - kleinere --chunk-minutes wählen",
+                              Colors.FAIL)
+                return None
+            chunk_files.append(chunk_file)
+
+        # Ausgabe der Chunk-Threads landet im selben Puffer wie die der Datei
+        log_lines = getattr(_log_buffer, 'lines', None)
+
+        def transcribe_chunk(chunk_file: Path) -> List[dict]:
+            with buffered_output(log_lines) if log_lines is not None else nullcontext():
+                transcript = request_openai_transcription(client, chunk_file, language, prompt)
+            return [{'start': seg.start, 'end': seg.end, 'text': seg.text} for seg in transcript.segments or []]
+
+        # Wall-Time ist durch den langsamsten Chunk begrenzt
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            chunk_segments = list(executor.map(transcribe_chunk, chunk_files))
+
+    segments = stitch_chunk_segments(chunks, chunk_segments)
+
+    elapsed = time.time() - start
+    print_colored(f"⏱️  OpenAI API ({len(chunks)} Chunks): {elapsed:.1f}s", Colors.OKGREEN)
+
+    return TranscriptResult(segments)
+
+def transcribe_with_openai(client: "OpenAI", audio_file: Path, language: str = "de", prompt: str = None,
+                           max_chunk_s: float = 600.0, overlap_s: float = 2.0, workers: int = 4) -> dict:
     """Transkribiert mit OpenAI Whisper API"""
     print_colored(f"📤 OpenAI Whisper API: {audio_file.name}", Colors.OKCYAN)
 
     file_size_mb = audio_file.stat().st_size / (1024 * 1024)
 
-    if file_size_mb > 25:
-        print_colored(f"❌ Datei zu groß: {file_size_mb:.1f} MB (Limit: 25 MB)", Colors.FAIL)
-        return None
+    if file_size_mb > OPENAI_MAX_UPLOAD_MB:
+        print_colored(f"⚠️  Datei zu groß für einen Upload: {file_size_mb:.1f} MB (Limit: {OPENAI_MAX_UPLOAD_MB} MB)",
+                      Colors.WARNING)
+        return transcribe_with_openai_chunked(client, audio_file, language, prompt,
+                                              max_chunk_s, overlap_s, workers)
 
     start = time.time()
 
-    # Default-Prompt für deutsche Street-Interviews
     if prompt is None:
-        prompt = "Interview, Straßeninterview, Hamburg, Reeperbahn, Anna, Obdachlosigkeit, Drogenkonsum"
+        prompt = DEFAULT_PROMPT
 
-    with open(audio_file, 'rb') as f:
-        transcript = client.audio.transcriptions.create(
-            model="whisper-1",
-            file=f,
-            language=language,
-            prompt=prompt,  # Kontext für bessere Erkennung
-            response_format="verbose_json",
-            timestamp_granularities=["segment"],
-            temperature=0.0  # Deterministische Ausgabe für Konsistenz
-        )
+    transcript = request_openai_transcription(client, audio_file, language, prompt)
 
     elapsed = time.time() - start
     print_colored(f"⏱️  OpenAI API: {elapsed:.1f}s", Colors.OKGREEN)
 
     return transcript
 
-def transcribe_with_local_whisper(audio_file: Path, language: str = "de", model_size: str = "base") -> dict:
-    """Transkribiert mit lokalem Whisper-Modell (Datenschutz-freundlich)"""
+# Filterkette der Pipeline-Skripte (Audio-Optimierung)
+SAMPLE_RATE = 16000
+DEFAULT_FILTER_CHAIN = "highpass=f=200,lowpass=f=3000,loudnorm=I=-16"
+
+def decode_audio(audio_file: Path, filter_chain: Optional[str] = DEFAULT_FILTER_CHAIN,
+                 sample_rate: int = SAMPLE_RATE):
+    """Dekodiert eine Datei einmal in einen 16 kHz Mono float32-Puffer (inkl. Filterkette),
+    ohne Umweg über eine _optimized.wav auf der Platte"""
+    import numpy as np
+
+    cmd = ['ffmpeg', '-nostdin', '-hide_banner', '-loglevel', 'error', '-i', str(audio_file),
+           '-ac', '1', '-ar', str(sample_rate)]
+    if filter_chain:
+        cmd += ['-af', filter_chain]
+    cmd += ['-f', 'f32le', '-']
+
+    result = subprocess.run(cmd, capture_output=True, check=True)
+    # bytes sind unveränderlich, die Sicht darauf wäre schreibgeschützt (whisper/torch schreiben ggf. hinein)
+    return np.frombuffer(bytearray(result.stdout), dtype=np.float32)
+
+# Zweistufige Lautheitsnormalisierung: Messung (1. Durchgang) wird pro Datei-Hash zwischengespeichert
+LOUDNORM_MODES = ['dynamic', 'two-pass']
+LOUDNESS_CACHE_DIR = ".interviewforge_loudnorm"
+
+def split_loudnorm(filter_chain: str):
+    """Teilt eine Filterkette in (davor, loudnorm-Optionen, danach); ohne loudnorm: (Kette, None, [])"""
+    filters = [f.strip() for f in filter_chain.split(',') if f.strip()]
+    for i, f in enumerate(filters):
+        name, _, options = f.partition('=')
+        if name == 'loudnorm':
+            return filters[:i], options, filters[i + 1:]
+    return filters, None, []
+
+def measure_loudness(audio_file: Path, filter_chain: str) -> Optional[dict]:
+    """Erster loudnorm-Durchgang: misst Lautheit nach den vorgelagerten Filtern (ohne Ausgabe)"""
+    before, options, _ = split_loudnorm(filter_chain)
+    if options is None:
+        return None
+
+    measure_filter = f"loudnorm={options + ':' if options else ''}print_format=json"
+    result = subprocess.run(
+        ['ffmpeg', '-nostdin', '-hide_banner', '-nostats', '-loglevel', 'info', '-i', str(audio_file),
+         '-ac', '1', '-ar', str(SAMPLE_RATE), '-af', ','.join(before + [measure_filter]),
+         '-threads', '1', '-f', 'null', '-'],
+        capture_output=True, text=True, check=True
+    )
+
+    # loudnorm schreibt den JSON-Block ans Ende von stderr
+    start, end = result.stderr.rfind('{'), result.stderr.rfind('}')
+    if start < 0 or end < start:
+        raise RuntimeError(f"Keine loudnorm-Messung in der FFmpeg-Ausgabe: {audio_file.name}")
+    stats = json.loads(result.stderr[start:end + 1])
+    return {key: stats[key] for key in ('input_i', 'input_tp', 'input_lra', 'input_thresh', 'target_offset')}
+
+def two_pass_filter_chain(filter_chain: str, measured: Optional[dict]) -> str:
+    """Zweiter Durchgang: loudnorm mit gemessenen Werten im linearen Modus (kein 192-kHz-Resampling)"""
+    before, options, after = split_loudnorm(filter_chain)
+    if options is None or not measured:
+        return filter_chain
+
+    values = [measured['input_i'], measured['input_tp'], measured['input_lra'],
+              measured['input_thresh'], measured['target_offset']]
     try:
+        finite = all(abs(float(v)) != float('inf') for v in values)
+    except ValueError:
+        finite = False
+    if not finite:
+        # Stille Dateien lassen sich nicht linear normalisieren
+        return filter_chain
+
+    loudnorm = (f"loudnorm={options + ':' if options else ''}"
+                f"measured_I={values[0]}:measured_TP={values[1]}:measured_LRA={values[2]}:"
+                f"measured_thresh={values[3]}:offset={values[4]}:linear=true:print_format=none")
+    return ','.join(before + [loudnorm] + after)
+
+class LoudnessCache:
+    """Sidecar-Cache für loudnorm-Messungen: eine JSON-Datei pro Audio-Hash,
+    darin eine Messung pro Filterkette (Neukodierungen und Wiederholungen sparen den 1. Durchgang)"""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.lock = threading.Lock()
+
+    def path_for(self, audio_file: Path) -> Path:
+        return self.cache_dir / f"{hash_audio_file(audio_file)}.json"
+
+    def load(self, audio_file: Path, filter_chain: str) -> Optional[dict]:
+        try:
+            with open(self.path_for(audio_file), 'r', encoding='utf-8') as f:
+                return json.load(f).get(filter_chain)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, audio_file: Path, filter_chain: str, measured: dict):
+        cache_file = self.path_for(audio_file)
+        with self.lock:
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                entries = {}
+            entries[filter_chain] = measured
+
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, cache_file)
+
+    def resolve(self, audio_file: Path, filter_chain: str):
+        """Filterkette für den zweiten Durchgang; misst nur, wenn keine Messung vorliegt.
+        Liefert (Filterkette, 'cached' | 'measured' | None)"""
+        if split_loudnorm(filter_chain)[1] is None:
+            return filter_chain, None
+
+        measured = self.load(audio_file, filter_chain)
+        status = 'cached'
+        if measured is None:
+            measured = measure_loudness(audio_file, filter_chain)
+            self.store(audio_file, filter_chain, measured)
+            status = 'measured'
+        return two_pass_filter_chain(filter_chain, measured), status
+
+class SharedAudioBuffer:
+    """Dekodiertes Audio (float32, 16 kHz Mono) in multiprocessing.shared_memory: ein Prozess legt den
+    Block einmal an, andere Prozesse hängen sich per Name an und lesen ohne Kopie.
+    Jeder Prozess zählt seine Referenzen selbst; bei null wird der Block geschlossen und vom Besitzer entfernt"""
+
+    def __init__(self, shm, length: int, owner: bool):
+        self.shm = shm
+        self.length = length
+        self.owner = owner
+        self.refs = 1
+        self.lock = threading.Lock()
+
+    @classmethod
+    def create(cls, audio) -> 'SharedAudioBuffer':
+        """Kopiert einen Puffer einmal in einen neuen Shared-Memory-Block"""
+        import numpy as np
+
+        shm = shared_memory.SharedMemory(create=True, size=max(1, audio.nbytes))
+        buffer = cls(shm, len(audio), owner=True)
+        np.copyto(buffer.array, audio, casting='no')
+        return buffer
+
+    @classmethod
+    def attach(cls, handle: tuple) -> 'SharedAudioBuffer':
+        """Hängt sich an einen bestehenden Block an (handle von .handle)"""
+        name, length = handle
+        # Nur der Besitzer entfernt den Block: der resource_tracker des anhängenden Prozesses darf ihn
+        # beim Prozessende nicht mit entfernen (und auch nicht als Leck melden)
+        if sys.version_info >= (3, 13):
+            return cls(shared_memory.SharedMemory(name=name, track=False), length, owner=False)
+        shm = shared_memory.SharedMemory(name=name)
+        if os.name != 'nt':
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        return cls(shm, length, owner=False)
+
+    @property
+    def handle(self) -> tuple:
+        """Picklebare Referenz (Name, Samples) für andere Prozesse"""
+        return self.shm.name, self.length
+
+    @property
+    def array(self):
+        """numpy-Sicht auf den Block (keine Kopie)"""
+        import numpy as np
+
+        return np.ndarray((self.length,), dtype=np.float32, buffer=self.shm.buf)
+
+    def acquire(self) -> 'SharedAudioBuffer':
+        with self.lock:
+            self.refs += 1
+        return self
+
+    def release(self):
+        with self.lock:
+            self.refs -= 1
+            if self.refs > 0:
+                return
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # Noch lebende Sichten - die Abbildung verschwindet mit der letzten
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+class PreprocessedAudioStore:
+    """Hält vorverarbeitete Audio-Puffer im Speicher, damit Whisper und Pyannote dasselbe Array nutzen;
+    dekodiert die nächsten Dateien parallel im Voraus"""
+
+    def __init__(self, audio_files: List[Path], filter_chain: Optional[str] = DEFAULT_FILTER_CHAIN,
+                 workers: int = 2, loudness: Optional[LoudnessCache] = None):
+        self.audio_files = list(audio_files)
+        self.filter_chain = filter_chain
+        self.loudness = loudness
+        self.lookahead = max(0, workers - 1)
+        self.pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def plan(self, audio_files: List[Path]):
+        """Legt die Reihenfolge für die Vorausdekodierung fest - nur Dateien, die noch Audio brauchen"""
+        with self.lock:
+            self.audio_files = list(audio_files)
+
+    def prefetch(self, audio_file: Path):
+        with self.lock:
+            if audio_file not in self.jobs:
+                self.jobs[audio_file] = self.pool.submit(self.decode, audio_file)
+            return self.jobs[audio_file]
+
+    def decode(self, audio_file: Path):
+        filter_chain = self.filter_chain
+        if filter_chain and self.loudness:
+            filter_chain, _ = self.loudness.resolve(audio_file, filter_chain)
+        return decode_audio(audio_file, filter_chain)
+
+    def get(self, audio_file: Path):
+        """Puffer einer Datei (dekodiert beim ersten Zugriff) und Vorausdekodierung der folgenden"""
+        job = self.prefetch(audio_file)
+        if audio_file in self.audio_files:
+            index = self.audio_files.index(audio_file)
+            for next_file in self.audio_files[index + 1:index + 1 + self.lookahead]:
+                self.prefetch(next_file)
+
+        start = time.time()
+        audio = job.result()
+        waited = time.time() - start
+        if waited >= 0.1:
+            print_colored(f"🎚️  Vorverarbeitung: {len(audio) / SAMPLE_RATE:.0f}s Audio "
+                          f"(gewartet {waited:.1f}s)", Colors.OKCYAN)
+        return audio
+
+    def adopt(self, audio_file: Path, audio):
+        """Übernimmt einen anderswo dekodierten Puffer (z.B. Shared Memory des Hauptprozesses)"""
+        job = Future()
+        job.set_result(audio)
+        with self.lock:
+            self.jobs[audio_file] = job
+
+    def discard(self, audio_file: Path):
+        """Gibt den Puffer frei, sobald beide Stufen die Datei verarbeitet haben"""
+        with self.lock:
+            self.jobs.pop(audio_file, None)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+# VAD-Vorschnitt: nur Sprachbereiche gehen an Whisper und Pyannote
+class SpeechMap:
+    """Sprachbereiche einer Datei und Zeitversatz-Tabelle zwischen geschnittenem Audio und Original"""
+
+    def __init__(self, regions: List[tuple], duration: float):
+        self.regions = [(float(start), float(end)) for start, end in regions]
+        self.duration = float(duration)
+        # Beginn jedes Bereichs auf der geschnittenen Zeitachse
+        self.offsets = []
+        position = 0.0
+        for start, end in self.regions:
+            self.offsets.append(position)
+            position += end - start
+        self.speech_duration = position
+
+    @property
+    def skipped_fraction(self) -> float:
+        if self.duration <= 0:
+            return 0.0
+        return max(0.0, 1.0 - self.speech_duration / self.duration)
+
+    def to_original(self, t: float, is_end: bool = False) -> float:
+        """Zeitpunkt im geschnittenen Audio -> Zeitpunkt im Original
+        (Endzeiten an einer Schnittkante gehören zum vorherigen Bereich)"""
+        if not self.regions:
+            return t
+        if is_end:
+            k = bisect.bisect_left(self.offsets, t) - 1
+        else:
+            k = bisect.bisect_right(self.offsets, t) - 1
+        k = min(max(k, 0), len(self.regions) - 1)
+        start, end = self.regions[k]
+        return min(max(start + t - self.offsets[k], start), end)
+
+    def map_segments(self, segments: List[dict]) -> List[dict]:
+        """Segmente (start, end, ...) zurück auf die Originalzeitachse, damit Pausen echt bleiben"""
+        return [{**seg, 'start': self.to_original(seg['start']),
+                 'end': self.to_original(seg['end'], is_end=True)} for seg in segments]
+
+    def trim_buffer(self, audio, sample_rate: int = SAMPLE_RATE):
+        """Schneidet einen Puffer auf die Sprachbereiche zusammen"""
+        import numpy as np
+
+        if not self.regions:
+            return audio[:0]
+        return np.concatenate([audio[int(start * sample_rate):int(end * sample_rate)]
+                               for start, end in self.regions])
+
+    def to_dict(self) -> dict:
+        return {'regions': self.regions, 'duration': self.duration}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SpeechMap':
+        return cls(data['regions'], data['duration'])
+
+def detect_speech_regions(audio_file: Path, noise_db: float = -35.0, min_silence_s: float = 2.0,
+                          padding_s: float = 0.3) -> SpeechMap:
+    """Sprachbereiche = alles außer längerer Stille (silencedetect), mit Rand an jeder Schnittkante"""
+    duration = get_audio_duration(audio_file)
+    regions = []
+    position = 0.0
+    for silence_start, silence_end in detect_silences(audio_file, noise_db, min_silence_s):
+        # Am Dateianfang/-ende braucht es keinen Rand
+        cut_start = max(position, silence_start + padding_s if silence_start > 0 else 0.0)
+        cut_end = min(duration, silence_end - padding_s if silence_end < duration else duration)
+        if cut_end <= cut_start:
+            continue
+        if cut_start > position:
+            regions.append((position, cut_start))
+        position = cut_end
+    if position < duration:
+        regions.append((position, duration))
+    return SpeechMap(regions, duration)
+
+def write_speech_audio(audio, output_file: Path, sample_rate: int = SAMPLE_RATE):
+    """Schreibt einen (geschnittenen) Puffer als FLAC, z.B. für den API-Upload"""
+    subprocess.run(
+        ['ffmpeg', '-nostdin', '-hide_banner', '-loglevel', 'error', '-y',
+         '-f', 'f32le', '-ar', str(sample_rate), '-ac', '1', '-i', '-', str(output_file)],
+        input=audio.tobytes(), capture_output=True, check=True
+    )
+
+class WhisperModelSession:
+    """Hält ein lokales Whisper-Modell für einen ganzen Batch im Speicher (einmal laden, oft nutzen)"""
+
+    def __init__(self, model_size: str = "base", device: Optional[str] = None,
+                 download_root: Optional[Path] = None):
+        self.model_size = model_size
+        self.device = device
+        self.download_root = download_root
+        self.model = None
+        self.load_time = 0.0
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.model is not None
+
+    def load(self):
+        """Lädt Modell und Device-Zuordnung beim ersten Aufruf, danach aus dem Speicher"""
+        if self.model is not None:
+            return self.model
+
         import whisper
         import torch
-    except ImportError:
+
+        apply_torch_threads()
+
+        # GPU-Check
+        if self.device is None:
+            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        if self.device == "cuda":
+            print_colored(f"🚀 GPU aktiviert: {torch.cuda.get_device_name(0)}", Colors.OKGREEN)
+        else:
+            print_colored("⚠️  CPU-Modus (langsamer, aber funktioniert)", Colors.WARNING)
+
+        start = time.time()
+
+        # Lade Modell (wird automatisch gecacht in ~/.cache/whisper/ bzw. im Modell-Ordner)
+        print_colored(f"📥 Lade Whisper-Modell '{self.model_size}'...", Colors.OKCYAN)
+        self.model = whisper.load_model(self.model_size, device=self.device,
+                                        download_root=str(self.download_root) if self.download_root else None)
+
+        self.load_time = time.time() - start
+        print_colored(f"⏱️  Modell geladen: {self.load_time:.1f}s", Colors.OKGREEN)
+
+        return self.model
+
+def transcribe_with_local_whisper(audio_file: Path, language: str = "de", model_size: str = "base",
+                                  session: Optional[WhisperModelSession] = None, audio=None) -> dict:
+    """Transkribiert mit lokalem Whisper-Modell (Datenschutz-freundlich)"""
+    if not modules_available('whisper', 'torch'):
         print_colored("❌ openai-whisper nicht installiert!", Colors.FAIL)
         print_colored("   Installiere mit: pip install -U openai-whisper", Colors.WARNING)
         print_colored("   Oder für GPU-Support: pip install -U openai-whisper torch", Colors.WARNING)
@@ -109,23 +1354,21 @@ def transcribe_with_local_whisper(audio_file: Path, language: str = "de", model_
 
     print_colored(f"💻 Lokales Whisper ({model_size}): {audio_file.name}", Colors.OKCYAN)
 
-    # GPU-Check
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    if device == "cuda":
-        print_colored(f"🚀 GPU aktiviert: {torch.cuda.get_device_name(0)}", Colors.OKGREEN)
-    else:
-        print_colored("⚠️  CPU-Modus (langsamer, aber funktioniert)", Colors.WARNING)
+    # Ohne Session: Modell nur für diese Datei laden
+    if session is None:
+        session = WhisperModelSession(model_size)
 
-    start = time.time()
+    # Ladezeit nur zählen, wenn das Modell für diese Datei wirklich geladen wurde
+    was_loaded = session.is_loaded
+    model = session.load()
+    load_time = 0.0 if was_loaded else session.load_time
 
-    # Lade Modell (wird automatisch gecacht in ~/.cache/whisper/)
-    print_colored(f"📥 Lade Whisper-Modell '{model_size}'...", Colors.OKCYAN)
-    model = whisper.load_model(model_size, device=device)
+    start = time.time()
 
     # Transkribiere
     print_colored(f"🎤 Transkribiere...", Colors.OKCYAN)
     result = model.transcribe(
-        str(audio_file),
+        audio if audio is not None else str(audio_file),  # Vorverarbeiteter Puffer oder Datei
         language=language,
         task="transcribe",
         verbose=False,
@@ -134,130 +1377,1069 @@ def transcribe_with_local_whisper(audio_file: Path, language: str = "de", model_
     )
 
     elapsed = time.time() - start
-    print_colored(f"⏱️  Lokales Whisper: {elapsed:.1f}s", Colors.OKGREEN)
+    print_colored(f"⏱️  Lokales Whisper: Laden {load_time:.1f}s, Inferenz {elapsed:.1f}s", Colors.OKGREEN)
 
     # Konvertiere zu API-ähnlichem Format
-    class Segment:
-        def __init__(self, seg_dict):
-            self.start = seg_dict['start']
-            self.end = seg_dict['end']
-            self.text = seg_dict['text']
+    return TranscriptResult(result['segments'])
 
-    class TranscriptResult:
-        def __init__(self, segments_list):
-            self.segments = [Segment(s) for s in segments_list]
-            self.text = " ".join([s['text'] for s in segments_list])
+# Gebündelte Whisper-Dekodierung: mehrere 30-s-Mel-Fenster pro Forward-Pass
+WHISPER_WINDOW_S = 30.0
+
+def split_audio_windows(audio, window_s: float = WHISPER_WINDOW_S, search_s: float = 5.0,
+                        sample_rate: int = SAMPLE_RATE) -> List[tuple]:
+    """Teilt einen Puffer in Fenster (start, end) von höchstens window_s Sekunden;
+    geschnitten wird an der leisesten Stelle der letzten search_s Sekunden jedes Fensters"""
+    import numpy as np
+
+    total = len(audio) / sample_rate
+    frame = int(0.1 * sample_rate)
+    windows = []
+    start = 0.0
+    while total - start > window_s:
+        limit = start + window_s
+        search = audio[int((limit - search_s) * sample_rate):int(limit * sample_rate)]
+        frames = len(search) // frame
+        if frames:
+            energy = np.square(search[:frames * frame].reshape(frames, frame)).mean(axis=1)
+            cut = limit - search_s + (int(np.argmin(energy)) + 0.5) * frame / sample_rate
+        else:
+            cut = limit
+        windows.append((start, cut))
+        start = cut
+    if total > start:
+        windows.append((start, total))
+    return windows
+
+def parse_timestamped_tokens(tokenizer, tokens: List[int], window_s: float) -> List[dict]:
+    """Zerlegt die Tokens eines Fensters an den Zeitstempel-Tokens in Segmente (Sekunden relativ zum Fenster)"""
+    segments = []
+    timestamp_begin = tokenizer.timestamp_begin
+    seg_start = None
+    text_tokens = []
+    for token in tokens:
+        if token < timestamp_begin:
+            text_tokens.append(token)
+            continue
+        t = (token - timestamp_begin) * 0.02  # Zeitstempel-Auflösung von Whisper
+        if seg_start is not None and text_tokens:
+            segments.append({'start': seg_start, 'end': t, 'text': tokenizer.decode(text_tokens)})
+            text_tokens = []
+            seg_start = None
+        else:
+            seg_start = t
+    if text_tokens:
+        segments.append({'start': seg_start or 0.0, 'end': window_s, 'text': tokenizer.decode(text_tokens)})
+    return segments
+
+def decode_audio_windows(model, clips: list, language: str = "de", batch_size: int = 8) -> List[List[dict]]:
+    """Dekodiert Clips (je höchstens 30 s) gebündelt: Mel-Spektrogramme werden auf 30 s aufgefüllt,
+    gestapelt und in einem Forward-Pass dekodiert. Fenster mit auffälligem Ergebnis
+    (Wiederholungen, niedrige Wahrscheinlichkeit) laufen einzeln über model.transcribe mit Temperatur-Fallback"""
+    import whisper
+    import torch
+
+    tokenizer = whisper.tokenizer.get_tokenizer(
+        model.is_multilingual, num_languages=model.num_languages,
+        language=language, task="transcribe"
+    )
+    options = whisper.DecodingOptions(language=language, task="transcribe", temperature=0.0,
+                                      without_timestamps=False, fp16=model.device.type == 'cuda')
+
+    results = []
+    for k in range(0, len(clips), max(1, batch_size)):
+        batch = clips[k:k + max(1, batch_size)]
+        mel = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(torch.from_numpy(clip)), model.dims.n_mels)
+            for clip in batch
+        ]).to(model.device)
+        with torch.no_grad():
+            decoded = whisper.decode(model, mel, options)
+
+        for clip, result in zip(batch, decoded):
+            window_s = len(clip) / SAMPLE_RATE
+            if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0:
+                results.append([])
+            elif result.compression_ratio > 2.4 or result.avg_logprob < -1.0:
+                fallback = model.transcribe(clip, language=language, task="transcribe", verbose=None,
+                                            condition_on_previous_text=False, word_timestamps=False)
+                results.append([{'start': seg['start'], 'end': seg['end'], 'text': seg['text']}
+                                for seg in fallback['segments']])
+            else:
+                results.append(parse_timestamped_tokens(tokenizer, result.tokens, window_s))
+    return results
 
-    return TranscriptResult(result['segments'])
+def offset_window_segments(window_segments: List[dict], window_start: float, window_end: float,
+                           speaker: Optional[str] = None) -> List[dict]:
+    """Verschiebt Fenster-Segmente auf die Zeitachse der Datei (leere Texte entfallen)"""
+    segments = []
+    for seg in window_segments:
+        text = seg['text'].strip()
+        if not text:
+            continue
+        segments.append({
+            'start': window_start + seg['start'],
+            'end': min(window_end, window_start + seg['end']),
+            'text': text
+        })
+        if speaker is not None:
+            segments[-1]['speaker'] = speaker
+    return segments
 
-def diarize_with_pyannote(audio_file: Path, num_speakers: Optional[int] = None) -> dict:
-    """Speaker Diarization mit pyannote.audio"""
-    try:
-        from pyannote.audio import Pipeline
-        import torch
-    except ImportError:
-        print_colored("❌ pyannote.audio nicht installiert!", Colors.FAIL)
-        print_colored("   Installiere mit: ./venv/bin/pip install pyannote.audio", Colors.WARNING)
-        return None
+def transcribe_windows_batched(model, audio, windows: List[tuple], language: str = "de",
+                               batch_size: int = 8) -> List[dict]:
+    """Transkribiert Fenster (start, end[, speaker]) eines Puffers gebündelt"""
+    import numpy as np
 
-    print_colored(f"🎙️ Pyannote Diarization...", Colors.OKCYAN)
+    clips = [np.ascontiguousarray(audio[int(w[0] * SAMPLE_RATE):int(w[1] * SAMPLE_RATE)]) for w in windows]
+    segments = []
+    for window, window_segments in zip(windows, decode_audio_windows(model, clips, language, batch_size)):
+        segments.extend(offset_window_segments(window_segments, window[0], window[1],
+                                               window[2] if len(window) > 2 else None))
+    return segments
+
+class BatchedWhisper:
+    """Bündelt die Mel-Fenster mehrerer kurzer Dateien: beim ersten Zugriff auf eine Datei werden
+    auch die folgenden offenen Dateien geladen, bis batch_size Fenster zusammenkommen"""
+
+    def __init__(self, session: 'WhisperModelSession', audio_files: List[Path], load_audio,
+                 language: str = "de", batch_size: int = 8, needs_asr=None):
+        self.session = session
+        self.audio_files = list(audio_files)
+        self.load_audio = load_audio
+        self.language = language
+        self.batch_size = max(1, batch_size)
+        self.needs_asr = needs_asr or (lambda audio_file: True)
+        self.results = {}
+        self.loaded = {}  # Puffer, die nicht mehr in den letzten Batch passten
+        self.lock = threading.Lock()
+
+    def transcribe(self, audio_file: Path) -> TranscriptResult:
+        with self.lock:
+            if audio_file not in self.results:
+                self.run_batch(audio_file)
+            return TranscriptResult(self.results.pop(audio_file))
+
+    def run_batch(self, audio_file: Path):
+        import numpy as np
+
+        # Fenster der angefragten Datei, dann der folgenden offenen Dateien (ganze Dateien)
+        batch_files = []
+        windows = []
+        buffers = {}
+        candidates = [audio_file]
+        if audio_file in self.audio_files:
+            index = self.audio_files.index(audio_file)
+            candidates += [f for f in self.audio_files[index + 1:] if f not in self.results]
+
+        for candidate in candidates:
+            if candidate != audio_file and not self.needs_asr(candidate):
+                continue
+            audio = self.loaded.pop(candidate) if candidate in self.loaded else self.load_audio(candidate)
+            file_windows = split_audio_windows(audio)
+            if batch_files and len(windows) + len(file_windows) > self.batch_size:
+                self.loaded[candidate] = audio
+                break
+            batch_files.append(candidate)
+            buffers[candidate] = audio
+            windows.extend((candidate, start, end) for start, end in file_windows)
+
+        print_colored(f"💻 Lokales Whisper ({self.session.model_size}, gebündelt): {len(batch_files)} Datei(en), "
+                      f"{len(windows)} Fenster", Colors.OKCYAN)
+        was_loaded = self.session.is_loaded
+        model = self.session.load()
+        load_time = 0.0 if was_loaded else self.session.load_time
+
+        start = time.time()
+        clips = [np.ascontiguousarray(buffers[f][int(a * SAMPLE_RATE):int(b * SAMPLE_RATE)]) for f, a, b in windows]
+        decoded = decode_audio_windows(model, clips, self.language, self.batch_size)
+        elapsed = time.time() - start
+
+        for batch_file in batch_files:
+            self.results[batch_file] = []
+        for (batch_file, window_start, window_end), window_segments in zip(windows, decoded):
+            self.results[batch_file].extend(offset_window_segments(window_segments, window_start, window_end))
+
+        audio_s = sum(len(a) for a in buffers.values()) / SAMPLE_RATE
+        print_colored(f"⏱️  Lokales Whisper: Laden {load_time:.1f}s, Inferenz {elapsed:.1f}s "
+                      f"für {audio_s:.0f}s Audio (RTF {elapsed / audio_s if audio_s else 0:.3f})", Colors.OKGREEN)
+
+def plan_turn_windows(turns: List[dict], max_window_s: float = 30.0, max_gap_s: float = 1.0,
+                      min_window_s: float = 0.2) -> List[tuple]:
+    """Fasst Sprecherwechsel zu Fenstern (start, end, speaker) mit genau einem Sprecher zusammen:
+    aufeinanderfolgende Turns desselben Sprechers bis max_window_s (Whisper-Fenster),
+    überlappende Rede gehört dem zuerst Sprechenden, lange Turns werden gleichmäßig geteilt"""
+    windows = []
+    current = None
+    for turn in sorted(turns, key=lambda t: t['start']):
+        start = max(turn['start'], current[1] if current else 0.0)
+        end = turn['end']
+        if end - start < min_window_s:
+            continue
 
-    # Lade Pipeline
-    hf_token = os.getenv("HF_TOKEN")
-    if hf_token:
-        pipeline = Pipeline.from_pretrained(
-            "pyannote/speaker-diarization-3.1",
-            token=hf_token
-        )
-    else:
-        # Versuche ohne Token (falls lokal gecacht)
-        pipeline = Pipeline.from_pretrained(
-            "pyannote/speaker-diarization-3.1"
-        )
+        if (current and current[2] == turn['speaker'] and start - current[1] <= max_gap_s
+                and end - current[0] <= max_window_s):
+            current[1] = end
+            continue
 
-    # GPU-Unterstützung aktivieren
-    if torch.cuda.is_available():
-        device = torch.device("cuda")
-        pipeline.to(device)
-        print_colored(f"🚀 GPU aktiviert: {torch.cuda.get_device_name(0)}", Colors.OKGREEN)
-    else:
-        print_colored("⚠️  Keine GPU verfügbar, nutze CPU", Colors.WARNING)
+        if current:
+            windows.append(tuple(current))
+        current = [start, end, turn['speaker']]
+    if current:
+        windows.append(tuple(current))
+
+    # Turns länger als ein Whisper-Fenster aufteilen
+    split = []
+    for start, end, speaker in windows:
+        pieces = max(1, math.ceil((end - start) / max_window_s))
+        step = (end - start) / pieces
+        split.extend((start + k * step, start + (k + 1) * step, speaker) for k in range(pieces))
+    return split
+
+def transcribe_turn_windows(audio_file: Path, windows: List[tuple], language: str = "de",
+                            model_size: str = "base", session: Optional[WhisperModelSession] = None,
+                            audio=None, batch_size: int = 8) -> TranscriptResult:
+    """Transkribiert die Sprecher-Fenster einer Datei gebündelt mit lokalem Whisper;
+    jedes Segment erbt den Sprecher seines Fensters"""
+    print_colored(f"💻 Lokales Whisper ({model_size}, {len(windows)} Sprecher-Fenster): {audio_file.name}",
+                  Colors.OKCYAN)
+
+    if session is None:
+        session = WhisperModelSession(model_size)
+    was_loaded = session.is_loaded
+    model = session.load()
+    load_time = 0.0 if was_loaded else session.load_time
+
+    if audio is None:
+        audio = decode_audio(audio_file, None)
 
-    # Diarization durchführen
     start = time.time()
-
-    if num_speakers:
-        diarization_output = pipeline(str(audio_file), num_speakers=num_speakers)
-    else:
-        diarization_output = pipeline(str(audio_file))
+    segments = transcribe_windows_batched(model, audio, windows, language, batch_size)
 
     elapsed = time.time() - start
-    print_colored(f"⏱️  Diarization: {elapsed:.1f}s", Colors.OKGREEN)
+    print_colored(f"⏱️  Lokales Whisper: Laden {load_time:.1f}s, Inferenz {elapsed:.1f}s", Colors.OKGREEN)
+
+    return TranscriptResult(segments)
+
+# ASR-Backends: gemeinsame Schnittstelle für API, openai-whisper und faster-whisper
+LOCAL_BACKENDS = ['whisper', 'faster-whisper']
+
+class ASRBackend(ABC):
+    """Schnittstelle eines Transkriptions-Backends. transcribe() nimmt die Datei oder einen
+    16 kHz Mono-Puffer und liefert ein TranscriptResult (Zeitstempel relativ zur Eingabe)"""
+
+    name = None
+    local = True  # Modell läuft im Prozess (keine überlappenden ASR-Jobs)
+
+    @abstractmethod
+    def cache_params(self) -> dict:
+        """Parameter, die das Ergebnis beeinflussen (Cache- und Checkpoint-Schlüssel)"""
+
+    def load(self):
+        """Lädt das Modell vorab (optional)"""
+
+    @abstractmethod
+    def transcribe(self, audio_file: Path, audio=None) -> Optional[TranscriptResult]:
+        """Transkribiert die Datei bzw. den Puffer"""
+
+class WindowedASRBackend(ASRBackend):
+    """Backend, das zusätzlich Sprecher-Fenster (start, end, speaker) eines Puffers transkribiert
+    (Voraussetzung für --diarization-first)"""
+
+    @abstractmethod
+    def transcribe_windows(self, audio_file: Path, audio, windows: List[tuple]) -> TranscriptResult:
+        """Transkribiert die Fenster; Zeitstempel relativ zum ganzen Puffer"""
+
+class OpenAIBackend(ASRBackend):
+    """OpenAI Whisper API (whisper-1); Puffer werden als FLAC hochgeladen"""
+
+    name = 'api'
+    local = False
+
+    def __init__(self, client: "OpenAI", language: str = "de", prompt: str = DEFAULT_PROMPT,
+                 max_chunk_s: float = 600.0, overlap_s: float = 2.0, workers: int = 4):
+        self.client = client
+        self.language = language
+        self.prompt = prompt
+        self.max_chunk_s = max_chunk_s
+        self.overlap_s = overlap_s
+        self.workers = workers
+
+    def cache_params(self) -> dict:
+        return {'backend': 'api', 'model': 'whisper-1', 'language': self.language, 'prompt': self.prompt}
+
+    def transcribe(self, audio_file: Path, audio=None) -> Optional[TranscriptResult]:
+        if audio is None:
+            return transcribe_with_openai(self.client, audio_file, self.language, self.prompt,
+                                          self.max_chunk_s, self.overlap_s, self.workers)
+        with tempfile.TemporaryDirectory(prefix="interviewforge_") as tmp_dir:
+            speech_file = Path(tmp_dir) / f"{audio_file.stem}_speech.flac"
+            write_speech_audio(audio, speech_file)
+            return transcribe_with_openai(self.client, speech_file, self.language, self.prompt,
+                                          self.max_chunk_s, self.overlap_s, self.workers)
+
+class WhisperBackend(WindowedASRBackend):
+    """Lokales openai-whisper (PyTorch); Sprecher-Fenster werden gebündelt dekodiert"""
+
+    name = 'local'
+
+    def __init__(self, model_size: str = "base", language: str = "de", device: Optional[str] = None,
+                 batch_size: int = 1, model_dir: Optional[Path] = None):
+        self.session = WhisperModelSession(model_size, device, Path(model_dir) / 'whisper' if model_dir else None)
+        self.language = language
+        self.batch_size = max(1, batch_size)
+
+    def cache_params(self) -> dict:
+        return {'backend': 'local', 'model': self.session.model_size, 'language': self.language, 'prompt': None}
+
+    def load(self):
+        return self.session.load()
+
+    def transcribe(self, audio_file: Path, audio=None) -> Optional[TranscriptResult]:
+        return transcribe_with_local_whisper(audio_file, self.language, self.session.model_size,
+                                             session=self.session, audio=audio)
+
+    def transcribe_windows(self, audio_file: Path, audio, windows: List[tuple]) -> TranscriptResult:
+        return transcribe_turn_windows(audio_file, windows, self.language, self.session.model_size,
+                                       session=self.session, audio=audio, batch_size=self.batch_size)
+
+class FasterWhisperBackend(WindowedASRBackend):
+    """Lokales faster-whisper (CTranslate2) mit quantisierten Gewichten (int8 auf CPU);
+    bei batch_size > 1 dekodiert die BatchedInferencePipeline mehrere Abschnitte einer Datei gemeinsam"""
+
+    name = 'faster-whisper'
+    COMPUTE_TYPES = ['int8', 'int8_float32', 'int8_float16', 'float16', 'float32']
+
+    def __init__(self, model_size: str = "base", language: str = "de", device: Optional[str] = None,
+                 compute_type: str = "int8", cpu_threads: int = 0, batch_size: int = 1,
+                 model_dir: Optional[Path] = None, offline: bool = False):
+        self.model_size = model_size
+        self.language = language
+        self.device = device
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.batch_size = max(1, batch_size)
+        self.download_root = Path(model_dir) / 'faster-whisper' if model_dir else None
+        self.offline = offline
+        self.model = None
+        self.load_time = 0.0
+
+    def cache_params(self) -> dict:
+        return {'backend': 'faster-whisper', 'model': self.model_size, 'language': self.language,
+                'prompt': None, 'compute_type': self.compute_type}
+
+    def load(self):
+        """Lädt das CTranslate2-Modell beim ersten Aufruf (Download nach ~/.cache/huggingface/
+        bzw. in den Modell-Ordner; offline nur von dort)"""
+        if self.model is not None:
+            return self.model
+
+        from faster_whisper import WhisperModel
+        import ctranslate2
+
+        if self.device is None:
+            self.device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+        start = time.time()
+        print_colored(f"📥 Lade faster-whisper '{self.model_size}' ({self.device}, {self.compute_type}"
+                      f"{f', {self.cpu_threads} Threads' if self.cpu_threads else ''})...", Colors.OKCYAN)
+        self.model = WhisperModel(self.model_size, device=self.device, compute_type=self.compute_type,
+                                  cpu_threads=self.cpu_threads,
+                                  download_root=str(self.download_root) if self.download_root else None,
+                                  local_files_only=self.offline)
+        self.load_time = time.time() - start
+        print_colored(f"⏱️  Modell geladen: {self.load_time:.1f}s", Colors.OKGREEN)
+        return self.model
+
+    def run(self, audio, batched: bool = False, **options) -> List[dict]:
+        """Transkribiert eine Eingabe; faster-whisper liefert einen Generator, dekodiert wird beim Iterieren"""
+        model = self.load()
+        if batched:
+            from faster_whisper import BatchedInferencePipeline
+            segments, _ = BatchedInferencePipeline(model=model).transcribe(
+                audio, language=self.language, task="transcribe", batch_size=self.batch_size)
+        else:
+            segments, _ = model.transcribe(audio, language=self.language, task="transcribe",
+                                           beam_size=5, **options)
+        return [{'start': seg.start, 'end': seg.end, 'text': seg.text} for seg in segments]
+
+    def transcribe(self, audio_file: Path, audio=None) -> Optional[TranscriptResult]:
+        if not modules_available('faster_whisper'):
+            print_colored("❌ faster-whisper nicht installiert!", Colors.FAIL)
+            print_colored("   Installiere mit: pip install -U faster-whisper", Colors.WARNING)
+            return None
+
+        print_colored(f"⚡ faster-whisper ({self.model_size}, {self.compute_type}): {audio_file.name}", Colors.OKCYAN)
+        was_loaded = self.model is not None
+        self.load()
+        load_time = 0.0 if was_loaded else self.load_time
+
+        start = time.time()
+        segments = self.run(audio if audio is not None else str(audio_file), batched=self.batch_size > 1)
+        elapsed = time.time() - start
+        print_colored(f"⏱️  faster-whisper: Laden {load_time:.1f}s, Inferenz {elapsed:.1f}s", Colors.OKGREEN)
+
+        return TranscriptResult(segments)
+
+    def transcribe_windows(self, audio_file: Path, audio, windows: List[tuple]) -> TranscriptResult:
+        import numpy as np
+
+        print_colored(f"⚡ faster-whisper ({self.model_size}, {len(windows)} Sprecher-Fenster): {audio_file.name}",
+                      Colors.OKCYAN)
+        if audio is None:
+            audio = decode_audio(audio_file, None)
+
+        start = time.time()
+        segments = []
+        for window_start, window_end, speaker in windows:
+            clip = np.ascontiguousarray(audio[int(window_start * SAMPLE_RATE):int(window_end * SAMPLE_RATE)])
+            window_segments = self.run(clip, condition_on_previous_text=False)
+            segments.extend(offset_window_segments(window_segments, window_start, window_end, speaker))
+        print_colored(f"⏱️  faster-whisper: Inferenz {time.time() - start:.1f}s", Colors.OKGREEN)
+
+        return TranscriptResult(segments)
+
+class DiarizationEngine:
+    """Hält die Pyannote-Pipeline für einen ganzen Batch im Speicher (einmal laden, oft nutzen)"""
+
+    def __init__(self, hf_token: Optional[str] = None,
+                 model_name: str = PYANNOTE_MODEL, device: Optional[str] = None,
+                 segmentation_batch_size: int = 0, embedding_batch_size: int = 0):
+        self.hf_token = hf_token
+        self.model_name = model_name
+        self.device = device
+        self.batch_sizes = {'segmentation_batch_size': segmentation_batch_size,
+                            'embedding_batch_size': embedding_batch_size}
+        self.pipeline = None
+        self.load_time = 0.0
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.pipeline is not None
+
+    def load(self):
+        """Lädt Pipeline und Device-Zuordnung beim ersten Aufruf, danach aus dem Speicher"""
+        if self.pipeline is not None:
+            return self.pipeline
 
-    # Konvertiere zu Dict-Format
-    segments = []
+        from pyannote.audio import Pipeline
+        import torch
+
+        apply_torch_threads()
+        start = time.time()
+
+        # Lade Pipeline
+        print_colored(f"📥 Lade Pyannote-Pipeline '{self.model_name}'...", Colors.OKCYAN)
+        if self.hf_token:
+            pipeline = Pipeline.from_pretrained(
+                self.model_name,
+                token=self.hf_token
+            )
+        else:
+            # Versuche ohne Token (falls lokal gecacht)
+            pipeline = Pipeline.from_pretrained(
+                self.model_name
+            )
+
+        # GPU-Unterstützung aktivieren (außer bei --device cpu)
+        if self.device is None:
+            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        if self.device == "cuda":
+            device = torch.device("cuda")
+            pipeline.to(device)
+            print_colored(f"🚀 GPU aktiviert: {torch.cuda.get_device_name(0)}", Colors.OKGREEN)
+        else:
+            print_colored("⚠️  Keine GPU verfügbar, nutze CPU", Colors.WARNING)
+
+        self.pipeline = pipeline
+        self.set_batch_sizes(**self.batch_sizes)
+        self.load_time = time.time() - start
+        print_colored(f"⏱️  Pipeline geladen: {self.load_time:.1f}s", Colors.OKGREEN)
+
+        return self.pipeline
+
+    def set_batch_sizes(self, segmentation_batch_size: int = 0, embedding_batch_size: int = 0):
+        """Batch-Größen für Segmentierung und Embeddings (0 = Standard der Pipeline beibehalten)"""
+        self.batch_sizes = {'segmentation_batch_size': segmentation_batch_size,
+                            'embedding_batch_size': embedding_batch_size}
+        if self.pipeline is None:
+            return
+        for name, value in self.batch_sizes.items():
+            if value and hasattr(self.pipeline, name):
+                setattr(self.pipeline, name, value)
+
+    def warmup(self, duration_s: float = 2.0, sample_rate: int = 16000):
+        """Wärmt die Pipeline mit einem kurzen Stille-Clip auf, damit die erste Datei nicht bremst"""
+        import torch
+
+        pipeline = self.load()
+        start = time.time()
+        silence = {
+            'waveform': torch.zeros(1, int(duration_s * sample_rate)),
+            'sample_rate': sample_rate
+        }
+        try:
+            pipeline(silence)
+        except Exception as e:
+            # Aufwärmen ist optional - Fehler hier dürfen den Batch nicht stoppen
+            print_colored(f"⚠️  Aufwärmen fehlgeschlagen: {e}", Colors.WARNING)
+            return
+        print_colored(f"⏱️  Pipeline aufgewärmt: {time.time() - start:.1f}s", Colors.OKGREEN)
+
+def pyannote_segments(diarization_output) -> List[dict]:
+    """Sprecherwechsel aus einem Pyannote-Ergebnis als Liste von Dicts"""
     # Pyannote 4.x gibt DiarizeOutput zurück, speaker_diarization enthält die Daten
     if hasattr(diarization_output, 'speaker_diarization'):
         diarization = diarization_output.speaker_diarization
     else:
         diarization = diarization_output
 
+    segments = []
     for segment, _, speaker in diarization.itertracks(yield_label=True):
         segments.append({
             'start': segment.start,
             'end': segment.end,
             'speaker': f"SPEAKER_{str(speaker).split('_')[-1] if '_' in str(speaker) else speaker}"
         })
+    return segments
+
+# Fensterweise Diarization langer Aufnahmen: Speicher wächst mit der Fenstergröße, nicht der Dateilänge
+@contextmanager
+def mapped_pcm(audio_file: Path, scratch_dir: Optional[Path] = None):
+    """Dekodiert eine Datei als rohes 16 kHz Mono float32 in eine Scratch-Datei und liefert sie
+    als schreibgeschütztes np.memmap - gelesen werden nur die Seiten des aktuellen Fensters"""
+    import numpy as np
+
+    handle, path = tempfile.mkstemp(suffix='.f32', prefix='interviewforge_', dir=scratch_dir)
+    os.close(handle)
+    samples = None
+    try:
+        subprocess.run(['ffmpeg', '-nostdin', '-hide_banner', '-loglevel', 'error', '-y', '-i', str(audio_file),
+                        '-ac', '1', '-ar', str(SAMPLE_RATE), '-f', 'f32le', path],
+                       capture_output=True, check=True)
+        if os.path.getsize(path) == 0:
+            yield np.zeros(0, dtype=np.float32)
+            return
+        samples = np.memmap(path, dtype=np.float32, mode='r')
+        yield samples
+    finally:
+        del samples
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # Windows: noch abgebildet
+
+def plan_diarization_windows(duration: float, window_s: float, overlap_s: float) -> List[tuple]:
+    """Überlappende Fenster (Start, Ende) über die ganze Datei; das letzte Fenster endet am Dateiende"""
+    if duration <= window_s:
+        return [(0.0, duration)]
+    step = max(1.0, window_s - overlap_s)
+    windows = []
+    start = 0.0
+    while start + window_s < duration:
+        windows.append((start, start + window_s))
+        start += step
+    windows.append((max(0.0, duration - window_s), duration))
+    return windows
+
+class SpeakerRegistry:
+    """Führt die Sprecher aller Fenster zu einer Zuordnung zusammen: jeder lokale Sprecher eines Fensters
+    wird dem ähnlichsten bisherigen Sprecher (Kosinus-Ähnlichkeit der Embedding-Schwerpunkte) zugeordnet
+    oder als neuer Sprecher angelegt"""
+
+    # Pyannote 3.1 clustert mit Kosinus-Distanz ~0.7 - entspricht einer Ähnlichkeit von ~0.3
+    MIN_SIMILARITY = 0.3
+
+    def __init__(self, min_similarity: float = MIN_SIMILARITY):
+        self.min_similarity = min_similarity
+        self.centroids = []   # normierte Embedding-Summen (None ohne Embedding)
+        self.weights = []     # Sprechdauer in Sekunden
+        self.merged = {}      # Sprecher -> Sprecher, mit dem er zusammengelegt wurde
+
+    @staticmethod
+    def _normalize(vector):
+        import numpy as np
+
+        if vector is None:
+            return None
+        vector = np.asarray(vector, dtype=np.float64)
+        norm = np.linalg.norm(vector)
+        return vector / norm if np.isfinite(norm) and norm > 0 else None
+
+    def assign(self, speakers: Dict[str, tuple], hints: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """speakers: lokales Label -> (Embedding oder None, Sprechdauer);
+        hints: lokales Label -> globaler Sprecher laut Überlappung mit dem vorigen Fenster (für Sprecher
+        ohne gültiges Embedding). Liefert lokales Label -> globaler Sprecher"""
+        embeddings = {label: self._normalize(vector) for label, (vector, _) in speakers.items()}
+
+        # Paare nach Ähnlichkeit, jeder globale Sprecher höchstens einmal pro Fenster
+        pairs = []
+        for label, embedding in embeddings.items():
+            if embedding is None:
+                continue
+            for index, centroid in enumerate(self.centroids):
+                if centroid is not None and index not in self.merged:
+                    pairs.append((float(embedding @ centroid), label, index))
+
+        mapping = {}
+        taken = set()
+        for similarity, label, index in sorted(pairs, reverse=True):
+            if similarity < self.min_similarity:
+                break
+            if label not in mapping and index not in taken:
+                mapping[label] = index
+                taken.add(index)
+
+        for label, (_, seconds) in speakers.items():
+            if label not in mapping:
+                hint = (hints or {}).get(label)
+                if embeddings[label] is None and hint is not None and hint not in taken:
+                    mapping[label] = hint
+                else:
+                    self.centroids.append(None)
+                    self.weights.append(0.0)
+                    mapping[label] = len(self.centroids) - 1
+                taken.add(mapping[label])
+            self._update(mapping[label], embeddings[label], seconds)
+        return mapping
+
+    def _update(self, index: int, embedding, seconds: float):
+        if embedding is not None:
+            weighted = embedding * max(seconds, 1e-3)
+            total = weighted if self.centroids[index] is None else self.centroids[index] * self.weights[index] + weighted
+            self.centroids[index] = self._normalize(total)
+        self.weights[index] += max(seconds, 1e-3)
+
+    def resolve(self, index: int) -> int:
+        while index in self.merged:
+            index = self.merged[index]
+        return index
+
+    def merge_to(self, num_speakers: int):
+        """Legt die ähnlichsten Sprecher zusammen, bis höchstens num_speakers übrig sind"""
+        while True:
+            active = [i for i in range(len(self.centroids)) if i not in self.merged]
+            if len(active) <= num_speakers:
+                return
+            candidates = [(float(self.centroids[a] @ self.centroids[b]), a, b)
+                          for k, a in enumerate(active) for b in active[k + 1:]
+                          if self.centroids[a] is not None and self.centroids[b] is not None]
+            if not candidates:
+                # Ohne Embeddings: den kürzesten Sprecher dem längsten zuschlagen
+                shortest = min(active, key=lambda i: self.weights[i])
+                longest = max((i for i in active if i != shortest), key=lambda i: self.weights[i])
+                candidates = [(0.0, longest, shortest)]
+            _, keep, drop = max(candidates)
+            self.merged[drop] = keep
+            self._update(keep, self.centroids[drop], self.weights[drop])
+
+def pipeline_accepts(pipeline, option: str) -> bool:
+    """Ob pipeline.apply die Option kennt - vorab geprüft, statt einen Fehler mitten in der
+    Inferenz als 'nicht unterstützt' zu deuten und die ganze Diarization zu wiederholen"""
+    import inspect
+
+    try:
+        return option in inspect.signature(pipeline.apply).parameters
+    except (AttributeError, TypeError, ValueError):
+        return False
+
+def run_pipeline_with_embeddings(pipeline, pipeline_input, **options) -> tuple:
+    """Pyannote-Aufruf, der zusätzlich ein Embedding pro lokalem Sprecher liefert:
+    (Ergebnis, {Label: Embedding})"""
+    if pipeline_accepts(pipeline, 'return_embeddings'):
+        output = pipeline(pipeline_input, return_embeddings=True, **options)
+    else:
+        output = pipeline(pipeline_input, **options)  # Pyannote 4.x: Embeddings sind im Ergebnis enthalten
+
+    if isinstance(output, tuple):
+        diarization, embeddings = output
+    else:
+        diarization = getattr(output, 'speaker_diarization', output)
+        embeddings = getattr(output, 'speaker_embeddings', None)
+
+    labels = diarization.labels()
+    vectors = {}
+    for k, label in enumerate(labels):
+        vectors[label] = embeddings[k] if embeddings is not None and k < len(embeddings) else None
+    return diarization, vectors
+
+def diarize_windowed(pipeline, samples, num_speakers: Optional[int] = None, window_s: float = 600.0,
+                     overlap_s: float = 30.0) -> List[dict]:
+    """Diarisiert einen (memory-mapped) 16 kHz-Puffer in überlappenden Fenstern und vereinheitlicht die
+    Sprecher über Embedding-Ähnlichkeit. Jedes Fenster liefert die Segmente bis zur Mitte der
+    Überlappung mit seinen Nachbarn"""
+    import numpy as np
+    import torch
+
+    duration = len(samples) / SAMPLE_RATE
+    windows = plan_diarization_windows(duration, window_s, overlap_s)
+    # Schnittpunkte: Mitte jeder Überlappung
+    cuts = [0.0] + [(windows[k][0] + windows[k - 1][1]) / 2 for k in range(1, len(windows))] + [duration]
+
+    registry = SpeakerRegistry()
+    options = {}
+    if num_speakers:
+        # Ein Fenster enthält evtl. nicht alle Sprecher - die Zielzahl gilt erst nach dem Zusammenführen
+        options = {'max_speakers': num_speakers} if len(windows) > 1 else {'num_speakers': num_speakers}
+    pieces = []   # (Start, Ende, globaler Sprecher)
+    previous = []
+
+    for k, (start, end) in enumerate(windows):
+        window = np.array(samples[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)], dtype=np.float32)
+        pipeline_input = {'waveform': torch.from_numpy(window).unsqueeze(0), 'sample_rate': SAMPLE_RATE}
+        diarization, vectors = run_pipeline_with_embeddings(pipeline, pipeline_input, **options)
+        del window, pipeline_input
+
+        local = [(start + segment.start, start + segment.end, label)
+                 for segment, _, label in diarization.itertracks(yield_label=True)]
+
+        # Sprechdauer und Überlappungs-Hinweis (für Sprecher ohne Embedding) pro lokalem Label
+        speakers = {label: (vectors.get(label), 0.0) for label in diarization.labels()}
+        overlap_votes = {}
+        for seg_start, seg_end, label in local:
+            speakers[label] = (speakers[label][0], speakers[label][1] + seg_end - seg_start)
+            for prev_start, prev_end, index in previous:
+                shared = min(seg_end, prev_end) - max(seg_start, prev_start)
+                if shared > 0:
+                    votes = overlap_votes.setdefault(label, {})
+                    votes[index] = votes.get(index, 0.0) + shared
+        hints = {label: max(votes, key=votes.get) for label, votes in overlap_votes.items()}
+
+        mapping = registry.assign(speakers, hints)
+        previous = [(s, e, mapping[label]) for s, e, label in local if s < end and e > windows[k + 1][0]] \
+            if k + 1 < len(windows) else []
+
+        # Nur der eigene Bereich zwischen den Schnittpunkten
+        for seg_start, seg_end, label in local:
+            seg_start, seg_end = max(seg_start, cuts[k]), min(seg_end, cuts[k + 1])
+            if seg_end > seg_start:
+                pieces.append((float(seg_start), float(seg_end), mapping[label]))
+
+        print_colored(f"   Fenster {k + 1}/{len(windows)}: {format_time_kruse(start, 'HH:MM:SS')}-"
+                      f"{format_time_kruse(end, 'HH:MM:SS')}, {len(speakers)} Sprecher", Colors.OKCYAN)
+
+    if num_speakers:
+        registry.merge_to(num_speakers)
+
+    # Globale Sprecher in Reihenfolge des ersten Auftretens nummerieren, Schnittkanten zusammenfügen
+    labels = {}
+    segments = []
+    for seg_start, seg_end, index in sorted(pieces):
+        index = registry.resolve(index)
+        speaker = labels.setdefault(index, f"SPEAKER_{len(labels):02d}")
+        if segments and segments[-1]['speaker'] == speaker and seg_start - segments[-1]['end'] < 1e-3:
+            segments[-1]['end'] = max(segments[-1]['end'], seg_end)
+        else:
+            segments.append({'start': seg_start, 'end': seg_end, 'speaker': speaker})
+    return segments
+
+def diarize_with_pyannote(audio_file: Path, num_speakers: Optional[int] = None,
+                          engine: Optional[DiarizationEngine] = None, audio=None,
+                          window_s: float = 0.0, overlap_s: float = 30.0) -> dict:
+    """Speaker Diarization mit pyannote.audio
+    (window_s > 0: fensterweise über memory-mapped Audio für lange Aufnahmen)"""
+    if not modules_available('pyannote.audio', 'torch'):
+        print_colored("❌ pyannote.audio nicht installiert!", Colors.FAIL)
+        print_colored("   Installiere mit: ./venv/bin/pip install pyannote.audio", Colors.WARNING)
+        return None
+
+    print_colored(f"🎙️ Pyannote Diarization{f' (Fenster {window_s / 60:.0f} min)' if window_s else ''}...",
+                  Colors.OKCYAN)
+
+    # Ohne Engine: Pipeline nur für diese Datei laden
+    if engine is None:
+        engine = DiarizationEngine(os.getenv("HF_TOKEN"))
+    pipeline = engine.load()
+
+    # Diarization durchführen
+    start = time.time()
+
+    if window_s:
+        # Vorverarbeiteter Puffer liegt schon im Speicher, sonst Datei als memmap lesen
+        with nullcontext(audio) if audio is not None else mapped_pcm(audio_file) as samples:
+            segments = diarize_windowed(pipeline, samples, num_speakers, window_s, overlap_s)
+    else:
+        # Vorverarbeiteter Puffer (16 kHz Mono) oder Datei
+        if audio is not None:
+            import torch
+
+            pipeline_input = {'waveform': torch.from_numpy(audio).unsqueeze(0), 'sample_rate': SAMPLE_RATE}
+        else:
+            pipeline_input = str(audio_file)
+
+        if num_speakers:
+            diarization_output = pipeline(pipeline_input, num_speakers=num_speakers)
+        else:
+            diarization_output = pipeline(pipeline_input)
+        segments = pyannote_segments(diarization_output)
+
+    elapsed = time.time() - start
+    print_colored(f"⏱️  Diarization: {elapsed:.1f}s", Colors.OKGREEN)
 
     return {'segments': segments}
 
-def merge_transcription_and_diarization(transcript, diarization) -> List[dict]:
-    """Kombiniert Whisper-Text mit Pyannote-Sprechern"""
-    # Whisper Segmente
+def transcript_to_segments(transcript) -> List[dict]:
+    """Whisper-Segmente (API-Objekt oder TranscriptResult) als Liste von Dicts"""
     whisper_segments = []
     if hasattr(transcript, 'segments'):
-        for seg in transcript.segments:
+        for seg in transcript.segments or []:
             whisper_segments.append({
                 'start': seg.start,
                 'end': seg.end,
                 'text': seg.text.strip()
             })
+            if getattr(seg, 'speaker', None) is not None:
+                whisper_segments[-1]['speaker'] = seg.speaker
+    return whisper_segments
+
+# Hash-Cache pro Lauf: (Pfad, Größe, mtime) -> SHA-256
+_file_hashes = {}
+_file_hashes_lock = threading.Lock()
+
+def hash_audio_file(audio_file: Path) -> str:
+    """SHA-256 des Dateiinhalts (pro Lauf nur einmal berechnet)"""
+    stat = audio_file.stat()
+    memo_key = (str(audio_file.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _file_hashes_lock:
+        if memo_key in _file_hashes:
+            return _file_hashes[memo_key]
+
+    digest = hashlib.sha256()
+    with open(audio_file, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+
+    with _file_hashes_lock:
+        _file_hashes[memo_key] = digest.hexdigest()
+    return digest.hexdigest()
+
+class ResultCache:
+    """Inhaltsadressierter Cache für Whisper-Segmente und Pyannote-Sprecherwechsel
+    (Schlüssel: Audio-Hash + Parameter der Stufe, Speicherung als kompaktes JSON)"""
+
+    # Nur diese Unterordner gehören dem Cache - alles andere im Cache-Ordner bleibt unberührt
+    STAGES = ('asr', 'diarization', 'vad')
+
+    def __init__(self, cache_dir: Path, max_size_mb: float = 500.0, enabled: bool = True, refresh: bool = False):
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.refresh = refresh
+        self.lock = threading.Lock()
+
+    def path_for(self, stage: str, audio_file: Path, params: dict) -> Path:
+        key_data = json.dumps({'audio': hash_audio_file(audio_file), 'params': params}, sort_keys=True)
+        key = hashlib.sha256(key_data.encode('utf-8')).hexdigest()
+        return self.cache_dir / stage / f"{key}.json"
+
+    def load(self, stage: str, audio_file: Path, params: dict) -> Optional[dict]:
+        """Liefert das gecachte Ergebnis oder None (auch bei --no-cache / --refresh)"""
+        if not self.enabled or self.refresh:
+            return None
+
+        cache_file = self.path_for(stage, audio_file, params)
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Zugriffszeit für die Verdrängung (LRU) aktualisieren
+        try:
+            os.utime(cache_file)
+        except OSError:
+            pass
+        return data
+
+    def store(self, stage: str, audio_file: Path, params: dict, data: dict):
+        """Speichert ein Ergebnis atomar und verdrängt bei Bedarf alte Einträge"""
+        if not self.enabled:
+            return
+
+        cache_file = self.path_for(stage, audio_file, params)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_file, cache_file)
+
+        self.evict()
+
+    def evict(self):
+        """Löscht die am längsten nicht genutzten Einträge, bis der Cache unter max_size liegt"""
+        with self.lock:
+            entries = []
+            cache_files = [path for stage in self.STAGES for path in (self.cache_dir / stage).glob('*.json')]
+            for cache_file in cache_files:
+                try:
+                    stat = cache_file.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, cache_file))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, cache_file in sorted(entries):
+                if total <= self.max_size_bytes:
+                    break
+                try:
+                    cache_file.unlink()
+                    total -= size
+                except OSError:
+                    pass
+
+class RunManifest:
+    """Checkpoint-Manifest (JSON Lines) im Output-Ordner: pro Datei und Stufe Abschluss mit
+    Input-Hash und Parametern, damit ein abgebrochener Lauf genau dort weitermacht"""
+
+    FILENAME = "interviewforge_manifest.jsonl"
+
+    def __init__(self, output_folder: Path, refresh: bool = False):
+        self.path = Path(output_folder) / self.FILENAME
+        self.lock_path = Path(output_folder) / f".{self.FILENAME}.lock"
+        self.stages_dir = Path(output_folder) / ".stages"
+        self.refresh = refresh
+        self.lock = threading.Lock()
+        self.records = {}
+        self.files = set()
+
+        # Letzter Eintrag pro (Datei, Stufe) gilt
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Abgeschnittene Zeile nach Absturz
+                    self.records[(record['file'], record['stage'])] = record
+                    self.files.add(record['file'])
+
+    def has_file(self, audio_file: Path) -> bool:
+        return audio_file.name in self.files
+
+    def artifact_path(self, audio_file: Path, stage: str) -> Path:
+        return self.stages_dir / f"{audio_file.stem}.{stage}.json"
+
+    def is_done(self, audio_file: Path, stage: str, params: dict, output: Optional[Path] = None) -> bool:
+        """Stufe abgeschlossen - mit gleichem Audio-Inhalt, gleichen Parametern und vorhandenem Ergebnis?"""
+        if self.refresh:
+            return False
+        record = self.records.get((audio_file.name, stage))
+        if record is None or record['params'] != json.loads(json.dumps(params)):
+            return False
+        if output is not None and not output.exists():
+            return False
+        return record['input_hash'] == hash_audio_file(audio_file)
+
+    def load(self, audio_file: Path, stage: str, params: dict) -> Optional[dict]:
+        """Gespeichertes Ergebnis einer abgeschlossenen Stufe oder None"""
+        artifact = self.artifact_path(audio_file, stage)
+        if not self.is_done(audio_file, stage, params, artifact):
+            return None
+        try:
+            with open(artifact, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def complete(self, audio_file: Path, stage: str, params: dict, artifact: Optional[dict] = None):
+        """Markiert eine Stufe als abgeschlossen (Ergebnis zuerst schreiben, dann Manifest-Zeile)"""
+        if artifact is not None:
+            artifact_file = self.artifact_path(audio_file, stage)
+            artifact_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = artifact_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(artifact, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_file, artifact_file)
+
+        record = {
+            'file': audio_file.name,
+            'stage': stage,
+            'input_hash': hash_audio_file(audio_file),
+            'params': params,
+            'completed': datetime.now().isoformat(timespec='seconds')
+        }
+        # Threads dieses Prozesses und Farm-Worker in anderen Prozessen hängen an dieselbe Datei an
+        with self.lock, _file_lock(self.lock_path):
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.records[(record['file'], stage)] = json.loads(json.dumps(record))
+            self.files.add(record['file'])
+
+def merge_transcription_and_diarization(transcript, diarization) -> List[dict]:
+    """Kombiniert Whisper-Text mit Pyannote-Sprechern"""
+    # Whisper Segmente
+    whisper_segments = transcript_to_segments(transcript)
+
+    # Diarization zuerst: Sprecher steht schon an jedem Segment, keine Überlappungssuche nötig
+    if whisper_segments and all('speaker' in seg for seg in whisper_segments):
+        return whisper_segments
 
     # Diarization Segmente
     diar_segments = diarization.get('segments', [])
 
-    # Merge: Für jedes Whisper-Segment finde den passenden Speaker
-    merged = []
-    last_known_speaker = None
+    # Sweep über nach Start sortierte Intervalle statt O(N·M)-Vollsuche:
+    # aktiv sind nur Diarization-Segmente, die das aktuelle Whisper-Segment berühren können
+    diar_order = sorted(range(len(diar_segments)), key=lambda j: diar_segments[j]['start'])
+    whisper_order = sorted(range(len(whisper_segments)),
+                           key=lambda i: min(whisper_segments[i]['start'], whisper_segments[i]['end']))
+
+    found_speakers = [None] * len(whisper_segments)
+    active = []  # Heap aus (Ende, Original-Index)
+    next_diar = 0
+
+    for i in whisper_order:
+        wseg = whisper_segments[i]
+        lo = min(wseg['start'], wseg['end'])
+        hi = max(wseg['start'], wseg['end'])
+
+        # Segmente aufnehmen, die vor dem Ende beginnen
+        while next_diar < len(diar_order) and diar_segments[diar_order[next_diar]]['start'] <= hi:
+            j = diar_order[next_diar]
+            heapq.heappush(active, (diar_segments[j]['end'], j))
+            next_diar += 1
+
+        # Segmente verwerfen, die vor dem Start enden
+        while active and active[0][0] < lo:
+            heapq.heappop(active)
 
-    for wseg in whisper_segments:
         speaker = None
         best_overlap = 0
+        best_index = None
 
-        # Finde Speaker mit größter Überlappung
-        for dseg in diar_segments:
+        # Finde Speaker mit größter Überlappung (bei Gleichstand: frühestes Segment der Liste)
+        for _, j in active:
+            dseg = diar_segments[j]
             overlap_start = max(wseg['start'], dseg['start'])
             overlap_end = min(wseg['end'], dseg['end'])
             overlap = max(0, overlap_end - overlap_start)
 
-            if overlap > best_overlap:
+            if overlap > best_overlap or (overlap == best_overlap and overlap > 0 and j < best_index):
                 best_overlap = overlap
+                best_index = j
                 speaker = dseg['speaker']
 
-        # Wenn keine Überlappung gefunden: verwende letzten bekannten Speaker
-        if speaker is None and best_overlap == 0:
-            # Prüfe ob Speaker zur Mitte passt (fallback)
+        # Wenn keine Überlappung gefunden: Prüfe ob Speaker zur Mitte passt (fallback)
+        if speaker is None:
             mid_time = (wseg['start'] + wseg['end']) / 2
-            for dseg in diar_segments:
-                if dseg['start'] <= mid_time <= dseg['end']:
+            for _, j in active:
+                dseg = diar_segments[j]
+                if dseg['start'] <= mid_time <= dseg['end'] and (best_index is None or j < best_index):
+                    best_index = j
                     speaker = dseg['speaker']
-                    break
 
-            # Wenn immer noch kein Speaker: verwende letzten bekannten
-            if speaker is None and last_known_speaker is not None:
-                speaker = last_known_speaker
-            elif speaker is None:
-                speaker = "UNKNOWN"
+        found_speakers[i] = speaker
+
+    # Merge: Für jedes Whisper-Segment (in Originalreihenfolge) den Speaker übernehmen
+    merged = []
+    last_known_speaker = None
+
+    for wseg, speaker in zip(whisper_segments, found_speakers):
+        # Wenn immer noch kein Speaker: verwende letzten bekannten
+        if speaker is None and last_known_speaker is not None:
+            speaker = last_known_speaker
+        elif speaker is None:
+            speaker = "UNKNOWN"
 
         if speaker != "UNKNOWN":
             last_known_speaker = speaker
@@ -271,36 +2453,47 @@ def merge_transcription_and_diarization(transcript, diarization) -> List[dict]:
 
     return merged
 
-def generate_kruse_txt(segments: List[dict], audio_file: Path, output_file: Path, config: dict):
-    """Generiert Kruse-Format TXT"""
+def wrap_block_text(block_text: str, max_len: int) -> List[str]:
+    """Bricht einen Block-Text wortweise bei max_len um"""
+    words = block_text.split()
+    lines = []
+    current_line = []
+    current_length = 0
+
+    for word in words:
+        if current_length + len(word) + 1 <= max_len:
+            current_line.append(word)
+            current_length += len(word) + 1
+        else:
+            lines.append(' '.join(current_line))
+            current_line = [word]
+            current_length = len(word)
 
-    txt_lines = []
-    txt_lines.append("=" * 80)
-    txt_lines.append(f"Transkript: {audio_file.name}")
-    txt_lines.append(f"Datum: {datetime.now().strftime('%d.%m.%Y')}")
-    txt_lines.append(f"Format: Kruse-Notation (OpenAI Whisper + Pyannote)")
-    txt_lines.append("=" * 80)
-    txt_lines.append("")
+    if current_line:
+        lines.append(' '.join(current_line))
 
-    # Legende
-    txt_lines.append("LEGENDE:")
-    for speaker_id, label in config['speakers'].items():
-        if speaker_id != 'default':
-            txt_lines.append(f"  {label}: {speaker_id}")
-    txt_lines.append("")
-    txt_lines.append("SYMBOLE:")
-    for symbol_name, symbol in config['symbols'].items():
-        txt_lines.append(f"  {symbol}: {symbol_name.replace('_', ' ').title()}")
-    txt_lines.append("")
-    txt_lines.append("=" * 80)
-    txt_lines.append("")
+    return lines
 
-    # Transkript
-    line_number = 1
+def iter_transcript_blocks(segments: List[dict], config: dict):
+    """Analysiert ein Transkript einmal für alle Ausgabeformate und liefert Sprecher-Blöcke gestreamt:
+    Label, Zeitstempel, Pausen (vor dem Block und zwischen Segmenten), Farbindex und umbrochene Zeilen"""
+    timestamp_format = config['format'].get('timestamp_format', 'MM:SS')
+    max_len = config['format'].get('max_line_length', 80)
+
+    speaker_labels = {}
+    speaker_colors = {}
     prev_end = 0
-    current_block = []
-    current_speaker = None
-    current_start = None
+    current = None
+
+    def finish(block: dict) -> dict:
+        # Umbrochene Zeilen für die Kruse-TXT (Pausen im Fließtext)
+        items = []
+        for entry in block['entries']:
+            if entry['pause']:
+                items.append(entry['pause'])
+            items.append(entry['text'])
+        block['lines'] = wrap_block_text(' '.join(items), max_len)
+        return block
 
     for segment in segments:
         start = segment.get('start', 0)
@@ -308,179 +2501,193 @@ def generate_kruse_txt(segments: List[dict], audio_file: Path, output_file: Path
         text = segment.get('text', '').strip()
         speaker = segment.get('speaker', 'UNKNOWN')
 
-        speaker_label = map_speaker(speaker, config)
+        if speaker not in speaker_labels:
+            speaker_labels[speaker] = map_speaker(speaker, config)
+            speaker_colors[speaker] = len(speaker_colors) % 5
 
         # Pause erkennen
         pause = detect_pause(prev_end, start, config)
 
-        # Neuer Sprecher oder neue Zeile
-        if speaker != current_speaker:
-            # Vorherigen Block schreiben
-            if current_block:
-                timestamp = format_time_kruse(current_start, config['format'].get('timestamp_format', 'MM:SS'))
-                block_text = ' '.join(current_block)
-
-                # Zeilen umbrechen bei max_line_length
-                max_len = config['format'].get('max_line_length', 80)
-                words = block_text.split()
-                lines = []
-                current_line = []
-                current_length = 0
-
-                for word in words:
-                    if current_length + len(word) + 1 <= max_len:
-                        current_line.append(word)
-                        current_length += len(word) + 1
-                    else:
-                        lines.append(' '.join(current_line))
-                        current_line = [word]
-                        current_length = len(word)
-
-                if current_line:
-                    lines.append(' '.join(current_line))
-
-                # Schreibe Block
-                for i, line in enumerate(lines):
-                    if i == 0:
-                        if config['format'].get('timestamps_each_block', True):
-                            txt_lines.append(f"{line_number:3d} [{timestamp}] {map_speaker(current_speaker, config)}: {line}")
-                        else:
-                            txt_lines.append(f"{line_number:3d} {map_speaker(current_speaker, config)}: {line}")
-                    else:
-                        txt_lines.append(f"{line_number:3d}     {line}")
-                    line_number += 1
-
-                txt_lines.append("")
-
-            # Pause vor neuem Sprecher
-            if pause:
-                txt_lines.append(f"{line_number:3d}     {pause}")
-                line_number += 1
-                txt_lines.append("")
-
-            # Neuen Block starten
-            current_speaker = speaker
-            current_start = start
-            current_block = [text]
+        entry = {
+            'start': start,
+            'end': end,
+            'text': text,
+            'timestamp': format_time_kruse(start, timestamp_format),
+            'pause': None
+        }
+
+        # Neuer Sprecher: Pause steht vor dem Block, sonst innerhalb des Blocks
+        if current is None or speaker != current['speaker']:
+            if current is not None:
+                yield finish(current)
+            current = {
+                'speaker': speaker,
+                'label': speaker_labels[speaker],
+                'color': speaker_colors[speaker],
+                'start': start,
+                'timestamp': entry['timestamp'],
+                'pause_before': pause,
+                'entries': [entry]
+            }
         else:
-            # Pause im gleichen Sprecher
-            if pause:
-                current_block.append(pause)
-            current_block.append(text)
+            entry['pause'] = pause
+            current['entries'].append(entry)
 
         prev_end = end
 
-    # Letzten Block schreiben
-    if current_block:
-        timestamp = format_time_kruse(current_start, config['format'].get('timestamp_format', 'MM:SS'))
-        block_text = ' '.join(current_block)
-
-        max_len = config['format'].get('max_line_length', 80)
-        words = block_text.split()
-        lines = []
-        current_line = []
-        current_length = 0
-
-        for word in words:
-            if current_length + len(word) + 1 <= max_len:
-                current_line.append(word)
-                current_length += len(word) + 1
-            else:
-                lines.append(' '.join(current_line))
-                current_line = [word]
-                current_length = len(word)
+    if current is not None:
+        yield finish(current)
 
-        if current_line:
-            lines.append(' '.join(current_line))
+def build_transcript_blocks(segments: List[dict], config: dict) -> List[dict]:
+    """Block-Modell als Liste (für mehrere Ausgabeformate aus einer Analyse)"""
+    return list(iter_transcript_blocks(segments, config))
+
+@contextmanager
+def atomic_output(output_file: Path, newline: Optional[str] = None):
+    """Schreibt gepuffert in <datei>.part (während des Renderns sichtbar) und benennt erst nach
+    vollständigem Schreiben atomar um - abgebrochene Läufe hinterlassen keine halben Dateien"""
+    part_file = output_file.with_name(output_file.name + '.part')
+    try:
+        with open(part_file, 'w', encoding='utf-8', newline=newline, buffering=1024 * 1024) as f:
+            yield f
+        os.replace(part_file, output_file)
+    except BaseException:
+        try:
+            part_file.unlink()
+        except OSError:
+            pass
+        raise
+
+def write_lines(output_file: Path, lines):
+    """Streamt Zeilen (Generator) in eine Datei, ohne sie vorher im Speicher zu sammeln"""
+    with atomic_output(output_file) as f:
+        first = True
+        for line in lines:
+            if not first:
+                f.write('\n')
+            f.write(line)
+            first = False
+
+def kruse_txt_lines(blocks, audio_file: Path, config: dict):
+    """Zeilen der Kruse-TXT (Generator)"""
+    yield "=" * 80
+    yield f"Transkript: {audio_file.name}"
+    yield f"Datum: {datetime.now().strftime('%d.%m.%Y')}"
+    yield f"Format: Kruse-Notation (OpenAI Whisper + Pyannote)"
+    yield "=" * 80
+    yield ""
 
-        for i, line in enumerate(lines):
+    # Legende
+    yield "LEGENDE:"
+    for speaker_id, label in config['speakers'].items():
+        if speaker_id != 'default':
+            yield f"  {label}: {speaker_id}"
+    yield ""
+    yield "SYMBOLE:"
+    for symbol_name, symbol in config['symbols'].items():
+        yield f"  {symbol}: {symbol_name.replace('_', ' ').title()}"
+    yield ""
+    yield "=" * 80
+    yield ""
+
+    # Transkript
+    line_number = 1
+    with_timestamp = config['format'].get('timestamps_each_block', True)
+
+    for index, block in enumerate(blocks):
+        # Leerzeile nach dem vorherigen Block
+        if index > 0:
+            yield ""
+
+        # Pause vor neuem Sprecher
+        if block['pause_before']:
+            yield f"{line_number:3d}     {block['pause_before']}"
+            line_number += 1
+            yield ""
+
+        # Schreibe Block
+        for i, line in enumerate(block['lines']):
             if i == 0:
-                if config['format'].get('timestamps_each_block', True):
-                    txt_lines.append(f"{line_number:3d} [{timestamp}] {map_speaker(current_speaker, config)}: {line}")
+                if with_timestamp:
+                    yield f"{line_number:3d} [{block['timestamp']}] {block['label']}: {line}"
                 else:
-                    txt_lines.append(f"{line_number:3d} {map_speaker(current_speaker, config)}: {line}")
+                    yield f"{line_number:3d} {block['label']}: {line}"
             else:
-                txt_lines.append(f"{line_number:3d}     {line}")
+                yield f"{line_number:3d}     {line}"
             line_number += 1
 
-    # In Datei schreiben
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(txt_lines))
+def generate_kruse_txt(segments: List[dict], audio_file: Path, output_file: Path, config: dict,
+                       blocks: Optional[List[dict]] = None):
+    """Generiert Kruse-Format TXT"""
+    if blocks is None:
+        blocks = iter_transcript_blocks(segments, config)
 
-    print_colored(f"💾 Kruse-TXT gespeichert: {output_file}", Colors.OKGREEN)
+    write_lines(output_file, kruse_txt_lines(blocks, audio_file, config))
 
-def generate_markdown(segments: List[dict], audio_file: Path, output_file: Path, config: dict):
-    """Generiert Markdown-Format"""
+    print_colored(f"💾 Kruse-TXT gespeichert: {output_file}", Colors.OKGREEN)
 
-    md_lines = []
-    md_lines.append(f"# Transkript: {audio_file.name}")
-    md_lines.append("")
-    md_lines.append(f"**Datum:** {datetime.now().strftime('%d.%m.%Y')}")
-    md_lines.append(f"**Format:** Kruse-Notation (Whisper + Pyannote)")
-    md_lines.append("")
+def markdown_lines(blocks, audio_file: Path, config: dict):
+    """Zeilen des Markdown-Transkripts (Generator)"""
+    yield f"# Transkript: {audio_file.name}"
+    yield ""
+    yield f"**Datum:** {datetime.now().strftime('%d.%m.%Y')}"
+    yield f"**Format:** Kruse-Notation (Whisper + Pyannote)"
+    yield ""
 
     # Legende
-    md_lines.append("## Legende")
-    md_lines.append("")
+    yield "## Legende"
+    yield ""
     for speaker_id, label in config['speakers'].items():
         if speaker_id != 'default':
-            md_lines.append(f"- **{label}**: {speaker_id}")
-    md_lines.append("")
+            yield f"- **{label}**: {speaker_id}"
+    yield ""
 
     # Symbole
-    md_lines.append("## Symbole")
-    md_lines.append("")
+    yield "## Symbole"
+    yield ""
     for symbol_name, symbol in config['symbols'].items():
-        md_lines.append(f"- `{symbol}`: {symbol_name.replace('_', ' ').title()}")
-    md_lines.append("")
+        yield f"- `{symbol}`: {symbol_name.replace('_', ' ').title()}"
+    yield ""
 
     # Transkript
-    md_lines.append("---")
-    md_lines.append("")
-    md_lines.append("## Transkript")
-    md_lines.append("")
-
-    prev_end = 0
-    current_speaker = None
-
-    for segment in segments:
-        start = segment.get('start', 0)
-        end = segment.get('end', 0)
-        text = segment.get('text', '').strip()
-        speaker = segment.get('speaker', 'UNKNOWN')
-
-        speaker_label = map_speaker(speaker, config)
-        timestamp = format_time_kruse(start, config['format'].get('timestamp_format', 'MM:SS'))
-
-        # Pause erkennen
-        pause = detect_pause(prev_end, start, config)
+    yield "---"
+    yield ""
+    yield "## Transkript"
+    yield ""
 
+    for block in blocks:
         # Neuer Sprecher
-        if speaker != current_speaker:
-            if pause:
-                md_lines.append(f"*{pause}*")
-                md_lines.append("")
-            md_lines.append(f"**[{timestamp}] {speaker_label}:** {text}")
-            current_speaker = speaker
-        else:
-            if pause:
-                md_lines.append(f"*{pause}* {text}")
+        if block['pause_before']:
+            yield f"*{block['pause_before']}*"
+            yield ""
+        first, rest = block['entries'][0], block['entries'][1:]
+        yield f"**[{block['timestamp']}] {block['label']}:** {first['text']}"
+
+        for entry in rest:
+            if entry['pause']:
+                yield f"*{entry['pause']}* {entry['text']}"
             else:
-                md_lines.append(text)
+                yield entry['text']
 
-        prev_end = end
+def generate_markdown(segments: List[dict], audio_file: Path, output_file: Path, config: dict,
+                      blocks: Optional[List[dict]] = None):
+    """Generiert Markdown-Format"""
+    if blocks is None:
+        blocks = iter_transcript_blocks(segments, config)
 
-    # Schreibe Datei
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(md_lines))
+    write_lines(output_file, markdown_lines(blocks, audio_file, config))
 
     print_colored(f"💾 Markdown gespeichert: {output_file}", Colors.OKGREEN)
 
-def generate_csv(segments: List[dict], audio_file: Path, output_file: Path, config: dict):
+def generate_csv(segments: List[dict], audio_file: Path, output_file: Path, config: dict,
+                 blocks: Optional[List[dict]] = None):
     """Generiert CSV-Format"""
     import csv
 
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+    if blocks is None:
+        blocks = iter_transcript_blocks(segments, config)
+
+    with atomic_output(output_file, newline='') as f:
         writer = csv.writer(f)
 
         # Header
@@ -496,169 +2703,619 @@ def generate_csv(segments: List[dict], audio_file: Path, output_file: Path, conf
         ])
 
         # Daten
-        for i, segment in enumerate(segments, 1):
-            start = segment.get('start', 0)
-            end = segment.get('end', 0)
-            text = segment.get('text', '').strip()
-            speaker = segment.get('speaker', 'UNKNOWN')
-
-            speaker_label = map_speaker(speaker, config)
-            timestamp = format_time_kruse(start, config['format'].get('timestamp_format', 'MM:SS'))
-            duration = end - start
-
-            writer.writerow([
-                i,
-                timestamp,
-                f"{start:.2f}",
-                f"{end:.2f}",
-                f"{duration:.2f}",
-                speaker,
-                speaker_label,
-                text
-            ])
+        i = 0
+        for block in blocks:
+            for entry in block['entries']:
+                i += 1
+                start = entry['start']
+                end = entry['end']
+
+                writer.writerow([
+                    i,
+                    entry['timestamp'],
+                    f"{start:.2f}",
+                    f"{end:.2f}",
+                    f"{end - start:.2f}",
+                    block['speaker'],
+                    block['label'],
+                    entry['text']
+                ])
 
     print_colored(f"💾 CSV gespeichert: {output_file}", Colors.OKGREEN)
 
-def generate_html(segments: List[dict], audio_file: Path, output_file: Path, config: dict):
-    """Generiert HTML-Format mit Styling"""
-
-    html_lines = []
-    html_lines.append("<!DOCTYPE html>")
-    html_lines.append("<html lang='de'>")
-    html_lines.append("<head>")
-    html_lines.append("    <meta charset='UTF-8'>")
-    html_lines.append("    <meta name='viewport' content='width=device-width, initial-scale=1.0'>")
-    html_lines.append(f"    <title>Transkript: {audio_file.name}</title>")
-    html_lines.append("    <style>")
-    html_lines.append("        body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; max-width: 900px; margin: 40px auto; padding: 20px; background: #f5f5f5; }")
-    html_lines.append("        .container { background: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }")
-    html_lines.append("        h1 { color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 10px; }")
-    html_lines.append("        .meta { color: #7f8c8d; font-size: 14px; margin: 10px 0; }")
-    html_lines.append("        .legend { background: #ecf0f1; padding: 15px; border-radius: 5px; margin: 20px 0; }")
-    html_lines.append("        .legend h2 { margin-top: 0; color: #34495e; font-size: 18px; }")
-    html_lines.append("        .legend ul { margin: 5px 0; }")
-    html_lines.append("        .transcript { margin-top: 30px; }")
-    html_lines.append("        .utterance { margin: 15px 0; padding: 15px; border-left: 4px solid #3498db; background: #f8f9fa; border-radius: 4px; }")
-    html_lines.append("        .speaker { font-weight: bold; color: #2980b9; }")
-    html_lines.append("        .timestamp { color: #95a5a6; font-size: 12px; margin-right: 10px; }")
-    html_lines.append("        .text { color: #2c3e50; line-height: 1.6; }")
-    html_lines.append("        .pause { color: #e74c3c; font-style: italic; font-size: 14px; }")
-    html_lines.append("        .speaker-0 { border-left-color: #3498db; }")
-    html_lines.append("        .speaker-1 { border-left-color: #2ecc71; }")
-    html_lines.append("        .speaker-2 { border-left-color: #e74c3c; }")
-    html_lines.append("        .speaker-3 { border-left-color: #f39c12; }")
-    html_lines.append("        .speaker-4 { border-left-color: #9b59b6; }")
-    html_lines.append("    </style>")
-    html_lines.append("</head>")
-    html_lines.append("<body>")
-    html_lines.append("    <div class='container'>")
-    html_lines.append(f"        <h1>🎙️ {audio_file.name}</h1>")
-    html_lines.append(f"        <div class='meta'>Datum: {datetime.now().strftime('%d.%m.%Y')}</div>")
-    html_lines.append(f"        <div class='meta'>Format: Kruse-Notation (Whisper + Pyannote)</div>")
+def html_lines(blocks, audio_file: Path, config: dict):
+    """Zeilen des HTML-Transkripts (Generator)"""
+    yield "<!DOCTYPE html>"
+    yield "<html lang='de'>"
+    yield "<head>"
+    yield "    <meta charset='UTF-8'>"
+    yield "    <meta name='viewport' content='width=device-width, initial-scale=1.0'>"
+    yield f"    <title>Transkript: {audio_file.name}</title>"
+    yield "    <style>"
+    yield "        body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; max-width: 900px; margin: 40px auto; padding: 20px; background: #f5f5f5; }"
+    yield "        .container { background: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }"
+    yield "        h1 { color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 10px; }"
+    yield "        .meta { color: #7f8c8d; font-size: 14px; margin: 10px 0; }"
+    yield "        .legend { background: #ecf0f1; padding: 15px; border-radius: 5px; margin: 20px 0; }"
+    yield "        .legend h2 { margin-top: 0; color: #34495e; font-size: 18px; }"
+    yield "        .legend ul { margin: 5px 0; }"
+    yield "        .transcript { margin-top: 30px; }"
+    yield "        .utterance { margin: 15px 0; padding: 15px; border-left: 4px solid #3498db; background: #f8f9fa; border-radius: 4px; }"
+    yield "        .speaker { font-weight: bold; color: #2980b9; }"
+    yield "        .timestamp { color: #95a5a6; font-size: 12px; margin-right: 10px; }"
+    yield "        .text { color: #2c3e50; line-height: 1.6; }"
+    yield "        .pause { color: #e74c3c; font-style: italic; font-size: 14px; }"
+    yield "        .speaker-0 { border-left-color: #3498db; }"
+    yield "        .speaker-1 { border-left-color: #2ecc71; }"
+    yield "        .speaker-2 { border-left-color: #e74c3c; }"
+    yield "        .speaker-3 { border-left-color: #f39c12; }"
+    yield "        .speaker-4 { border-left-color: #9b59b6; }"
+    yield "    </style>"
+    yield "</head>"
+    yield "<body>"
+    yield "    <div class='container'>"
+    yield f"        <h1>🎙️ {audio_file.name}</h1>"
+    yield f"        <div class='meta'>Datum: {datetime.now().strftime('%d.%m.%Y')}</div>"
+    yield f"        <div class='meta'>Format: Kruse-Notation (Whisper + Pyannote)</div>"
 
     # Legende
-    html_lines.append("        <div class='legend'>")
-    html_lines.append("            <h2>Legende</h2>")
-    html_lines.append("            <ul>")
+    yield "        <div class='legend'>"
+    yield "            <h2>Legende</h2>"
+    yield "            <ul>"
     for speaker_id, label in config['speakers'].items():
         if speaker_id != 'default':
-            html_lines.append(f"                <li><strong>{label}:</strong> {speaker_id}</li>")
-    html_lines.append("            </ul>")
+            yield f"                <li><strong>{label}:</strong> {speaker_id}</li>"
+    yield "            </ul>"
 
-    html_lines.append("            <h2>Symbole</h2>")
-    html_lines.append("            <ul>")
+    yield "            <h2>Symbole</h2>"
+    yield "            <ul>"
     for symbol_name, symbol in config['symbols'].items():
-        html_lines.append(f"                <li><code>{symbol}</code>: {symbol_name.replace('_', ' ').title()}</li>")
-    html_lines.append("            </ul>")
-    html_lines.append("        </div>")
+        yield f"                <li><code>{symbol}</code>: {symbol_name.replace('_', ' ').title()}</li>"
+    yield "            </ul>"
+    yield "        </div>"
 
     # Transkript
-    html_lines.append("        <div class='transcript'>")
+    yield "        <div class='transcript'>"
+
+    for block in blocks:
+        # Pause vor neuem Sprecher
+        if block['pause_before']:
+            yield f"            <div class='pause'>{block['pause_before']}</div>"
+
+        items = []
+        for entry in block['entries']:
+            if entry['pause']:
+                items.append(f"<span class='pause'>{entry['pause']}</span>")
+            items.append(entry['text'])
+
+        yield f"            <div class='utterance speaker-{block['color']}'>"
+        yield f"                <span class='timestamp'>[{block['timestamp']}]</span>"
+        yield f"                <span class='speaker'>{block['label']}:</span>"
+        yield f"                <div class='text'>{' '.join(items)}</div>"
+        yield "            </div>"
+
+    yield "        </div>"
+    yield "    </div>"
+    yield "</body>"
+    yield "</html>"
+
+def generate_html(segments: List[dict], audio_file: Path, output_file: Path, config: dict,
+                  blocks: Optional[List[dict]] = None):
+    """Generiert HTML-Format mit Styling"""
+    if blocks is None:
+        blocks = iter_transcript_blocks(segments, config)
 
-    prev_end = 0
-    current_speaker = None
-    current_block = []
-    current_start = None
-    speaker_colors = {}
-    color_index = 0
+    write_lines(output_file, html_lines(blocks, audio_file, config))
 
-    for segment in segments:
-        start = segment.get('start', 0)
-        end = segment.get('end', 0)
-        text = segment.get('text', '').strip()
-        speaker = segment.get('speaker', 'UNKNOWN')
+    print_colored(f"💾 HTML gespeichert: {output_file}", Colors.OKGREEN)
+
+# Ausgabeformate und Dateinamen
+OUTPUT_FORMATS = ['txt', 'md', 'csv', 'html']
+OUTPUT_SUFFIX = "_whisper_kruse"
+SEGMENTS_SUFFIX = f"{OUTPUT_SUFFIX}.segments.json"
+
+FORMAT_GENERATORS = {
+    'txt': generate_kruse_txt,
+    'md': generate_markdown,
+    'csv': generate_csv,
+    'html': generate_html,
+}
+
+def resolve_formats(formats: List[str]) -> List[str]:
+    """Löst 'all' auf und entfernt Duplikate"""
+    if 'all' in formats:
+        return list(OUTPUT_FORMATS)
+    return list(dict.fromkeys(formats))
+
+def resolve_config_path(config: str) -> Path:
+    """Config relativ zum Skript-Ordner (absolute Pfade bleiben unverändert)"""
+    return Path(__file__).parent / config
+
+def save_segments(segments: List[dict], audio_file: Path, output_folder: Path) -> Path:
+    """Speichert die kombinierten Segmente als Zwischenformat für den render-Modus"""
+    segments_file = output_folder / f"{audio_file.stem}{SEGMENTS_SUFFIX}"
+    tmp_file = segments_file.with_suffix('.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({'audio_file': audio_file.name, 'segments': segments}, f, ensure_ascii=False)
+    os.replace(tmp_file, segments_file)
+    return segments_file
+
+def write_outputs(segments: List[dict], audio_file: Path, output_folder: Path,
+                  output_formats: List[str], config: dict):
+    """Schreibt alle gewählten Ausgabeformate für eine Datei (eine gemeinsame Analyse für alle Formate)"""
+    # Ein Format: Blöcke direkt streamen, mehrere: Analyse einmal im Speicher teilen
+    blocks = build_transcript_blocks(segments, config) if len(output_formats) > 1 else None
+    for fmt in output_formats:
+        output_file = output_folder / f"{audio_file.stem}{OUTPUT_SUFFIX}.{fmt}"
+        FORMAT_GENERATORS[fmt](segments, audio_file, output_file, config, blocks=blocks)
+
+def render_segments_file(segments_file: Path, output_folder: Path, output_formats: List[str], config: dict):
+    """Erzeugt die Ausgabeformate einer Datei aus ihrem gespeicherten Segment-File"""
+    with open(segments_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    write_outputs(data['segments'], Path(data['audio_file']), output_folder, output_formats, config)
+    return len(data['segments'])
+
+def render_main(argv: List[str]):
+    """Unterbefehl 'render': Formate aus gespeicherten Segmenten neu erzeugen (ohne ASR/Diarization)"""
+    parser = argparse.ArgumentParser(
+        prog="whisper_kruse_diarization.py render",
+        description="Erzeugt Ausgabeformate aus gespeicherten Segmenten neu (ohne Transkription/Diarization)",
+        epilog="Beispiel:\n"
+               "  python whisper_kruse_diarization.py render ./audio/transcripts_whisper_kruse --formats all",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('input_folder', type=str,
+                       help=f'Ordner mit *{SEGMENTS_SUFFIX} (oder Audio-Ordner mit transcripts_whisper_kruse/)')
+    parser.add_argument('-o', '--output', type=str, default=None,
+                       help='Output-Ordner (Standard: Ordner der Segment-Dateien)')
+    parser.add_argument('--config', type=str, default='kruse_config.yaml',
+                       help='Kruse-Konfigurations-Datei')
+    parser.add_argument('--formats', type=str, nargs='+', default=['txt'],
+                       choices=OUTPUT_FORMATS + ['all'],
+                       help='Ausgabe-Formate (txt, md, csv, html, all) [Standard: txt]')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                       help='Parallele Prozesse [Standard: Anzahl CPU-Kerne]')
+    args = parser.parse_args(argv)
 
-        speaker_label = map_speaker(speaker, config)
-        timestamp = format_time_kruse(start, config['format'].get('timestamp_format', 'MM:SS'))
+    output_formats = resolve_formats(args.formats)
+    segments_folder = Path(args.input_folder)
+    if (segments_folder / "transcripts_whisper_kruse").is_dir():
+        segments_folder = segments_folder / "transcripts_whisper_kruse"
 
-        # Pause erkennen
-        pause = detect_pause(prev_end, start, config)
+    config_path = resolve_config_path(args.config)
+    if not config_path.exists():
+        print_colored(f"❌ Kruse-Config nicht gefunden: {config_path}", Colors.FAIL)
+        sys.exit(1)
+    kruse_config = load_kruse_config(config_path)
 
-        # Speaker-Farbe zuweisen
-        if speaker not in speaker_colors:
-            speaker_colors[speaker] = color_index % 5
-            color_index += 1
+    segments_files = sorted(segments_folder.glob(f"*{SEGMENTS_SUFFIX}"))
+    if not segments_files:
+        print_colored(f"❌ Keine Segment-Dateien (*{SEGMENTS_SUFFIX}) gefunden in: {segments_folder}", Colors.FAIL)
+        sys.exit(1)
 
-        # Neuer Sprecher
-        if speaker != current_speaker:
-            # Vorherigen Block schreiben
-            if current_block:
-                block_text = ' '.join(current_block)
-                ts = format_time_kruse(current_start, config['format'].get('timestamp_format', 'MM:SS'))
-                prev_label = map_speaker(current_speaker, config)
-                color_class = f"speaker-{speaker_colors[current_speaker]}"
-                html_lines.append(f"            <div class='utterance {color_class}'>")
-                html_lines.append(f"                <span class='timestamp'>[{ts}]</span>")
-                html_lines.append(f"                <span class='speaker'>{prev_label}:</span>")
-                html_lines.append(f"                <div class='text'>{block_text}</div>")
-                html_lines.append("            </div>")
-
-            # Pause vor neuem Sprecher
-            if pause:
-                html_lines.append(f"            <div class='pause'>{pause}</div>")
-
-            # Neuen Block starten
-            current_speaker = speaker
-            current_start = start
-            current_block = [text]
-        else:
-            # Im gleichen Sprecher
-            if pause:
-                current_block.append(f"<span class='pause'>{pause}</span>")
-            current_block.append(text)
+    output_folder = Path(args.output) if args.output else segments_folder
+    output_folder.mkdir(parents=True, exist_ok=True)
 
-        prev_end = end
+    print_colored(f"🖨️  Render: {len(segments_files)} Dateien → {', '.join(output_formats)} "
+                  f"({args.workers} Prozesse)", Colors.HEADER)
 
-    # Letzten Block schreiben
-    if current_block:
-        block_text = ' '.join(current_block)
-        ts = format_time_kruse(current_start, config['format'].get('timestamp_format', 'MM:SS'))
-        speaker_label = map_speaker(current_speaker, config)
-        color_class = f"speaker-{speaker_colors[current_speaker]}"
-        html_lines.append(f"            <div class='utterance {color_class}'>")
-        html_lines.append(f"                <span class='timestamp'>[{ts}]</span>")
-        html_lines.append(f"                <span class='speaker'>{speaker_label}:</span>")
-        html_lines.append(f"                <div class='text'>{block_text}</div>")
-        html_lines.append("            </div>")
-
-    html_lines.append("        </div>")
-    html_lines.append("    </div>")
-    html_lines.append("</body>")
-    html_lines.append("</html>")
-
-    # Schreibe Datei
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(html_lines))
+    start = time.time()
+    failed = 0
 
-    print_colored(f"💾 HTML gespeichert: {output_file}", Colors.OKGREEN)
+    # Ausgabe pro Datei puffern, damit parallele Prozesse sich nicht vermischen
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        jobs = [executor.submit(run_stage, render_segments_file, segments_file, output_folder,
+                                output_formats, kruse_config)
+                for segments_file in segments_files]
+        for segments_file, job in zip(segments_files, jobs):
+            stage = job.result()
+            try:
+                stage.replay()
+            except Exception as e:
+                print_colored(f"❌ {segments_file.name}: {e}", Colors.FAIL)
+                failed += 1
+
+    print_colored(f"✅ {len(segments_files) - failed}/{len(segments_files)} Dateien in "
+                  f"{time.time() - start:.1f}s gerendert", Colors.OKGREEN)
+    if failed:
+        sys.exit(1)
+
+# Audio-Optimierung (Unterbefehl 'preprocess')
+AUDIO_EXTENSIONS = ['.wav', '.mp3', '.m4a', '.flac']
+OPTIMIZED_SUFFIX = "_optimized.wav"
+PREPROCESS_INDEX = "interviewforge_preprocess.json"
+
+def optimize_audio_file(audio_file: Path, output_file: Path, filter_chain: str):
+    """Schreibt eine optimierte 16 kHz Mono-WAV (erst .part, dann atomar umbenennen)"""
+    part_file = output_file.with_name(output_file.name + '.part')
+    try:
+        subprocess.run(
+            ['ffmpeg', '-nostdin', '-hide_banner', '-loglevel', 'error', '-y', '-i', str(audio_file),
+             '-ar', str(SAMPLE_RATE), '-ac', '1', '-af', filter_chain,
+             '-threads', '1',  # Parallelität kommt über die Dateien, nicht pro ffmpeg
+             '-f', 'wav', str(part_file)],
+            capture_output=True, text=True, check=True
+        )
+        os.replace(part_file, output_file)
+    except BaseException:
+        try:
+            part_file.unlink()
+        except OSError:
+            pass
+        raise
+
+def preprocess_audio_file(audio_file: Path, filter_chain: str, previous: Optional[dict], force: bool = False,
+                          loudness: Optional[LoudnessCache] = None) -> dict:
+    """Optimiert eine Datei, falls Inhalt, Filter oder loudnorm-Modus sich seit dem letzten Lauf geändert haben"""
+    output_file = audio_file.with_name(audio_file.stem + OPTIMIZED_SUFFIX)
+    input_hash = hash_audio_file(audio_file)
+    loudnorm_mode = 'two-pass' if loudness else 'dynamic'
+
+    if (not force and previous and output_file.exists()
+            and previous.get('input_hash') == input_hash
+            and previous.get('filter') == filter_chain
+            and previous.get('loudnorm', 'dynamic') == loudnorm_mode
+            and previous.get('output_size') == output_file.stat().st_size):
+        return {'status': 'skipped', 'output': output_file.name, **previous}
+
+    start = time.time()
+    encode_chain, analysis = loudness.resolve(audio_file, filter_chain) if loudness else (filter_chain, None)
+    optimize_audio_file(audio_file, output_file, encode_chain)
+    elapsed = time.time() - start
+
+    # 16 kHz, 16 Bit, Mono: 32000 Bytes pro Sekunde (abzüglich WAV-Header)
+    output_size = output_file.stat().st_size
+    duration = max(0, output_size - 44) / (SAMPLE_RATE * 2)
+
+    return {
+        'status': 'done',
+        'output': output_file.name,
+        'input_hash': input_hash,
+        'filter': filter_chain,
+        'loudnorm': loudnorm_mode,
+        'output_size': output_size,
+        'duration': duration,
+        'elapsed': elapsed,
+        'analysis': analysis
+    }
+
+def preprocess_main(argv: List[str]):
+    """Unterbefehl 'preprocess': Audio-Ordner parallel optimieren (16 kHz Mono + Filterkette)"""
+    parser = argparse.ArgumentParser(
+        prog="whisper_kruse_diarization.py preprocess",
+        description="Optimiert alle Audio-Dateien eines Ordners parallel zu *_optimized.wav "
+                    "(übersprungen wird nach Inhalts-Hash, nicht nach Dateiname)",
+        epilog="Beispiel:\n"
+               "  python whisper_kruse_diarization.py preprocess ./audio --workers 8",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('input_folder', type=str, help='Ordner mit Audio-Dateien')
+    parser.add_argument('--filter', type=str, default=DEFAULT_FILTER_CHAIN,
+                       help=f'FFmpeg-Filterkette [Standard: {DEFAULT_FILTER_CHAIN}]')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                       help='Parallele FFmpeg-Prozesse [Standard: Anzahl CPU-Kerne]')
+    parser.add_argument('--loudnorm', choices=LOUDNORM_MODES, default='dynamic',
+                       help='Lautheitsnormalisierung: dynamic (ein Durchgang) oder two-pass '
+                            f'(Messung wird pro Datei-Hash in {LOUDNESS_CACHE_DIR}/ gespeichert) [Standard: dynamic]')
+    parser.add_argument('--force', action='store_true',
+                       help='Alle Dateien neu optimieren')
+    args = parser.parse_args(argv)
+
+    input_folder = Path(args.input_folder)
+    if not input_folder.is_dir():
+        print_colored(f"❌ Ordner nicht gefunden: {input_folder}", Colors.FAIL)
+        sys.exit(1)
+
+    audio_files = sorted(
+        f for f in input_folder.iterdir()
+        if f.suffix.lower() in AUDIO_EXTENSIONS and not f.name.endswith(OPTIMIZED_SUFFIX)
+    )
+    if not audio_files:
+        print_colored(f"❌ Keine Audio-Dateien gefunden!", Colors.FAIL)
+        sys.exit(1)
+
+    # Index: welche Ausgabe aus welchem Input-Inhalt mit welchem Filter entstanden ist
+    index_file = input_folder / PREPROCESS_INDEX
+    index = {}
+    if index_file.exists():
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+
+    def save_index():
+        tmp_file = index_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, index_file)
+
+    loudness = LoudnessCache(input_folder / LOUDNESS_CACHE_DIR) if args.loudnorm == 'two-pass' else None
+
+    workers = max(1, args.workers)
+    print_colored(f"🎚️  Audio-Optimierung: {len(audio_files)} Dateien, {workers} parallel, "
+                  f"loudnorm {args.loudnorm}", Colors.HEADER)
+
+    start = time.time()
+    optimized = skipped = failed = 0
+    total_audio = 0.0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        jobs = {
+            executor.submit(preprocess_audio_file, audio_file, args.filter,
+                            index.get(audio_file.name), args.force, loudness): audio_file
+            for audio_file in audio_files
+        }
+        try:
+            # Ausgabe aus dem Haupt-Thread, sobald eine Datei fertig ist
+            for job in as_completed(jobs):
+                audio_file = jobs[job]
+                try:
+                    result = job.result()
+                except subprocess.CalledProcessError as e:
+                    print_colored(f"❌ {audio_file.name}: {(e.stderr or '').strip() or e}", Colors.FAIL)
+                    failed += 1
+                    continue
+                except Exception as e:
+                    print_colored(f"❌ {audio_file.name}: {e}", Colors.FAIL)
+                    failed += 1
+                    continue
+
+                status = result.pop('status')
+                if status == 'skipped':
+                    print_colored(f"⏭️  Unverändert: {audio_file.name}", Colors.WARNING)
+                    skipped += 1
+                    continue
+
+                rtf = result['elapsed'] / result['duration'] if result['duration'] else 0.0
+                analysis = {'cached': ', Messung aus Cache', 'measured': ', Messung gespeichert'}.get(
+                    result['analysis'], '')
+                print_colored(f"✅ {audio_file.name} → {result['output']}: {result['duration']:.0f}s Audio "
+                              f"in {result['elapsed']:.1f}s (RTF {rtf:.3f}, "
+                              f"{1 / rtf if rtf else 0:.0f}x Echtzeit{analysis})", Colors.OKGREEN)
+                total_audio += result['duration']
+                optimized += 1
+
+                del result['elapsed'], result['analysis']
+                index[audio_file.name] = result
+                save_index()
+        except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    elapsed = time.time() - start
+    print_colored(f"📊 Optimiert: {optimized}, unverändert: {skipped}, Fehler: {failed} "
+                  f"({total_audio / 60:.1f} min Audio in {elapsed:.1f}s"
+                  f"{f', {total_audio / elapsed:.0f}x Echtzeit' if elapsed and total_audio else ''})", Colors.OKBLUE)
+    if failed:
+        sys.exit(1)
+
+def calibration_clip(duration_s: float, seed: int = 0):
+    """Synthetischer Dialog für autotune, falls kein echter Clip angegeben ist: zwei 'Stimmen'
+    (harmonische Töne mit 120 bzw. 210 Hz Grundfrequenz und Silbenrhythmus) wechseln sich ab"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration_s * SAMPLE_RATE)) / SAMPLE_RATE
+    turn = (t // 4.0).astype(int) % 2
+    f0 = np.where(turn == 0, 120.0, 210.0) * (1 + 0.05 * np.sin(2 * np.pi * 0.7 * t))
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    voice = sum(np.sin(k * phase) / k for k in range(1, 11))
+    syllables = np.clip(np.sin(2 * np.pi * 4.0 * t), 0, None)
+    pause = (t % 4.0) > 3.5
+    audio = np.where(pause, 0.0, voice * syllables) * 0.1 + rng.standard_normal(len(t)) * 0.002
+    return audio.astype(np.float32)
+
+def autotune_main(argv: List[str]):
+    """Unterbefehl 'autotune': Pyannote-Batch-Größen und Thread-Zahl auf diesem Host kalibrieren"""
+    parser = argparse.ArgumentParser(
+        prog="whisper_kruse_diarization.py autotune",
+        description="Misst Pyannote mit verschiedenen Batch-Größen und Thread-Zahlen auf einem kurzen Clip "
+                    f"und speichert die schnellste Kombination im Host-Profil ({HOST_PROFILE_FILE}); "
+                    "spätere Läufe nutzen sie automatisch, solange Config und CLI nichts anderes vorgeben",
+        epilog="Beispiel:\n"
+               "  python whisper_kruse_diarization.py autotune ./audio/interview01.wav --duration 60",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('clip', type=str, nargs='?', default=None,
+                       help='Kalibrier-Clip mit Sprache (Standard: synthetischer Dialog)')
+    parser.add_argument('--duration', type=float, default=60.0,
+                       help='Verwendete Länge des Clips in Sekunden [Standard: 60]')
+    parser.add_argument('--threads', type=int, nargs='+', default=None,
+                       help='Zu messende Thread-Zahlen [Standard: 1, 2, 4, ... bis alle Kerne]')
+    parser.add_argument('--segmentation-batch-sizes', type=int, nargs='+', default=[1, 4, 8, 16, 32],
+                       help='Zu messende Batch-Größen der Segmentierung')
+    parser.add_argument('--embedding-batch-sizes', type=int, nargs='+', default=[1, 4, 8, 16, 32],
+                       help='Zu messende Batch-Größen der Embeddings')
+    parser.add_argument('--device', type=str, default='auto', choices=DEVICES,
+                       help='Gerät, für das kalibriert wird [Standard: auto]')
+    parser.add_argument('--hf-token', type=str, default=None,
+                       help='HuggingFace Token (oder HF_TOKEN env)')
+    parser.add_argument('--profile', type=str, default=str(HOST_PROFILE_FILE),
+                       help=f'Profil-Datei [Standard: {HOST_PROFILE_FILE}]')
+    args = parser.parse_args(argv)
+
+    cores = available_cores()
+    thread_counts = args.threads
+    if not thread_counts:
+        thread_counts = [n for n in (1, 2, 4, 8, 16, 32, 64, 128) if n < len(cores)] + [len(cores)]
+    # Größte Thread-Zahl vor dem Import von torch festlegen, danach nur noch herunterregeln
+    configure_threads(max(thread_counts))
+
+    if args.clip:
+        audio = decode_audio(Path(args.clip), None)[:int(args.duration * SAMPLE_RATE)]
+        clip_name = Path(args.clip).name
+    else:
+        print_colored("⚠️  Kein Clip angegeben - synthetischer Dialog; ein echter Interview-Ausschnitt "
+                      "liefert verlässlichere Werte", Colors.WARNING)
+        audio = calibration_clip(args.duration)
+        clip_name = 'synthetisch'
+    clip_s = len(audio) / SAMPLE_RATE
+
+    import torch
+
+    engine = DiarizationEngine(args.hf_token or os.getenv('HF_TOKEN'), device=resolve_device(args.device))
+    pipeline = engine.load()
+    clip_input = {'waveform': torch.from_numpy(audio).unsqueeze(0), 'sample_rate': SAMPLE_RATE}
+
+    print_colored(f"📐 Autotune: {clip_s:.0f}s Clip ({clip_name}), Gerät {engine.device}, "
+                  f"Threads {thread_counts}", Colors.HEADER)
+    pipeline(clip_input)  # Aufwärmen
+
+    timings = {}
+
+    def measure(threads: int, segmentation: int, embedding: int) -> float:
+        key = (threads, segmentation, embedding)
+        if key not in timings:
+            configure_threads(threads)
+            engine.set_batch_sizes(segmentation, embedding)
+            start = time.perf_counter()
+            pipeline(clip_input)
+            timings[key] = time.perf_counter() - start
+            print_colored(f"   {threads:>3} Threads, Segmentierung {segmentation:>3}, Embeddings {embedding:>3}: "
+                          f"{timings[key]:6.2f}s (RTF {timings[key] / clip_s:.3f})", Colors.OKCYAN)
+        return timings[key]
+
+    # Koordinatensuche pro Thread-Zahl: erst Segmentierung, dann Embeddings mit der besten Segmentierung
+    default_embedding = getattr(pipeline, 'embedding_batch_size', None) or max(args.embedding_batch_sizes)
+    for threads in thread_counts:
+        segmentation = min(args.segmentation_batch_sizes, key=lambda size: measure(threads, size, default_embedding))
+        for embedding in args.embedding_batch_sizes:
+            measure(threads, segmentation, embedding)
+
+    (threads, segmentation, embedding), elapsed = min(timings.items(), key=lambda item: item[1])
+    profile = {
+        'threads': threads,
+        'segmentation_batch_size': segmentation,
+        'embedding_batch_size': embedding,
+        'model': engine.model_name,
+        'device': engine.device,
+        'rtf': round(elapsed / clip_s, 4),
+        'clip': clip_name,
+        'tuned': datetime.now().isoformat(timespec='seconds')
+    }
+    store_host_profile(engine.device, profile, Path(args.profile))
+
+    slowest = max(timings.values())
+    print_colored(f"✅ Schnellste Kombination: {threads} Threads, Segmentierung {segmentation}, "
+                  f"Embeddings {embedding} – {elapsed:.2f}s (RTF {elapsed / clip_s:.3f}, "
+                  f"{slowest / elapsed:.1f}x schneller als die langsamste)", Colors.OKGREEN)
+    print_colored(f"💾 Host-Profil gespeichert: {args.profile} ({host_key(args.device)})", Colors.OKGREEN)
+
+def prefetch_main(argv: List[str]):
+    """Unterbefehl 'prefetch': Whisper- und Pyannote-Modelle in den Modell-Ordner laden und prüfsummieren"""
+    parser = argparse.ArgumentParser(
+        prog="whisper_kruse_diarization.py prefetch",
+        description="Lädt alle benötigten Modelle (Whisper, faster-whisper, Pyannote inkl. Segmentierung "
+                    f"und Embeddings) in einen lokalen Modell-Ordner und schreibt Prüfsummen ({MODEL_MANIFEST}); "
+                    "danach startet die Transkription mit --offline ohne Netzwerk",
+        epilog="Beispiele:\n"
+               "  python whisper_kruse_diarization.py prefetch --model-size base medium --backend whisper faster-whisper\n"
+               "  python whisper_kruse_diarization.py prefetch --model-dir /srv/models --verify",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--model-dir', type=str, default=None,
+                       help=f'Modell-Ordner (Standard: models.dir der Config bzw. {DEFAULT_MODEL_DIR})')
+    parser.add_argument('--config', type=str, default='kruse_config.yaml',
+                       help='Kruse-Konfigurations-Datei (Abschnitt models:)')
+    parser.add_argument('--model-size', type=str, nargs='+', default=['base'], choices=WHISPER_SIZES,
+                       help='Whisper-Modellgrößen [Standard: base]')
+    parser.add_argument('--backend', type=str, nargs='+', default=['whisper'], choices=LOCAL_BACKENDS,
+                       help='Lokale Backends, für die geladen wird [Standard: whisper]')
+    parser.add_argument('--diarization-model', type=str, default=PYANNOTE_MODEL,
+                       help=f'Pyannote-Pipeline [Standard: {PYANNOTE_MODEL}]')
+    parser.add_argument('--no-diarization', action='store_true',
+                       help='Pyannote nicht laden')
+    parser.add_argument('--hf-token', type=str, default=None,
+                       help='HuggingFace Token (oder HF_TOKEN env)')
+    parser.add_argument('--verify', action='store_true',
+                       help='Nichts laden, nur alle Prüfsummen des Modell-Ordners nachrechnen')
+    args = parser.parse_args(argv)
+
+    config_path = resolve_config_path(args.config)
+    config = load_kruse_config(config_path) if config_path.exists() else {}
+    model_dir = Path(args.model_dir or resolve_models(config)['dir'] or DEFAULT_MODEL_DIR)
+
+    if args.verify:
+        manifest = load_model_manifest(model_dir)
+        problems = check_model_dir(model_dir, [], verify=True)
+        if problems:
+            for problem in problems:
+                print_colored(f"❌ {problem}", Colors.FAIL)
+            sys.exit(1)
+        print_colored(f"✅ {len(manifest['files'])} Dateien geprüft ({model_dir}): "
+                      + ", ".join(f"{kind} {', '.join(names)}" for kind, names in manifest['models'].items()),
+                      Colors.OKGREEN)
+        return
+
+    model_dir.mkdir(parents=True, exist_ok=True)
+    configure_model_dir(model_dir)
+    print_colored(f"📦 Modell-Ordner: {model_dir}", Colors.HEADER)
+
+    fetched = {}
+    failed = 0
+
+    def fetch(kind: str, name: str, load):
+        nonlocal failed
+        start = time.time()
+        try:
+            load()
+        except Exception as e:
+            print_colored(f"❌ {kind} '{name}': {e}", Colors.FAIL)
+            failed += 1
+            return
+        fetched.setdefault(kind, []).append(name)
+        print_colored(f"✅ {kind} '{name}' bereit ({time.time() - start:.1f}s)", Colors.OKGREEN)
+
+    for size in args.model_size:
+        if 'whisper' in args.backend:
+            # Lädt und prüft die SHA-256 des Checkpoints (whisper bricht bei Abweichung ab)
+            fetch('whisper', size, lambda: WhisperModelSession(size, 'cpu', model_dir / 'whisper').load())
+        if 'faster-whisper' in args.backend:
+            from faster_whisper import download_model
+
+            fetch('faster-whisper', size,
+                  lambda: download_model(size, cache_dir=str(model_dir / 'faster-whisper')))
+    if not args.no_diarization:
+        # Die Pipeline zieht beim Laden auch ihre Segmentierungs- und Embedding-Modelle nach
+        engine = DiarizationEngine(args.hf_token or os.getenv('HF_TOKEN'), args.diarization_model, device='cpu')
+        fetch('pyannote', args.diarization_model, engine.load)
+
+    print_colored("🔐 Berechne Prüfsummen...", Colors.OKCYAN)
+    manifest = write_model_manifest(model_dir, fetched)
+    size_mb = sum(entry['size'] for entry in manifest['files'].values()) / 1024 ** 2
+    print_colored(f"💾 {len(manifest['files'])} Dateien ({size_mb:.0f} MB), Prüfsummen in "
+                  f"{model_dir / MODEL_MANIFEST}", Colors.OKGREEN)
+    print_colored(f"   Offline starten: python whisper_kruse_diarization.py ./audio --offline "
+                  f"--model-dir {model_dir}", Colors.OKBLUE)
+    if failed:
+        sys.exit(1)
+
+# Unterbefehle, die vor dem Standard-Aufruf (Transkription) abgefangen werden
+SUBCOMMANDS = {
+    'render': render_main,
+    'preprocess': preprocess_main,
+    'autotune': autotune_main,
+    'prefetch': prefetch_main,
+}
+
+def main(argv: Optional[List[str]] = None, worker: Optional[FarmWorker] = None):
+    # Unterbefehl? (z.B. "render") - sonst Standard: Transkription eines Audio-Ordners
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
 
-def main():
     parser = argparse.ArgumentParser(
         description="Whisper (API/Lokal) + Pyannote Diarization + Kruse Format",
         epilog="Beispiele:\n"
                "  API-Modus:   python whisper_kruse_diarization.py ./audio --mode api\n"
                "  Lokal-Modus: python whisper_kruse_diarization.py ./audio --mode local --model-size medium\n"
-               "  Auto-Modus:  python whisper_kruse_diarization.py ./audio --mode auto",
+               "  Auto-Modus:  python whisper_kruse_diarization.py ./audio --mode auto\n"
+               "  Neu rendern: python whisper_kruse_diarization.py render ./audio --formats all\n"
+               "  Optimieren:  python whisper_kruse_diarization.py preprocess ./audio\n"
+               "  Kalibrieren: python whisper_kruse_diarization.py autotune ./audio/interview01.wav\n"
+               "  Modelle:     python whisper_kruse_diarization.py prefetch --model-size medium",
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
     parser.add_argument('input_folder', type=str, help='Ordner mit Audio-Dateien')
@@ -674,15 +3331,20 @@ def main():
                        help='Sprache (Standard: de)')
 
     # Whisper-Modus
-    parser.add_argument('--mode', type=str, default='auto', choices=['api', 'local', 'auto'],
-                       help='Whisper-Modus: api (OpenAI API), local (lokal), auto (automatisch) [Standard: auto]')
-    parser.add_argument('--model-size', type=str, default='base',
-                       choices=['tiny', 'base', 'small', 'medium', 'large', 'large-v2', 'large-v3'],
+    parser.add_argument('--mode', type=str, default='auto', choices=['api', 'local', 'faster-whisper', 'auto'],
+                       help='Whisper-Modus: api (OpenAI API), local (lokal), faster-whisper '
+                            '(= local --backend faster-whisper), auto (automatisch) [Standard: auto]')
+    parser.add_argument('--backend', type=str, default='whisper', choices=LOCAL_BACKENDS,
+                       help='Backend für lokales Whisper: whisper (openai-whisper, PyTorch) oder '
+                            'faster-whisper (CTranslate2, quantisiert) [Standard: whisper]')
+    parser.add_argument('--model-size', type=str, default='base', choices=WHISPER_SIZES,
                        help='Modellgröße für lokales Whisper [Standard: base]')
+    parser.add_argument('--compute-type', type=str, default='int8', choices=FasterWhisperBackend.COMPUTE_TYPES,
+                       help='Rechengenauigkeit für faster-whisper [Standard: int8]')
 
     # Output-Formate
     parser.add_argument('--formats', type=str, nargs='+', default=['txt'],
-                       choices=['txt', 'md', 'csv', 'html', 'all'],
+                       choices=OUTPUT_FORMATS + ['all'],
                        help='Ausgabe-Formate (txt, md, csv, html, all) [Standard: txt]')
 
     # API Keys
@@ -691,18 +3353,109 @@ def main():
     parser.add_argument('--hf-token', type=str, default=None,
                        help='HuggingFace Token (oder HF_TOKEN env)')
 
-    args = parser.parse_args()
+    # Lange Dateien (API-Modus)
+    parser.add_argument('--chunk-minutes', type=float, default=10.0,
+                       help='Maximale Chunk-Länge für Dateien über 25 MB (API-Modus) [Standard: 10]')
+    parser.add_argument('--chunk-overlap', type=float, default=2.0,
+                       help='Überlappung in Sekunden, wenn keine Stille zum Schneiden gefunden wird [Standard: 2]')
+    parser.add_argument('--chunk-workers', type=int, default=4,
+                       help='Parallele API-Uploads pro Datei [Standard: 4]')
+
+    # Vorverarbeitung
+    parser.add_argument('--preprocess', action='store_true',
+                       help='Audio im Prozess dekodieren und filtern (16 kHz Mono, ersetzt _optimized.wav); '
+                            'Whisper (lokal) und Pyannote nutzen denselben Puffer')
+    parser.add_argument('--preprocess-filter', type=str, default=DEFAULT_FILTER_CHAIN,
+                       help=f'FFmpeg-Filterkette für --preprocess [Standard: {DEFAULT_FILTER_CHAIN}]')
+    parser.add_argument('--decode-workers', type=int, default=2,
+                       help='Parallel dekodierte Dateien für --preprocess [Standard: 2]')
+    parser.add_argument('--loudnorm', choices=LOUDNORM_MODES, default='dynamic',
+                       help='Lautheitsnormalisierung für --preprocess: dynamic oder two-pass '
+                            '(Messung wird pro Datei-Hash zwischengespeichert) [Standard: dynamic]')
+
+    # VAD-Vorschnitt
+    parser.add_argument('--vad', action='store_true',
+                       help='Längere Stille vor Whisper und Pyannote herausschneiden '
+                            '(Zeitstempel werden auf das Original zurückgerechnet)')
+    parser.add_argument('--vad-noise', type=float, default=-35.0,
+                       help='Pegel in dB, unter dem Audio als Stille gilt [Standard: -35]')
+    parser.add_argument('--vad-min-silence', type=float, default=2.0,
+                       help='Minimale Stille in Sekunden, die herausgeschnitten wird [Standard: 2]')
+    parser.add_argument('--vad-padding', type=float, default=0.3,
+                       help='Rand in Sekunden, der an jeder Schnittkante erhalten bleibt [Standard: 0.3]')
+
+    # Diarization zuerst (nur lokal)
+    parser.add_argument('--diarization-first', action='store_true',
+                       help='Erst diarisieren, dann jedes Sprecher-Fenster einzeln mit lokalem Whisper '
+                            'transkribieren (Sprecherzuordnung ohne Überlappungssuche)')
+    parser.add_argument('--turn-window', type=float, default=30.0,
+                       help='Maximale Fensterlänge in Sekunden für --diarization-first [Standard: 30]')
+    parser.add_argument('--turn-gap', type=float, default=1.0,
+                       help='Maximale Lücke in Sekunden, über die Turns desselben Sprechers '
+                            'zusammengefasst werden [Standard: 1]')
+    parser.add_argument('--diarization-window', type=float, default=0.0,
+                       help='Lange Aufnahmen fensterweise diarisieren: Fensterlänge in Minuten, Sprecher werden '
+                            'über Embeddings zusammengeführt (0 = ganze Datei auf einmal) [Standard: 0]')
+    parser.add_argument('--diarization-overlap', type=float, default=30.0,
+                       help='Überlappung der Diarization-Fenster in Sekunden [Standard: 30]')
+    parser.add_argument('--whisper-batch', type=int, default=1,
+                       help='Lokales Whisper: 30-s-Fenster pro Forward-Pass, gebündelt über mehrere kurze '
+                            'Dateien bzw. Sprecher-Fenster [Standard: 1 = Datei für Datei]')
+
+    # Performance (überschreibt den Abschnitt 'performance:' der Config)
+    parser.add_argument('--device', type=str, default=None, choices=DEVICES,
+                       help='Gerät für lokales Whisper und Pyannote [Standard: auto]')
+    parser.add_argument('--threads', type=int, default=None,
+                       help='CPU-Threads für Whisper/Pyannote/faster-whisper (0 = alle Kerne des eigenen Anteils)')
+    parser.add_argument('--interop-threads', type=int, default=None,
+                       help='Inter-op-Threads von torch [Standard: 1]')
+    parser.add_argument('--instances', type=int, default=None,
+                       help='Gleichzeitige Instanzen auf diesem Host; die Kerne werden aufgeteilt [Standard: 1]')
+    parser.add_argument('--pin-cores', action='store_true', default=None,
+                       help='Prozess an die zugeteilten Kerne binden (Linux)')
+    parser.add_argument('--segmentation-batch-size', type=int, default=None,
+                       help='Batch-Größe der Pyannote-Segmentierung (Standard: Host-Profil bzw. Pipeline)')
+    parser.add_argument('--embedding-batch-size', type=int, default=None,
+                       help='Batch-Größe der Pyannote-Embeddings (Standard: Host-Profil bzw. Pipeline)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Lokaler Modus: Worker-Prozesse mit je eigenen Modellen und eigenem Anteil der Kerne, '
+                            'die sich Dateien aus einer gemeinsamen Queue holen [Standard: 1]')
+
+    # Modelle (überschreibt den Abschnitt 'models:' der Config)
+    parser.add_argument('--model-dir', type=str, default=None,
+                       help='Modell-Ordner für Whisper und Pyannote, befüllt mit "prefetch" '
+                            '(Standard: Caches von whisper/Hugging Face)')
+    parser.add_argument('--offline', action='store_true', default=None,
+                       help=f'Modelle nur aus dem Modell-Ordner laden, keine Hub-Anfragen '
+                            f'(Standard-Ordner: {DEFAULT_MODEL_DIR})')
+
+    # Cache
+    parser.add_argument('--cache-dir', type=str, default=None,
+                       help='Cache-Ordner für Transkripte und Diarization (Standard: ~/.cache/interviewforge)')
+    parser.add_argument('--cache-size', type=float, default=500.0,
+                       help='Maximale Cache-Größe in MB, älteste Einträge werden verdrängt [Standard: 500]')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Cache weder lesen noch schreiben')
+    parser.add_argument('--refresh', action='store_true',
+                       help='Cache ignorieren, neu berechnen und Cache überschreiben')
+
+    # Performance
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                       help='Parallele API-Transkriptionen über mehrere Dateien (API-Modus) [Standard: 1]')
+    parser.add_argument('--overlap', type=str, default='auto', choices=['auto', 'on', 'off'],
+                       help='Transkription und Diarization gleichzeitig ausführen: '
+                            'auto (nur API-Modus), on, off [Standard: auto]')
+    parser.add_argument('--warmup', action='store_true',
+                       help='Pyannote-Pipeline vor der ersten Datei mit kurzer Stille aufwärmen')
+
+    args = parser.parse_args(argv)
 
     # Format-Liste verarbeiten
-    if 'all' in args.formats:
-        output_formats = ['txt', 'md', 'csv', 'html']
-    else:
-        output_formats = list(set(args.formats))  # Duplikate entfernen
+    output_formats = resolve_formats(args.formats)
 
     # Paths
     input_folder = Path(args.input_folder)
-    script_dir = Path(__file__).parent
-    config_path = script_dir / args.config
+    config_path = resolve_config_path(args.config)
 
     if not input_folder.exists():
         print_colored(f"❌ Ordner nicht gefunden: {input_folder}", Colors.FAIL)
@@ -715,6 +3468,43 @@ def main():
     # Load config
     kruse_config = load_kruse_config(config_path)
 
+    # CPU-Threads und Geräte (vor dem ersten Import von torch)
+    performance = resolve_performance(kruse_config, {
+        'device': args.device, 'threads': args.threads, 'interop_threads': args.interop_threads,
+        'instances': args.instances, 'pin_cores': args.pin_cores,
+        'segmentation_batch_size': args.segmentation_batch_size, 'embedding_batch_size': args.embedding_batch_size
+    })
+    cores = worker.cores if worker else available_cores()
+    if worker and worker.threads:
+        performance['threads'] = worker.threads  # Anteil dieses Workers an --threads
+    coordinator = None
+    if performance['instances'] > 1 and not worker:
+        # Mehrere Instanzen auf einem Host: jede bekommt ihren Anteil der Kerne
+        coordinator = CoreCoordinator(performance['instances'])
+        try:
+            coordinator.claim()
+        except TimeoutError as e:
+            print_colored(f"❌ Kern-Aufteilung mit anderen Instanzen nicht möglich: {e}", Colors.FAIL)
+            sys.exit(1)
+        cores = coordinator.cores()
+        if coordinator.instances != performance['instances']:
+            print_colored(f"⚠️  Laufende Instanzen teilen den Host in {coordinator.instances} Slots - "
+                          f"diese Aufteilung wird übernommen", Colors.WARNING)
+    threads = performance['threads'] or len(cores)
+    configure_threads(threads, performance['interop_threads'], cores, performance['pin_cores'])
+    # Kalibrierte Werte aus 'autotune' für alles, was Config und CLI offen lassen (das Profil gilt
+    # für das aufgelöste Gerät; bei 'auto' wird dafür torch geladen, daher erst nach configure_threads)
+    profiled = apply_host_profile(performance, load_host_profile(performance['device']), len(cores))
+    if 'threads' in profiled:
+        threads = performance['threads']
+        configure_threads(threads, performance['interop_threads'], cores, performance['pin_cores'])
+    device = resolve_device(performance['device'])
+
+    # Modell-Ordner und Offline-Betrieb (vor dem ersten Import von huggingface_hub/pyannote)
+    models = resolve_models(kruse_config, {'dir': args.model_dir, 'offline': args.offline})
+    model_dir = Path(models['dir']).expanduser() if models['dir'] else None
+    configure_model_dir(model_dir, models['offline'])
+
     # Output folder
     if args.output:
         output_folder = Path(args.output)
@@ -727,6 +3517,9 @@ def main():
     whisper_mode = args.mode
     api_key = args.api_key or os.getenv('OPENAI_API_KEY')
 
+    if whisper_mode == 'faster-whisper':
+        whisper_mode, args.backend = 'local', 'faster-whisper'
+
     # Auto-Modus: Entscheide basierend auf API-Key
     if whisper_mode == 'auto':
         if api_key:
@@ -742,21 +3535,66 @@ def main():
         print_colored("   Setze OPENAI_API_KEY oder nutze --mode local", Colors.WARNING)
         sys.exit(1)
 
+    backend_class = OpenAIBackend if whisper_mode == 'api' else \
+        FasterWhisperBackend if args.backend == 'faster-whisper' else WhisperBackend
+    if args.diarization_first and not issubclass(backend_class, WindowedASRBackend):
+        # Nicht erst mitten im Lauf scheitern
+        print_colored(f"❌ --diarization-first braucht ein Backend mit Sprecher-Fenstern - "
+                      f"'{backend_class.name}' unterstützt das nicht", Colors.FAIL)
+        print_colored("   Nutze --mode local oder lasse --diarization-first weg", Colors.WARNING)
+        sys.exit(1)
+
+    if args.workers > 1 and whisper_mode != 'local':
+        print_colored("⚠️  --workers gilt nur für lokale Modelle - im API-Modus --jobs nutzen", Colors.WARNING)
+        args.workers = 1
+    farm = args.workers > 1 and not worker
+
+    if models['offline'] and not worker:
+        # Fehlende Modelle sofort melden statt erst bei der ersten Datei (ohne Netz kein Nachladen)
+        required = [('pyannote', PYANNOTE_MODEL)]
+        if whisper_mode == 'local':
+            required.append((args.backend, args.model_size))
+        problems = check_model_dir(model_dir, required)
+        if problems:
+            print_colored(f"❌ Offline-Modus: Modell-Ordner {model_dir} unvollständig", Colors.FAIL)
+            for problem in problems[:10]:
+                print_colored(f"   {problem}", Colors.FAIL)
+            models_hint = f" --model-size {args.model_size} --backend {args.backend}" if whisper_mode == 'local' else ''
+            print_colored(f"   Vorher mit Netz: python whisper_kruse_diarization.py prefetch --model-dir {model_dir}"
+                          f"{models_hint}", Colors.WARNING)
+            sys.exit(1)
+
     hf_token = args.hf_token or os.getenv('HF_TOKEN')
-    if not hf_token:
+    if not hf_token and not worker and not models['offline']:
         print_colored("⚠️  Kein HuggingFace Token - Pyannote braucht evtl. einen", Colors.WARNING)
 
-    # OpenAI Client (nur für API-Modus)
-    client = None
+    # ASR-Backend - lokale Modelle werden einmal pro Lauf geladen
     if whisper_mode == 'api':
-        client = OpenAI(api_key=api_key)
+        from openai import OpenAI
+
+        # Retries übernimmt call_with_retry (Backoff + Retry-After)
+        asr_backend = OpenAIBackend(OpenAI(api_key=api_key, max_retries=0), args.language, DEFAULT_PROMPT,
+                                    args.chunk_minutes * 60, args.chunk_overlap, args.chunk_workers)
+    elif args.backend == 'faster-whisper':
+        asr_backend = FasterWhisperBackend(args.model_size, args.language, device=device,
+                                           compute_type=args.compute_type, cpu_threads=threads,
+                                           batch_size=args.whisper_batch, model_dir=model_dir,
+                                           offline=models['offline'])
+    else:
+        asr_backend = WhisperBackend(args.model_size, args.language, device=device, batch_size=args.whisper_batch,
+                                     model_dir=model_dir)
+
+    # Pyannote-Pipeline - wird einmal pro Lauf geladen und an jede Datei übergeben
+    diarization_engine = DiarizationEngine(hf_token, device=device,
+                                           segmentation_batch_size=performance['segmentation_batch_size'],
+                                           embedding_batch_size=performance['embedding_batch_size'])
 
     # Find files
     if args.pattern:
         audio_files = sorted(input_folder.glob(args.pattern))
     else:
         audio_files = []
-        for ext in ['.wav', '.mp3', '.m4a', '.flac']:
+        for ext in AUDIO_EXTENSIONS:
             audio_files.extend(input_folder.glob(f"*{ext}"))
         audio_files = sorted(set(audio_files))
 
@@ -764,83 +3602,511 @@ def main():
         print_colored(f"❌ Keine Audio-Dateien gefunden!", Colors.FAIL)
         sys.exit(1)
 
+    # Worker-Prozesse: Kerne dieser Instanz werden aufgeteilt, jeder Worker lädt eigene Modelle
+    partitions = plan_core_partitions(cores, min(args.workers, len(audio_files))) if farm else None
+    # Explizite --threads gelten für die ganze Instanz und werden wie die Kerne aufgeteilt;
+    # Profil-Threads wendet jeder Worker selbst auf seinen Anteil an
+    worker_threads = plan_worker_threads(0 if 'threads' in profiled else performance['threads'],
+                                         partitions) if farm else None
+
     # Header
-    print_colored(f"\n{'='*70}", Colors.HEADER)
-    if whisper_mode == 'api':
-        print_colored(f"🎙️ Whisper (API) + Pyannote + Kruse", Colors.HEADER)
-    else:
-        print_colored(f"🎙️ Whisper (Lokal: {args.model_size}) + Pyannote + Kruse", Colors.HEADER)
-    print_colored(f"{'='*70}", Colors.HEADER)
-    print_colored(f"📁 Input:  {input_folder}", Colors.OKBLUE)
-    print_colored(f"📁 Output: {output_folder}", Colors.OKBLUE)
-    print_colored(f"📊 Dateien: {len(audio_files)}", Colors.OKBLUE)
-    print_colored(f"🔧 Modus: {whisper_mode.upper()}", Colors.OKBLUE)
-    print_colored(f"{'='*70}\n", Colors.HEADER)
+    if not worker:
+        print_colored(f"\n{'='*70}", Colors.HEADER)
+        if whisper_mode == 'api':
+            print_colored(f"🎙️ Whisper (API) + Pyannote + Kruse", Colors.HEADER)
+        else:
+            print_colored(f"🎙️ Whisper (Lokal: {args.model_size}, {args.backend}) + Pyannote + Kruse", Colors.HEADER)
+        print_colored(f"{'='*70}", Colors.HEADER)
+        print_colored(f"📁 Input:  {input_folder}", Colors.OKBLUE)
+        print_colored(f"📁 Output: {output_folder}", Colors.OKBLUE)
+        print_colored(f"📊 Dateien: {len(audio_files)}", Colors.OKBLUE)
+        print_colored(f"🔧 Modus: {whisper_mode.upper()}", Colors.OKBLUE)
+        if farm:
+            # Profil-Threads gelten höchstens bis zum Anteil eines Workers
+            per_worker = worker_threads[-1] or len(partitions[-1])
+            if 'threads' in profiled:
+                per_worker = min(performance['threads'], len(partitions[-1]))
+            if worker_threads[0] > per_worker:
+                per_worker = f"{per_worker}-{worker_threads[0]}"
+            print_colored(f"🧵 CPU: {len(partitions)} Worker auf {len(cores)} Kernen, je "
+                          f"{per_worker} Threads"
+                          f"{f', Instanz {coordinator.slot + 1}/{coordinator.instances}' if coordinator else ''}"
+                          f"{', Kerne gebunden' if performance['pin_cores'] else ''}"
+                          f", Gerät {performance['device']}", Colors.OKBLUE)
+        else:
+            print_colored(f"🧵 CPU: {threads} Threads"
+                          f"{f', Instanz {coordinator.slot + 1}/{coordinator.instances}' if coordinator else ''}"
+                          f"{f', gebunden an Kerne {cores[0]}-{cores[-1]}' if performance['pin_cores'] else ''}"
+                          f", Gerät {performance['device']}", Colors.OKBLUE)
+        if performance['segmentation_batch_size'] or performance['embedding_batch_size']:
+            print_colored(f"🧩 Pyannote-Batch: Segmentierung {performance['segmentation_batch_size'] or 'Standard'}, "
+                          f"Embeddings {performance['embedding_batch_size'] or 'Standard'}", Colors.OKBLUE)
+        if profiled:
+            print_colored(f"📐 Host-Profil ({HOST_PROFILE_FILE}): {', '.join(profiled)}", Colors.OKBLUE)
+        if model_dir:
+            print_colored(f"📦 Modelle: {model_dir}{' (offline)' if models['offline'] else ''}", Colors.OKBLUE)
+        print_colored(f"{'='*70}\n", Colors.HEADER)
+
+    # Cache für Rohergebnisse (Whisper-Segmente, Pyannote-Sprecherwechsel)
+    cache_dir = Path(args.cache_dir) if args.cache_dir else Path.home() / ".cache" / "interviewforge"
+    cache = ResultCache(cache_dir, args.cache_size, enabled=not args.no_cache, refresh=args.refresh)
+
+    # Checkpoint-Manifest: was mit gleichem Input und gleichen Parametern fertig ist, wird übersprungen
+    manifest = RunManifest(output_folder, refresh=args.refresh)
+    with open(config_path, 'rb') as f:
+        config_hash = hashlib.sha256(f.read()).hexdigest()
+
+    # Vorverarbeitung im Prozess: ein Dekodiervorgang pro Datei für Whisper und Pyannote
+    audio_store = None
+    preprocess = args.preprocess_filter if args.preprocess else None
+    if args.preprocess:
+        loudness = None
+        if args.loudnorm == 'two-pass':
+            loudness = LoudnessCache(input_folder / LOUDNESS_CACHE_DIR)
+            preprocess = f"{args.preprocess_filter} (two-pass)"
+        # Vorausdekodiert wird erst nach der Planung (plan) - fertige Dateien werden nie dekodiert;
+        # Worker bekommen Dateien einzeln aus der Queue
+        audio_store = PreprocessedAudioStore([], args.preprocess_filter, args.decode_workers, loudness)
+
+    vad_params = None
+    if args.vad:
+        vad_params = {'noise_db': args.vad_noise, 'min_silence': args.vad_min_silence,
+                      'padding': args.vad_padding}
+
+    diarization_params = {'model': diarization_engine.model_name, 'num_speakers': args.speakers,
+                          'preprocess': preprocess, 'vad': vad_params}
+    window_options = {}
+    if args.diarization_window > 0:
+        # Fensterweise Diarization: Speicher begrenzt durch die Fenstergröße
+        window_options = {'window_s': args.diarization_window * 60,
+                          'overlap_s': min(args.diarization_overlap, args.diarization_window * 30)}
+        diarization_params['window'] = {'window': window_options['window_s'], 'overlap': window_options['overlap_s']}
+
+    asr_params = {
+        **asr_backend.cache_params(),
+        # Die API bekommt die Originaldatei - außer mit --vad, dann den (ggf. vorverarbeiteten) Sprach-Puffer
+        'preprocess': preprocess if asr_backend.local or vad_params else None,
+        'vad': vad_params
+    }
+    if args.diarization_first:
+        # Fenster hängen vom Diarization-Ergebnis ab
+        asr_params['turn_windows'] = {'diarization': diarization_params, 'max_window': args.turn_window,
+                                      'max_gap': args.turn_gap}
+    elif asr_backend.local and args.whisper_batch > 1:
+        # Gebündelte Fenster-Dekodierung liefert andere Segmente als model.transcribe
+        asr_params['batched'] = True
+    merge_params = {'asr': asr_params, 'diarization': diarization_params}
+    render_params = {'merge': merge_params, 'config': config_hash}
+
+    def pending_formats(audio_file: Path) -> List[str]:
+        """Formate, die für diese Datei noch (neu) erzeugt werden müssen"""
+        if not manifest.has_file(audio_file):
+            # Ältere Läufe ohne Manifest: vorhandene Dateien gelten als fertig
+            return [fmt for fmt in output_formats
+                    if not (output_folder / f"{audio_file.stem}{OUTPUT_SUFFIX}.{fmt}").exists()]
+        return [fmt for fmt in output_formats
+                if not manifest.is_done(audio_file, f"render:{fmt}", render_params,
+                                        output_folder / f"{audio_file.stem}{OUTPUT_SUFFIX}.{fmt}")]
+
+    def merged_segments(audio_file: Path) -> Optional[List[dict]]:
+        """Bereits kombinierte Segmente aus einem früheren Lauf"""
+        segments_file = output_folder / f"{audio_file.stem}{SEGMENTS_SUFFIX}"
+        if not manifest.is_done(audio_file, 'merge', merge_params, segments_file):
+            return None
+        with open(segments_file, 'r', encoding='utf-8') as f:
+            return json.load(f)['segments']
+
+    def needs_audio(audio_file: Path) -> bool:
+        """Ob für die Datei noch ASR oder Diarization rechnen muss (sonst wird sie nicht dekodiert)"""
+        if not pending_formats(audio_file) or merged_segments(audio_file) is not None:
+            return False
+        return any(manifest.load(audio_file, stage, params) is None and cache.load(stage, audio_file, params) is None
+                   for stage, params in (('asr', asr_params), ('diarization', diarization_params)))
+
+    # Sprachbereiche pro Datei: einmal berechnen, von ASR und Diarization gemeinsam genutzt
+    speech_maps = {}
+    speech_maps_lock = threading.Lock()
+
+    def speech_map_for(audio_file: Path) -> SpeechMap:
+        with speech_maps_lock:
+            if audio_file in speech_maps:
+                return speech_maps[audio_file]
+
+            cached = cache.load('vad', audio_file, vad_params)
+            if cached is not None:
+                speech_map = SpeechMap.from_dict(cached)
+            else:
+                speech_map = detect_speech_regions(audio_file, args.vad_noise, args.vad_min_silence,
+                                                   args.vad_padding)
+                cache.store('vad', audio_file, vad_params, speech_map.to_dict())
+
+            print_colored(f"🔇 VAD: {speech_map.skipped_fraction:.0%} Stille übersprungen "
+                          f"({speech_map.speech_duration / 60:.1f} von {speech_map.duration / 60:.1f} min, "
+                          f"{len(speech_map.regions)} Sprachbereiche)", Colors.OKCYAN)
+            speech_maps[audio_file] = speech_map
+            return speech_map
+
+    def speech_audio(audio_file: Path, speech_map: SpeechMap):
+        """Nur die Sprachbereiche als 16 kHz Mono-Puffer (vorverarbeitet, falls --preprocess)"""
+        audio = audio_store.get(audio_file) if audio_store else decode_audio(audio_file, None)
+        return speech_map.trim_buffer(audio)
+
+    def transcribe_speech(audio_file: Path, speech_map: SpeechMap):
+        """Transkribiert nur die Sprachbereiche und rechnet die Zeitstempel auf das Original zurück"""
+        if not speech_map.regions:
+            return TranscriptResult([])
+
+        transcript = asr_backend.transcribe(audio_file, speech_audio(audio_file, speech_map))
+        if not transcript:
+            return transcript
+        return TranscriptResult(speech_map.map_segments(transcript_to_segments(transcript)))
+
+    # Stufen-Executor: API-Transkription (I/O-gebunden) und lokale Diarization überlappen sich,
+    # die Ausgabe wird pro Stufe gepuffert und in Dateireihenfolge ausgegeben
+    def transcribe(audio_file: Path, diarization: Optional[dict] = None):
+        checkpoint = manifest.load(audio_file, 'asr', asr_params)
+        if checkpoint is not None:
+            print_colored(f"♻️  Transkript aus Checkpoint: {audio_file.name}", Colors.OKGREEN)
+            return TranscriptResult(checkpoint['segments'])
+
+        cached = cache.load('asr', audio_file, asr_params)
+        if cached is not None:
+            print_colored(f"♻️  Transkript aus Cache: {audio_file.name}", Colors.OKGREEN)
+            manifest.complete(audio_file, 'asr', asr_params, cached)
+            return TranscriptResult(cached['segments'])
+
+        if diarization is not None:
+            # Die Turns decken nur Sprache ab, daher ohne VAD-Schnitt auf dem vollen Puffer
+            windows = plan_turn_windows(diarization['segments'], min(args.turn_window, WHISPER_WINDOW_S),
+                                        args.turn_gap)
+            audio = audio_store.get(audio_file) if audio_store else None
+            transcript = asr_backend.transcribe_windows(audio_file, audio, windows)
+        elif batched_whisper:
+            transcript = batched_whisper.transcribe(audio_file)
+            if vad_params:
+                transcript = TranscriptResult(
+                    speech_map_for(audio_file).map_segments(transcript_to_segments(transcript)))
+        elif vad_params:
+            transcript = transcribe_speech(audio_file, speech_map_for(audio_file))
+        else:
+            audio = audio_store.get(audio_file) if audio_store and asr_backend.local else None
+            transcript = asr_backend.transcribe(audio_file, audio)
+
+        if transcript:
+            result = {'segments': transcript_to_segments(transcript)}
+            cache.store('asr', audio_file, asr_params, result)
+            manifest.complete(audio_file, 'asr', asr_params, result)
+        return transcript
+
+    def diarize(audio_file: Path):
+        checkpoint = manifest.load(audio_file, 'diarization', diarization_params)
+        if checkpoint is not None:
+            print_colored(f"♻️  Diarization aus Checkpoint: {audio_file.name}", Colors.OKGREEN)
+            return checkpoint
+
+        cached = cache.load('diarization', audio_file, diarization_params)
+        if cached is not None:
+            print_colored(f"♻️  Diarization aus Cache: {audio_file.name}", Colors.OKGREEN)
+            manifest.complete(audio_file, 'diarization', diarization_params, cached)
+            return cached
+
+        if vad_params:
+            speech_map = speech_map_for(audio_file)
+            diarization = {'segments': []}
+            if speech_map.regions:
+                diarization = diarize_with_pyannote(audio_file, args.speakers, engine=diarization_engine,
+                                                    audio=speech_audio(audio_file, speech_map), **window_options)
+                if diarization:
+                    diarization = {'segments': speech_map.map_segments(diarization['segments'])}
+        else:
+            audio = audio_store.get(audio_file) if audio_store else None
+            diarization = diarize_with_pyannote(audio_file, args.speakers, engine=diarization_engine, audio=audio,
+                                                **window_options)
+        if diarization:
+            cache.store('diarization', audio_file, diarization_params, diarization)
+            manifest.complete(audio_file, 'diarization', diarization_params, diarization)
+        return diarization
+
+    overlap = args.overlap == 'on' or (args.overlap == 'auto' and not asr_backend.local)
+    asr_workers = max(1, args.jobs) if not asr_backend.local else 1
+    stages = StagedExecutor(transcribe, diarize, asr_workers=asr_workers, overlap=overlap,
+                            diarization_first=args.diarization_first)
+
+    # Zähler über alle Dateien (Worker melden ihre Werte pro Datei an den Hauptprozess)
+    totals = {'success': 0, 'failed': 0, 'asr': 0.0, 'diarization': 0.0, 'audio': 0.0, 'speech': 0.0}
+    batched_whisper = None
+
+    def process_files(files: List[Path], progress: bool = True):
+        """Plant und verarbeitet Dateien in Reihenfolge: ASR + Diarization, Merge, Formate"""
+        nonlocal batched_whisper
+
+        # Plan pro Datei: fertig, nur neu rendern, oder ASR + Diarization nötig
+        todo_formats = {}
+        resumed_segments = {}
+        submitted = []
+        for audio_file in files:
+            todo_formats[audio_file] = pending_formats(audio_file)
+            if not todo_formats[audio_file]:
+                continue
+            segments = merged_segments(audio_file)
+            if segments is not None:
+                resumed_segments[audio_file] = segments
+            else:
+                submitted.append(audio_file)
 
-    # Process files
-    success = 0
-    failed = 0
+        if audio_store:
+            audio_store.plan([audio_file for audio_file in submitted if needs_audio(audio_file)])
 
-    for i, audio_file in enumerate(audio_files, 1):
-        print_colored(f"\n[{i}/{len(audio_files)}] {audio_file.name}", Colors.BOLD)
+        # Gebündeltes lokales Whisper: Mel-Fenster der nächsten offenen Dateien gemeinsam dekodieren
+        if asr_params.get('batched') and isinstance(asr_backend, WhisperBackend):
+            def load_batch_audio(audio_file: Path):
+                if vad_params:
+                    return speech_audio(audio_file, speech_map_for(audio_file))
+                return audio_store.get(audio_file) if audio_store else decode_audio(audio_file, None)
 
-        output_txt = output_folder / f"{audio_file.stem}_whisper_kruse.txt"
-        if output_txt.exists():
-            print_colored(f"⏭️  Bereits vorhanden", Colors.WARNING)
-            continue
+            def needs_asr(audio_file: Path) -> bool:
+                return (manifest.load(audio_file, 'asr', asr_params) is None
+                        and cache.load('asr', audio_file, asr_params) is None)
 
-        try:
-            # 1. Whisper Transkription (API oder lokal)
-            if whisper_mode == 'api':
-                transcript = transcribe_with_openai(client, audio_file, args.language)
-            else:  # local
-                transcript = transcribe_with_local_whisper(audio_file, args.language, args.model_size)
+            batched_whisper = BatchedWhisper(asr_backend.session, submitted, load_batch_audio, args.language,
+                                             args.whisper_batch, needs_asr)
 
-            if not transcript:
-                failed += 1
-                continue
+        for audio_file in submitted:
+            stages.submit(audio_file)
 
-            # 2. Pyannote Diarization
-            diarization = diarize_with_pyannote(audio_file, args.speakers)
-            if not diarization:
-                failed += 1
-                continue
+        if stages.is_parallel and progress:
+            print_colored(f"⚡ Stufen überlappend: {asr_workers} ASR-Job(s), "
+                          f"Diarization {'parallel' if overlap else 'sequentiell'}", Colors.OKCYAN)
 
-            # 3. Merge
-            segments = merge_transcription_and_diarization(transcript, diarization)
-            print_colored(f"📊 {len(segments)} Segmente kombiniert", Colors.OKGREEN)
-
-            # 4. Generiere Output in gewählten Formaten
-            print_colored(f"📝 Generiere Formate: {', '.join(output_formats)}", Colors.OKCYAN)
-
-            for fmt in output_formats:
-                if fmt == 'txt':
-                    output_file = output_folder / f"{audio_file.stem}_whisper_kruse.txt"
-                    generate_kruse_txt(segments, audio_file, output_file, kruse_config)
-                elif fmt == 'md':
-                    output_file = output_folder / f"{audio_file.stem}_whisper_kruse.md"
-                    generate_markdown(segments, audio_file, output_file, kruse_config)
-                elif fmt == 'csv':
-                    output_file = output_folder / f"{audio_file.stem}_whisper_kruse.csv"
-                    generate_csv(segments, audio_file, output_file, kruse_config)
-                elif fmt == 'html':
-                    output_file = output_folder / f"{audio_file.stem}_whisper_kruse.html"
-                    generate_html(segments, audio_file, output_file, kruse_config)
-
-            success += 1
+        for i, audio_file in enumerate(files, 1):
+            if progress:
+                print_colored(f"\n[{i}/{len(files)}] {audio_file.name}", Colors.BOLD)
 
+            formats = todo_formats[audio_file]
+            if not formats:
+                print_colored(f"⏭️  Bereits vorhanden", Colors.WARNING)
+                continue
+
+            try:
+                if audio_file in resumed_segments:
+                    segments = resumed_segments.pop(audio_file)
+                    print_colored(f"♻️  {len(segments)} Segmente aus Checkpoint", Colors.OKGREEN)
+                else:
+                    # 1. Whisper Transkription (API oder lokal) + 2. Pyannote Diarization
+                    asr, diar = stages.result(audio_file)
+                    if audio_store:
+                        audio_store.discard(audio_file)
+                    asr.replay()
+                    transcript = asr.result
+
+                    if not transcript:
+                        totals['failed'] += 1
+                        continue
+
+                    diar.replay()
+                    diarization = diar.result
+                    if not diarization:
+                        totals['failed'] += 1
+                        continue
+
+                    # Laufzeit pro Stufe (Überlappung = gesparte Zeit)
+                    wall = max(asr.finished, diar.finished) - min(asr.started, diar.started)
+                    totals['asr'] += asr.elapsed
+                    totals['diarization'] += diar.elapsed
+                    print_colored(f"⏱️  Stufen: ASR {asr.elapsed:.1f}s, Diarization {diar.elapsed:.1f}s, "
+                                  f"gesamt {wall:.1f}s (Überlappung {asr.elapsed + diar.elapsed - wall:.1f}s)",
+                                  Colors.OKGREEN)
+
+                    # 3. Merge
+                    segments = merge_transcription_and_diarization(transcript, diarization)
+                    print_colored(f"📊 {len(segments)} Segmente kombiniert", Colors.OKGREEN)
+
+                    # Zwischenstand für den render-Modus sichern
+                    save_segments(segments, audio_file, output_folder)
+                    manifest.complete(audio_file, 'merge', merge_params)
+
+                    # Neue Segmente: alle gewählten Formate neu schreiben
+                    formats = output_formats
+
+                # 4. Generiere Output in gewählten Formaten
+                # (alle Formate in einem Aufruf, damit sie sich die Block-Analyse teilen)
+                print_colored(f"📝 Generiere Formate: {', '.join(formats)}", Colors.OKCYAN)
+                write_outputs(segments, audio_file, output_folder, formats, kruse_config)
+                for fmt in formats:
+                    manifest.complete(audio_file, f"render:{fmt}", render_params)
+
+                totals['success'] += 1
+
+            except Exception as e:
+                print_colored(f"❌ Fehler: {e}", Colors.FAIL)
+                totals['failed'] += 1
+
+        for audio_file in files:
+            speech_map = speech_maps.get(audio_file)
+            if speech_map:
+                totals['audio'] += speech_map.duration
+                totals['speech'] += speech_map.speech_duration
+
+    def load_models() -> str:
+        """Lädt ASR-Modell und Pyannote-Pipeline vorab; liefert die Ladezeiten für den Startbericht"""
+        timings = []
+        if asr_backend.local:
+            start = time.time()
+            asr_backend.load()
+            timings.append(f"Whisper {args.model_size} ({args.backend}) {time.time() - start:.1f}s")
+        start = time.time()
+        diarization_engine.load()
+        timings.append(f"Pyannote {time.time() - start:.1f}s")
+        source = f"{'offline aus ' if models['offline'] else ''}{model_dir}" if model_dir else "Hub-Cache"
+        return f"⏱️  Modelle geladen: {', '.join(timings)} ({source})"
+
+    def preload_models():
+        """Lädt die Modelle vor der ersten Datei, sofern noch etwas zu transkribieren ist -
+        Ladefehler beenden den Lauf sofort statt jede Datei einzeln scheitern zu lassen"""
+        if not any(pending_formats(f) and merged_segments(f) is None for f in audio_files):
+            return
+        try:
+            report = load_models()
         except Exception as e:
-            print_colored(f"❌ Fehler: {e}", Colors.FAIL)
-            failed += 1
+            print_colored(f"❌ Modelle nicht geladen: {e}", Colors.FAIL)
+            sys.exit(1)
+        print_colored(report, Colors.OKGREEN)
+
+        if args.warmup:
+            try:
+                diarization_engine.warmup()
+            except Exception as e:
+                print_colored(f"⚠️  Aufwärmen übersprungen: {e}", Colors.WARNING)
+
+    def serve_worker():
+        """Worker-Prozess: Modelle einmal laden, dann Dateien aus der Queue abarbeiten"""
+        with buffered_output() as lines:
+            try:
+                report = load_models()
+                if args.warmup:
+                    diarization_engine.warmup()
+            except Exception as e:
+                print_colored(f"❌ Worker {worker.slot + 1}: Modelle nicht geladen: {e}", Colors.FAIL)
+                worker.report('failed', lines)
+                return
+        # Nur die Ladezeiten an den Hauptprozess, nicht die einzelnen Lade-Meldungen
+        with buffered_output() as lines:
+            print_colored(f"   {report}", Colors.OKGREEN)
+        worker.report('ready', lines)
+
+        for audio_file, shared_handle in worker.files():
+            # Vom Hauptprozess vorverarbeitet: per Name an den Shared-Memory-Block anhängen (keine Kopie)
+            buffer = None
+            if shared_handle and audio_store:
+                try:
+                    buffer = SharedAudioBuffer.attach(shared_handle)
+                    audio_store.adopt(audio_file, buffer.array)
+                except OSError:
+                    buffer = None  # Block schon entfernt - selbst dekodieren
+
+            before = dict(totals)
+            with buffered_output() as lines:
+                try:
+                    process_files([audio_file], progress=False)
+                except Exception as e:
+                    print_colored(f"❌ Fehler: {e}", Colors.FAIL)
+                    totals['failed'] += 1
+            if buffer:
+                audio_store.discard(audio_file)
+                buffer.release()
+            worker.report('done', lines, audio_file, {key: totals[key] - before[key] for key in totals})
+
+    def run_farm() -> int:
+        """Hauptprozess: Dateien an die Worker verteilen, Ausgabe in Fertigstellungsreihenfolge;
+        liefert die Zahl nicht bearbeiteter Dateien"""
+        worker_argv = argv + ['--mode', 'local', '--backend', args.backend]
+        farm_workers = WorkerFarm(worker_argv, partitions, worker_threads)
+        print_colored(f"🧵 Starte {len(partitions)} Worker...", Colors.OKCYAN)
+
+        # --preprocess: der Hauptprozess dekodiert voraus und legt jeden Puffer einmal in Shared Memory,
+        # Whisper und Pyannote im Worker lesen denselben Block
+        shared = {}
+        needed = set()
+        if audio_store:
+            planned = [audio_file for audio_file in audio_files if needs_audio(audio_file)]
+            audio_store.plan(planned)
+            needed.update(planned)
+
+        def share_audio(audio_file: Path) -> Optional[tuple]:
+            # Fertige oder aus Checkpoint/Cache fortgesetzte Dateien nicht dekodieren
+            if not audio_store or audio_file not in needed:
+                return None
+            try:
+                shared[audio_file] = SharedAudioBuffer.create(audio_store.get(audio_file))
+            except Exception:
+                return None  # Der Worker dekodiert selbst und meldet den Fehler
+            finally:
+                audio_store.discard(audio_file)
+            return shared[audio_file].handle
+
+        def release_audio(audio_file: Path):
+            buffer = shared.pop(audio_file, None)
+            if buffer:
+                buffer.release()
+
+        done = 0
+        for kind, slot, lines, audio_file, worker_totals in farm_workers.run(audio_files, share_audio,
+                                                                             release_audio):
+            if kind == 'ready':
+                print_colored(f"🧵 Worker {slot + 1} bereit (Kerne {partitions[slot][0]}-{partitions[slot][-1]})",
+                              Colors.OKCYAN)
+            elif kind == 'done':
+                done += 1
+                print_colored(f"\n[{done}/{len(audio_files)}] {audio_file.name} (Worker {slot + 1})", Colors.BOLD)
+            for line in lines:
+                print(line)
+            for key, value in (worker_totals or {}).items():
+                totals[key] += value
+
+        skipped = farm_workers.skipped
+        if skipped:
+            print_colored(f"\n⏹️  {len(skipped)} Datei(en) nicht bearbeitet: "
+                          f"{', '.join(f.name for f in skipped[:5])}{' ...' if len(skipped) > 5 else ''}",
+                          Colors.WARNING)
+        return len(skipped)
+
+    # Process files
+    skipped = 0
+    batch_start = time.time()
+
+    try:
+        if worker:
+            serve_worker()
+            return
+        if farm:
+            skipped = run_farm()
+        else:
+            preload_models()
+            process_files(audio_files)
+    finally:
+        stages.shutdown()
+        if audio_store:
+            audio_store.shutdown()
+        if coordinator:
+            coordinator.release()
 
     # Summary
     print_colored(f"\n{'='*70}", Colors.HEADER)
     print_colored(f"✅ Fertig!", Colors.HEADER)
     print_colored(f"{'='*70}", Colors.HEADER)
     print(f"   Gesamt:  {len(audio_files)}")
-    print_colored(f"   ✅ Erfolg: {success}", Colors.OKGREEN)
-    print_colored(f"   ❌ Fehler: {failed}", Colors.FAIL)
+    print_colored(f"   ✅ Erfolg: {totals['success']}", Colors.OKGREEN)
+    print_colored(f"   ❌ Fehler: {totals['failed']}", Colors.FAIL)
+    if skipped:
+        print_colored(f"   ⏹️  Nicht bearbeitet: {skipped}", Colors.WARNING)
+    print(f"   ⏱️  ASR: {totals['asr']:.1f}s, Diarization: {totals['diarization']:.1f}s, "
+          f"Laufzeit: {time.time() - batch_start:.1f}s")
+    if totals['audio']:
+        print(f"   🔇 VAD: {1 - totals['speech'] / totals['audio']:.0%} Stille übersprungen "
+              f"({(totals['audio'] - totals['speech']) / 60:.1f} von {totals['audio'] / 60:.1f} min)")
     print()
+    if skipped:
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()